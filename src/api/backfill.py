@@ -0,0 +1,189 @@
+import os
+import json
+import time
+import logging
+import multiprocessing as mp
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import torch
+
+import emotion_utils
+from sentiment_nli import load_nli_model
+from db import (
+    init_db, iter_backfill_articles, get_backfill_checkpoint,
+    reset_backfill_checkpoint, commit_backfill_chunk,
+)
+
+'''
+Resumable, multi-process re-analysis of headlines with the current models.
+  --source db      : articles 테이블 전체 (rowid 순, keyset 쿼리로 스트리밍)
+  --input x.ndjson : {"url", "headline"(영문), "source_country", "timestamp", ["headline_ko"]} 한 줄에 하나
+Chunk 단위로 워커 프로세스에 나눠 점수를 매기고, 결과와 checkpoint를 한 트랜잭션으로 저장.
+중단된 job은 같은 --job 이름으로 다시 실행하면 마지막 checkpoint 다음부터 이어서 처리.
+'''
+
+# --- Config ---
+CHUNK_SIZE = 256                                   # 워커 1회 처리 단위 = checkpoint 단위
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+THREADS_PER_WORKER = 1                             # 워커별 torch intra-op thread 수
+MAX_PENDING_PER_WORKER = 2                         # 워커당 미리 보내 둘 chunk 수 (메모리 상한)
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+Chunk = Tuple[int, List[Tuple[str, Optional[str]]], Optional[List[Tuple]]]
+
+
+def _load_models(threads: int) -> None:
+    torch.set_num_threads(threads)
+    emotion_utils.load_model()
+    if emotion_utils.USE_NLI:
+        load_nli_model()
+
+def _init_worker(threads: int) -> None:
+    """Pool initializer: give each worker its own torch thread budget (and model copy unless preloaded)."""
+    _load_models(threads)
+
+def score_chunk(items: List[Tuple[str, Optional[str]]]) -> Dict[str, Tuple[str, float, bytes, Optional[bytes]]]:
+    """Score (url, english_headline) pairs in length-sorted batches; headlines that are None are skipped."""
+    scorable = [(url, text) for url, text in items if text]
+    order = sorted(range(len(scorable)), key=lambda i: len(scorable[i][1]))
+    results = {}
+    for start in range(0, len(order), emotion_utils.BATCH_SIZE):
+        batch = order[start:start + emotion_utils.BATCH_SIZE]
+        for i, row in zip(batch, emotion_utils.score_texts([scorable[i][1] for i in batch])):
+            results[scorable[i][0]] = row
+    return results
+
+
+def _db_chunks(after: int, chunk_size: int) -> Iterator[Chunk]:
+    for rows in iter_backfill_articles(after, chunk_size):
+        yield rows[-1][0], [(url, text) for _, url, text in rows], None
+
+def _ndjson_chunks(path: str, after: int, chunk_size: int) -> Iterator[Chunk]:
+    """Chunks of an NDJSON dump; the position is the last line number in the chunk."""
+    items, articles = [], []
+    line_no = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if line_no <= after or not line.strip():
+                continue
+            rec = json.loads(line)
+            headline = rec.get("headline")
+            items.append((rec["url"], headline))
+            articles.append((
+                rec["url"], rec.get("headline_ko") or headline, rec.get("source_country"),
+                rec.get("timestamp") or rec.get("date"), headline,
+            ))
+            if len(items) >= chunk_size:
+                yield line_no, items, articles
+                items, articles = [], []
+    if items:
+        yield line_no, items, articles
+
+
+def backfill(
+    input_path: Optional[str] = None,
+    job: str = "backfill",
+    workers: int = DEFAULT_WORKERS,
+    threads: int = THREADS_PER_WORKER,
+    chunk_size: int = CHUNK_SIZE,
+    share_weights: bool = False,
+    restart: bool = False,
+) -> Dict[str, Any]:
+    """
+    Re-score every article from the DB (or input_path) and write the labels
+    and raw scores back, resuming from job's checkpoint.
+    workers=0 scores in this process. With share_weights the models are loaded
+    once before forking so workers share the weight pages copy-on-write.
+    """
+    init_db()
+    source = f"ndjson:{os.path.abspath(input_path)}" if input_path else "db"
+    if restart:
+        reset_backfill_checkpoint(job)
+    checkpoint = get_backfill_checkpoint(job)
+    if checkpoint and checkpoint[0] != source:
+        raise ValueError(f"Job '{job}' was started on {checkpoint[0]}; use another --job or --restart")
+    position, processed = (checkpoint[1], checkpoint[2]) if checkpoint else (0, 0)
+    if checkpoint:
+        logger.info(f"Resuming job '{job}' after position {position} ({processed} articles done)")
+    chunks = _ndjson_chunks(input_path, position, chunk_size) if input_path else _db_chunks(position, chunk_size)
+
+    pool = None
+    if workers > 0:
+        if share_weights:
+            _load_models(threads)
+            pool = mp.get_context("fork").Pool(workers)
+        else:
+            pool = mp.Pool(workers, initializer=_init_worker, initargs=(threads,))
+    else:
+        _load_models(threads)
+
+    scored = skipped = 0
+    start = time.perf_counter()
+    pending = deque()
+
+    def commit(chunk_position, items, articles, results):
+        nonlocal processed, scored, skipped
+        by_url = {url: results[url] for url, _ in items if url in results}
+        skipped += len(items) - len(by_url)
+        scored += len(by_url)
+        processed += len(items)
+        if articles is not None:
+            article_rows = [(*a[:4], *by_url[a[0]][:2], a[4]) for a in articles if a[0] in by_url]
+            sentiments = []
+        else:
+            article_rows = []
+            sentiments = [(label, conf, url) for url, (label, conf, _, _) in by_url.items()]
+        scores = [(url, e_blob, n_blob) for url, (_, _, e_blob, n_blob) in by_url.items()]
+        if not commit_backfill_chunk(job, source, chunk_position, processed, article_rows, sentiments, scores):
+            raise RuntimeError(f"Backfill stopped at position {chunk_position}; rerun to resume")
+        elapsed = time.perf_counter() - start
+        logger.info(f"[backfill] position {chunk_position}: {processed} done, "
+                    f"{scored / elapsed:.1f} headlines/s")
+
+    try:
+        for chunk_position, items, articles in chunks:
+            if pool is None:
+                commit(chunk_position, items, articles, score_chunk(items))
+                continue
+            pending.append((chunk_position, items, articles, pool.apply_async(score_chunk, (items,))))
+            # 결과는 보낸 순서대로 저장 → checkpoint가 항상 연속된 위치를 가리킴
+            while len(pending) >= workers * MAX_PENDING_PER_WORKER:
+                chunk_position, items, articles, result = pending.popleft()
+                commit(chunk_position, items, articles, result.get())
+        while pending:
+            chunk_position, items, articles, result = pending.popleft()
+            commit(chunk_position, items, articles, result.get())
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    return {
+        "job": job,
+        "source": source,
+        "processed": processed,
+        "scored": scored,
+        "skipped_without_headline": skipped,
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Resumable multi-process re-analysis of headlines")
+    parser.add_argument("--input", default=None, help="NDJSON 입력 (없으면 articles 테이블)")
+    parser.add_argument("--job", default="backfill", help="checkpoint 이름")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="워커 프로세스 수 (0: 현재 프로세스)")
+    parser.add_argument("--threads", type=int, default=THREADS_PER_WORKER, help="워커별 torch thread 수")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--share-weights", action="store_true", help="모델을 한 번 로드 후 fork해 가중치 공유 (Linux)")
+    parser.add_argument("--restart", action="store_true", help="checkpoint를 지우고 처음부터")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    result = backfill(args.input, args.job, args.workers, args.threads, args.chunk_size,
+                      args.share_weights, args.restart)
+    logger.info(f"Backfill done: {result}")
@@ -1,5 +1,46 @@
 # config.py
+import os
+from dotenv import load_dotenv
+
+load_dotenv()   # 워커 주소 / 인증 키는 .env에서도 읽음
 
 TIMESPAN_HOURS = 8.0
 NUM_RECORDS = 100            # 수집 대상 뉴스 수
-LATEST_EXPORT_COUNT = 150     # 최신 기사 JSON 내보내기 개수  
\ No newline at end of file
+SOURCES = "worldnews"        # 기사 소스 (쉼표 구분: worldnews,gdelt)
+GDELT_NUM_RECORDS = 250      # GDELT 요청당 기사 수 (최대 250, API point 없음)
+INCREMENTAL_FETCH = True     # 소스별 watermark 이후 발행된 기사만 조회 (첫 실행 / 공백 후에는 TIMESPAN_HOURS 전체)
+WATERMARK_OVERLAP_MINUTES = 0  # 늦게 색인되는 기사 대비 watermark 이전으로 겹쳐 조회할 시간 (분)
+LATEST_EXPORT_COUNT = 150     # 최신 기사 JSON 내보내기 개수
+EXPORT_FORMAT = "pretty"      # pretty (indent=2) | compact
+EXPORT_DELTA = True           # 추가된 기사만 담은 NDJSON delta + manifest 함께 내보내기
+EXPORT_ONE_PER_CLUSTER = False  # 유사 헤드라인 cluster마다 최신 기사 하나만 내보내기
+LAZY_TRANSLATION = True       # 저장 시에는 영문만, 번역은 export되는 기사만 export 시점에
+NEAR_DUP = True               # 유사 헤드라인(MinHash/LSH)의 감정 / 번역 재사용 (near_dup.py)
+
+# 상주 추론 워커 (inference_worker.py)
+WORKER_HOST = os.getenv("WORKER_HOST", "127.0.0.1")
+WORKER_PORT = int(os.getenv("WORKER_PORT", "6010"))
+WORKER_AUTHKEY_ENV = "WORKER_AUTHKEY"   # 인증 키 환경 변수 (기본값 없음, osc.py는 실행마다 생성해 워커에 전달)
+
+def worker_authkey() -> bytes:
+    """
+    Worker authentication key from the environment.
+    There is no default: the worker unpickles whatever an authenticated
+    client sends, so a well-known key would let any local process run it.
+    """
+    key = os.getenv(WORKER_AUTHKEY_ENV)
+    if not key:
+        raise RuntimeError(f"{WORKER_AUTHKEY_ENV} is not set (add it to .env, or start the worker from osc.py)")
+    return key.encode()
+
+# 스트리밍 파이프라인 (fetch → dedupe → inference → translation → store)
+PIPELINE_QUEUE_SIZE = 4       # 단계 사이 큐 크기 (backpressure)
+INFERENCE_WORKERS = 1         # 모델 추론 스레드 수
+TRANSLATION_WORKERS = 2       # 번역 요청 스레드 수
+DEADLINE_SECONDS = None       # 실행 시간 예산 (초, None: 제한 없음). 남은 기사는 pending_articles로 이월
+PENDING_BATCH_SIZE = 32       # pending 기사 처리 단위 (작을수록 deadline에 정확히 멈춤)
+
+# 실행 리포트 (news2emotion.py)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RUN_REPORT_PATH = os.getenv("RUN_REPORT_PATH", os.path.join(PROJECT_DIR, "run_report.json"))   # 단계별 시간 / 카운터 / API 비용 (실행 위치와 무관)
+PROMETHEUS_PATH = None                # 예: "/var/lib/node_exporter/textfile/resonance.prom"
@@ -1,98 +1,827 @@
 import sqlite3
 import os
+import json
 import logging
-from datetime import datetime, timedelta
-from typing import Tuple
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Tuple, List, Dict, Iterable, Iterator, Optional
 
 # --- Config ---
 DB_FILE = os.getenv("DB_FILE", "resonance.db")
+PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",   # WAL에서는 NORMAL로도 안전 (commit마다 fsync하지 않음)
+    "cache_size=-16000",    # 약 16MB 페이지 캐시
+    "temp_store=MEMORY",
+)
+MAX_SQL_VARS = 500          # IN (...) 한 번에 넣을 최대 placeholder 수
+MOOD_BUCKET_SECONDS = (600, 3600)   # 감정 집계 단위: 10분 / 1시간 (mood_buckets)
+KST = timezone(timedelta(hours=9))
+TIMESTAMP_FORMATS = (
+    ("%Y-%m-%d %H:%M:%S", KST),               # worldnews_api (KST)
+    ("%Y%m%dT%H%M%SZ", timezone.utc),         # GDELT seendate
+    ("%Y-%m-%d %H:%M UTC", timezone.utc),
+)
 
 # --- Logging Setup ---
 logger = logging.getLogger(__name__)
 
+_local = threading.local()
+
 def get_conn() -> sqlite3.Connection:
-    """Get a new SQLite connection."""
+    """
+    Get the SQLite connection for this process.
+    One connection is opened per process (and per thread, since sqlite3
+    connections cannot be shared across threads) and reused afterwards.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        if _local.key == (os.getpid(), DB_FILE):
+            return conn
+        close_conn()   # DB_FILE 변경 또는 fork 이후: 새 연결
     try:
-        conn = sqlite3.connect(DB_FILE)
+        conn = sqlite3.connect(DB_FILE, timeout=30)
+        for pragma in PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}")
+        _local.conn = conn
+        _local.key = (os.getpid(), DB_FILE)
         return conn
     except Exception as e:
         logger.error(f"Failed to connect to DB: {e}")
         raise
 
+def close_conn() -> None:
+    """Close this thread's pooled connection, if any."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.key[0] == os.getpid():
+        conn.close()
+    _local.conn = None
+
+@contextmanager
+def transaction():
+    """Yield a cursor on the pooled connection; commit on success, roll back on error."""
+    conn = get_conn()
+    try:
+        yield conn.cursor()
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+def to_epoch(timestamp: str) -> Optional[int]:
+    """
+    Convert a stored timestamp string to epoch seconds (UTC).
+    worldnews_api stores KST '%Y-%m-%d %H:%M:%S'; GDELT style '%Y%m%dT%H%M%SZ' is UTC.
+    Returns None for anything unparseable.
+    """
+    if not timestamp:
+        return None
+    for fmt, tz in TIMESTAMP_FORMATS:
+        try:
+            dt = datetime.strptime(timestamp, fmt).replace(tzinfo=tz)
+            return int(dt.timestamp())
+        except (ValueError, TypeError):
+            continue
+    return None
+
+def pack_f16(values: Iterable[float]) -> bytes:
+    """Pack floats as little-endian float16 (2 bytes each)."""
+    values = list(values)
+    return struct.pack(f"<{len(values)}e", *values)
+
+def unpack_f16(blob: bytes) -> Tuple[float, ...]:
+    return struct.unpack(f"<{len(blob) // 2}e", blob)
+
+def _add_missing_columns(c: sqlite3.Cursor, table: str, columns: Dict[str, str]) -> None:
+    existing = {row[1] for row in c.execute(f'PRAGMA table_info({table})')}
+    for name, col_type in columns.items():
+        if name not in existing:
+            c.execute(f'ALTER TABLE {table} ADD COLUMN {name} {col_type}')
+
+def _migrate_articles(c: sqlite3.Cursor) -> None:
+    """Add the ts_epoch / headline_en / cluster_id columns and backfill ts_epoch on databases created before them."""
+    _add_missing_columns(c, "articles", {"ts_epoch": "INTEGER", "headline_en": "TEXT", "cluster_id": "INTEGER"})
+    c.execute('SELECT rowid, timestamp FROM articles WHERE ts_epoch IS NULL AND timestamp IS NOT NULL')
+    backfill = [(to_epoch(ts), rowid) for rowid, ts in c.fetchall()]
+    c.executemany('UPDATE articles SET ts_epoch=? WHERE rowid=?', [(e, r) for e, r in backfill if e is not None])
+    if backfill:
+        logger.info(f"Backfilled ts_epoch for {len(backfill)} articles")
+    c.execute('CREATE INDEX IF NOT EXISTS idx_articles_ts_epoch ON articles (ts_epoch)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_articles_cluster_id ON articles (cluster_id)')
+
+def _mood_upsert(row: str, sign: str) -> str:
+    """Trigger body adding (sign '+') or removing (sign '-') row (NEW / OLD) in every mood bucket size."""
+    sql = ""
+    for size in MOOD_BUCKET_SECONDS:
+        key = f"{size}, ({row}.ts_epoch / {size}) * {size}, COALESCE({row}.source_country, 'Unknown'), {row}.sentiment_label"
+        sql += f'''
+            INSERT INTO mood_buckets (bucket_size, bucket, source_country, label, count, confidence_sum)
+            VALUES ({key}, {sign}1, {sign}COALESCE({row}.sentiment_confidence, 0))
+            ON CONFLICT (bucket_size, bucket, source_country, label) DO UPDATE SET
+                count = count + excluded.count, confidence_sum = confidence_sum + excluded.confidence_sum;'''
+        if sign == "-":
+            sql += f'''
+            DELETE FROM mood_buckets WHERE (bucket_size, bucket, source_country, label) = ({key}) AND count <= 0;'''
+    return sql
+
+def _create_mood_triggers(c: sqlite3.Cursor) -> None:
+    """
+    Keep mood_buckets in step with articles: every insert / sentiment or
+    time change / delete of a labelled article adjusts its buckets, so
+    aggregates never need a scan of articles.
+    """
+    has = "{row}.sentiment_label IS NOT NULL AND {row}.ts_epoch IS NOT NULL"
+    columns = "sentiment_label, sentiment_confidence, ts_epoch, source_country"
+    triggers = {
+        "mood_articles_insert": ("AFTER INSERT ON articles", "NEW", "+"),
+        "mood_articles_update_old": (f"AFTER UPDATE OF {columns} ON articles", "OLD", "-"),
+        "mood_articles_update_new": (f"AFTER UPDATE OF {columns} ON articles", "NEW", "+"),
+        "mood_articles_delete": ("AFTER DELETE ON articles", "OLD", "-"),
+    }
+    for name, (event, row, sign) in triggers.items():
+        c.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {name} {event}
+            WHEN {has.format(row=row)}
+            BEGIN{_mood_upsert(row, sign)}
+            END
+        ''')
+
+def rebuild_mood_buckets(c: Optional[sqlite3.Cursor] = None) -> None:
+    """Recompute mood_buckets from articles (once when the table is created, or to repair it)."""
+    def rebuild(c):
+        c.execute('DELETE FROM mood_buckets')
+        for size in MOOD_BUCKET_SECONDS:
+            c.execute(f'''
+                INSERT INTO mood_buckets (bucket_size, bucket, source_country, label, count, confidence_sum)
+                SELECT {size}, (ts_epoch / {size}) * {size}, COALESCE(source_country, 'Unknown'), sentiment_label,
+                       COUNT(*), SUM(COALESCE(sentiment_confidence, 0))
+                FROM articles WHERE sentiment_label IS NOT NULL AND ts_epoch IS NOT NULL
+                GROUP BY 2, 3, 4
+            ''')
+    if c is not None:
+        rebuild(c)
+        return
+    with transaction() as c:
+        rebuild(c)
+
 def init_db() -> None:
     """Initialize the articles table if it does not exist."""
     try:
-        conn = get_conn()
-        c = conn.cursor()
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS articles (
-                url TEXT PRIMARY KEY,
-                headline TEXT,
-                source_country TEXT,
-                timestamp TEXT,
-                sentiment_label TEXT,
-                sentiment_confidence REAL
-            )
-        ''')
-        conn.commit()
-        conn.close()
+        with transaction() as c:
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS articles (
+                    url TEXT PRIMARY KEY,
+                    headline TEXT,
+                    source_country TEXT,
+                    timestamp TEXT,
+                    sentiment_label TEXT,
+                    sentiment_confidence REAL,
+                    ts_epoch INTEGER,
+                    headline_en TEXT,
+                    cluster_id INTEGER
+                )
+            ''')
+            _migrate_articles(c)
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS sentiment_cache (
+                    key TEXT PRIMARY KEY,
+                    label TEXT,
+                    confidence REAL,
+                    last_used REAL,
+                    emotion_probs BLOB,
+                    nli_scores BLOB
+                )
+            ''')
+            _add_missing_columns(c, "sentiment_cache", {"emotion_probs": "BLOB", "nli_scores": "BLOB"})
+            # 기사별 원시 점수 (float16 blob) → 모델 재실행 없이 재채점 (rescore.py)
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS article_scores (
+                    url TEXT PRIMARY KEY,
+                    emotion_probs BLOB,
+                    nli_scores BLOB
+                )
+            ''')
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS translation_cache (
+                    source_text TEXT,
+                    target TEXT,
+                    translated TEXT,
+                    PRIMARY KEY (source_text, target)
+                )
+            ''')
+            # headline_en이 없는 예전 기사의 원문을 번역 캐시에서 역으로 찾기 위한 인덱스 (backfill.py)
+            c.execute('CREATE INDEX IF NOT EXISTS idx_translation_cache_translated ON translation_cache (target, translated)')
+            # 유사 헤드라인 cluster (near_dup.py): 대표 기사의 감정/번역을 재사용
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS clusters (
+                    cluster_id INTEGER PRIMARY KEY,
+                    signature BLOB,
+                    rep_url TEXT,
+                    headline_ko TEXT,
+                    sentiment_label TEXT,
+                    sentiment_confidence REAL,
+                    size INTEGER,
+                    last_seen REAL
+                )
+            ''')
+            c.execute('CREATE TABLE IF NOT EXISTS cluster_lsh (band_key INTEGER, cluster_id INTEGER)')
+            c.execute('CREATE INDEX IF NOT EXISTS idx_cluster_lsh_band_key ON cluster_lsh (band_key)')
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+                    job TEXT PRIMARY KEY,
+                    source TEXT,
+                    position INTEGER,
+                    processed INTEGER,
+                    updated_at REAL
+                )
+            ''')
+            # 감정 집계 (bucket 크기 × 시간 bucket × 국가 × 라벨): articles 트리거로 증분 갱신
+            created = not c.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='mood_buckets'").fetchone()
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS mood_buckets (
+                    bucket_size INTEGER,
+                    bucket INTEGER,
+                    source_country TEXT,
+                    label TEXT,
+                    count INTEGER,
+                    confidence_sum REAL,
+                    PRIMARY KEY (bucket_size, bucket, source_country, label)
+                )
+            ''')
+            if created:
+                rebuild_mood_buckets(c)
+            _create_mood_triggers(c)
+            # 수집했지만 아직 분석 / 저장하지 못한 기사 (--deadline 초과분은 다음 run으로 이월)
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS pending_articles (
+                    url TEXT PRIMARY KEY,
+                    headline TEXT,
+                    source_country TEXT,
+                    date TEXT,
+                    ts_epoch INTEGER,
+                    enqueued_at REAL
+                )
+            ''')
+            c.execute('CREATE INDEX IF NOT EXISTS idx_pending_articles_ts_epoch ON pending_articles (ts_epoch)')
+            # 소스별 수집 watermark: 마지막으로 본 발행 시각(epoch)과 그 시각의 URL 목록(JSON)
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS fetch_watermarks (
+                    source TEXT PRIMARY KEY,
+                    published REAL,
+                    urls TEXT,
+                    updated_at REAL
+                )
+            ''')
     except Exception as e:
         logger.error(f"Failed to initialize DB: {e}")
         raise
 
+ARTICLE_UPSERT = '''
+    INSERT INTO articles (url, headline, source_country, timestamp, sentiment_label, sentiment_confidence, ts_epoch, headline_en)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(url) DO UPDATE SET
+        sentiment_label=excluded.sentiment_label,
+        sentiment_confidence=excluded.sentiment_confidence,
+        headline_en=COALESCE(excluded.headline_en, articles.headline_en)
+'''
+
+def _article_params(row: Tuple) -> Tuple:
+    """ARTICLE_UPSERT parameters for a 6-tuple row, or a 7-tuple ending in headline_en."""
+    return (*row[:6], to_epoch(row[3]), row[6] if len(row) > 6 else None)
+
 def save_article(url: str, headline: str, source_country: str, timestamp: str, sentiment_label: str = None, sentiment_confidence: float = None) -> None:
     """Save or update an article in the DB."""
     try:
-        conn = get_conn()
-        c = conn.cursor()
-        c.execute('''
-            INSERT INTO articles (url, headline, source_country, timestamp, sentiment_label, sentiment_confidence)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(url) DO UPDATE SET
-                sentiment_label=excluded.sentiment_label,
-                sentiment_confidence=excluded.sentiment_confidence
-        ''', (url, headline, source_country, timestamp, sentiment_label, sentiment_confidence))
-        conn.commit()
-        conn.close()
+        with transaction() as c:
+            c.execute(ARTICLE_UPSERT, _article_params((url, headline, source_country, timestamp, sentiment_label, sentiment_confidence)))
     except Exception as e:
         logger.error(f"Failed to save article url={url}: {e}")
 
+def save_articles_bulk(rows: Iterable[Tuple]) -> int:
+    """
+    Save or update many articles in one transaction.
+    Each row is (url, headline, source_country, timestamp, sentiment_label, sentiment_confidence),
+    optionally followed by the original English headline.
+    Returns the number of rows written (0 if the transaction failed).
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    try:
+        with transaction() as c:
+            c.executemany(ARTICLE_UPSERT, [_article_params(row) for row in rows])
+        return len(rows)
+    except Exception as e:
+        logger.error(f"Failed to save {len(rows)} articles: {e}")
+        return 0
+
 def is_new_article(url: str) -> bool:
     """Check if an article URL is new (not in the DB)."""
     try:
-        conn = get_conn()
-        c = conn.cursor()
+        c = get_conn().cursor()
         c.execute('SELECT 1 FROM articles WHERE url=?', (url,))
-        result = c.fetchone()
-        conn.close()
-        return result is None
+        return c.fetchone() is None
     except Exception as e:
         logger.error(f"Failed to check article url={url}: {e}")
         return False
 
+def filter_new_urls(urls: Iterable[str]) -> List[str]:
+    """
+    Return the URLs that are not in the DB yet, in input order and without duplicates.
+    Checks the whole set with a few IN (...) queries instead of one query per URL.
+    """
+    urls = list(dict.fromkeys(urls))
+    try:
+        c = get_conn().cursor()
+        known = set()
+        for start in range(0, len(urls), MAX_SQL_VARS):
+            chunk = urls[start:start + MAX_SQL_VARS]
+            placeholders = ','.join('?'*len(chunk))
+            c.execute(f'SELECT url FROM articles WHERE url IN ({placeholders})', chunk)
+            known.update(url for url, in c.fetchall())
+        return [url for url in urls if url not in known]
+    except Exception as e:
+        logger.error(f"Failed to check {len(urls)} article urls: {e}")
+        return []
+
 def get_latest_articles(min_count: int = 150, hours: int = 1):
-    """Get the latest articles (with sentiment) from the DB."""
-    try:
-        now = datetime.utcnow()
-        one_hour_ago = now - timedelta(hours=hours)
-        conn = get_conn()
-        c = conn.cursor()
-        c.execute('SELECT url, headline, source_country, timestamp, sentiment_label, sentiment_confidence FROM articles WHERE timestamp >= ? ORDER BY timestamp DESC', (one_hour_ago.strftime('%Y%m%dT%H%M%SZ'),))
-        recent_articles = c.fetchall()
-        recent_urls = set(url for url, *_ in recent_articles)
-        count_needed = min_count - len(recent_articles)
-        if count_needed > 0:
-            if recent_urls:
-                placeholders = ','.join('?'*len(recent_urls))
-                c.execute(f'SELECT url, headline, source_country, timestamp, sentiment_label, sentiment_confidence FROM articles WHERE url NOT IN ({placeholders}) ORDER BY timestamp DESC LIMIT ?', (*recent_urls, count_needed))
-            else:
-                c.execute('SELECT url, headline, source_country, timestamp, sentiment_label, sentiment_confidence FROM articles ORDER BY timestamp DESC LIMIT ?', (count_needed,))
-            extra_articles = c.fetchall()
-            articles = recent_articles + extra_articles
-        else:
-            articles = recent_articles[:min_count]
-        conn.close()
-        return articles
+    """
+    Get the latest articles (with sentiment) from the DB.
+    The articles of the last `hours`, topped up with older ones until there
+    are min_count, are always the min_count newest rows. That is one backward
+    scan of the ts_epoch index, whatever the table size.
+    Articles not translated yet (lazy translation) carry their English headline.
+    """
+    try:
+        c = get_conn().cursor()
+        c.execute('''
+            SELECT url, COALESCE(headline, headline_en), source_country, timestamp, sentiment_label, sentiment_confidence
+            FROM articles ORDER BY ts_epoch DESC LIMIT ?
+        ''', (min_count,))
+        return c.fetchall()
     except Exception as e:
         logger.error(f"Failed to get latest articles: {e}")
-        return []
\ No newline at end of file
+        return []
+
+def get_latest_articles_with_rowid(count: int = 150, one_per_cluster: bool = False) -> List[Tuple]:
+    """
+    Same rows as get_latest_articles, prefixed with the article rowid.
+    rowids only grow as articles are inserted, so the exporter uses them to
+    tell which of the latest articles were added since its previous run.
+    With one_per_cluster only the newest article of each near-duplicate
+    cluster is kept (the scan continues until count rows are found).
+    headline is None for articles not translated yet (see get_untranslated).
+    """
+    try:
+        c = get_conn().cursor()
+        if not one_per_cluster:
+            c.execute('''
+                SELECT rowid, url, headline, source_country, timestamp, sentiment_label, sentiment_confidence
+                FROM articles ORDER BY ts_epoch DESC LIMIT ?
+            ''', (count,))
+            return c.fetchall()
+        rows, seen, offset = [], set(), 0
+        while len(rows) < count:
+            c.execute('''
+                SELECT rowid, url, headline, source_country, timestamp, sentiment_label, sentiment_confidence, cluster_id
+                FROM articles ORDER BY ts_epoch DESC LIMIT ? OFFSET ?
+            ''', (count * 2, offset))
+            page = c.fetchall()
+            if not page:
+                break
+            offset += len(page)
+            for *row, cluster_id in page:
+                if cluster_id is None or cluster_id not in seen:
+                    seen.add(cluster_id)
+                    rows.append(tuple(row))
+        return rows[:count]
+    except Exception as e:
+        logger.error(f"Failed to get latest articles: {e}")
+        return []
+
+def get_untranslated(urls: Iterable[str]) -> Dict[str, Tuple[Optional[str], Optional[int], Optional[str]]]:
+    """
+    url → (headline_en, cluster_id, the cluster's stored translation) for the
+    given articles that have no stored translation yet.
+    """
+    urls = list(dict.fromkeys(urls))
+    found = {}
+    try:
+        c = get_conn().cursor()
+        for start in range(0, len(urls), MAX_SQL_VARS):
+            chunk = urls[start:start + MAX_SQL_VARS]
+            placeholders = ','.join('?'*len(chunk))
+            c.execute(f'''
+                SELECT a.url, a.headline_en, a.cluster_id, k.headline_ko
+                FROM articles a LEFT JOIN clusters k ON k.cluster_id = a.cluster_id
+                WHERE a.headline IS NULL AND a.url IN ({placeholders})
+            ''', chunk)
+            found.update((url, tuple(rest)) for url, *rest in c.fetchall())
+    except Exception as e:
+        logger.error(f"Failed to look up untranslated articles: {e}")
+    return found
+
+def save_article_translations(rows: Iterable[Tuple[str, str]]) -> None:
+    """
+    Store (url, headline_ko) for articles that had none; an article's
+    cluster without a translation gets it too, for its later members.
+    """
+    rows = [(headline_ko, url) for url, headline_ko in rows]
+    if not rows:
+        return
+    try:
+        with transaction() as c:
+            c.executemany('UPDATE articles SET headline=? WHERE url=? AND headline IS NULL', rows)
+            c.executemany('''
+                UPDATE clusters SET headline_ko=?
+                WHERE cluster_id=(SELECT cluster_id FROM articles WHERE url=?) AND headline_ko IS NULL
+            ''', rows)
+    except Exception as e:
+        logger.error(f"Failed to save {len(rows)} translations: {e}")
+
+def find_cluster_candidates(band_keys: Iterable[int], since: float) -> List[Tuple]:
+    """
+    Clusters seen since `since` (epoch) that share an LSH bucket with band_keys, as
+    (band_key, cluster_id, signature, headline_ko, sentiment_label, sentiment_confidence).
+    """
+    band_keys = list(band_keys)
+    found = []
+    try:
+        c = get_conn().cursor()
+        for start in range(0, len(band_keys), MAX_SQL_VARS):
+            chunk = band_keys[start:start + MAX_SQL_VARS]
+            placeholders = ','.join('?'*len(chunk))
+            c.execute(f'''
+                SELECT l.band_key, k.cluster_id, k.signature, k.headline_ko, k.sentiment_label, k.sentiment_confidence
+                FROM cluster_lsh l JOIN clusters k ON k.cluster_id = l.cluster_id
+                WHERE l.band_key IN ({placeholders}) AND k.last_seen >= ?
+            ''', (*chunk, since))
+            found.extend(c.fetchall())
+    except Exception as e:
+        logger.error(f"Failed to look up near-duplicate clusters: {e}")
+    return found
+
+def create_clusters(rows: Iterable[Tuple[bytes, str, str, str, float, List[int]]]) -> List[int]:
+    """
+    Create clusters from (signature, rep_url, headline_ko, sentiment_label,
+    sentiment_confidence, band_keys) and index them; returns the new cluster ids.
+    """
+    rows = list(rows)
+    ids = []
+    if not rows:
+        return ids
+    try:
+        with transaction() as c:
+            now = time.time()
+            for signature, rep_url, headline_ko, label, confidence, keys in rows:
+                c.execute('''
+                    INSERT INTO clusters (signature, rep_url, headline_ko, sentiment_label, sentiment_confidence, size, last_seen)
+                    VALUES (?, ?, ?, ?, ?, 0, ?)
+                ''', (signature, rep_url, headline_ko, label, confidence, now))
+                ids.append(c.lastrowid)
+                c.executemany('INSERT INTO cluster_lsh (band_key, cluster_id) VALUES (?, ?)', [(k, c.lastrowid) for k in keys])
+    except Exception as e:
+        logger.error(f"Failed to create {len(rows)} clusters: {e}")
+        return []
+    return ids
+
+def assign_article_clusters(rows: Iterable[Tuple[str, int]]) -> None:
+    """
+    Record (url, cluster_id) memberships: tag the article, refresh the cluster
+    and give the article a copy of the representative's raw scores if it has none.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    try:
+        with transaction() as c:
+            c.executemany('UPDATE articles SET cluster_id=? WHERE url=?', [(cid, url) for url, cid in rows])
+            c.executemany('UPDATE clusters SET size=size+1, last_seen=? WHERE cluster_id=?',
+                          [(time.time(), cid) for _, cid in rows])
+            c.executemany('''
+                INSERT OR IGNORE INTO article_scores (url, emotion_probs, nli_scores)
+                SELECT ?, s.emotion_probs, s.nli_scores
+                FROM clusters k JOIN article_scores s ON s.url = k.rep_url WHERE k.cluster_id=?
+            ''', rows)
+    except Exception as e:
+        logger.error(f"Failed to assign clusters for {len(rows)} articles: {e}")
+
+def prune_cluster_index(before: float) -> int:
+    """Drop LSH entries of clusters not seen since `before` (epoch); the clusters themselves are kept."""
+    try:
+        with transaction() as c:
+            c.execute('''
+                DELETE FROM cluster_lsh WHERE cluster_id IN (SELECT cluster_id FROM clusters WHERE last_seen < ?)
+            ''', (before,))
+            return c.rowcount
+    except Exception as e:
+        logger.error(f"Failed to prune cluster index: {e}")
+        return 0
+
+def get_cached_sentiments(keys: Iterable[str]) -> Dict[str, Tuple[str, float, bytes, bytes]]:
+    """
+    Look up cached results by cache key and mark them as used.
+    Values are (label, confidence, emotion_probs, nli_scores); the blobs are float16 and may be None.
+    """
+    keys = list(dict.fromkeys(keys))
+    found = {}
+    if not keys:
+        return found
+    try:
+        with transaction() as c:
+            for start in range(0, len(keys), MAX_SQL_VARS):
+                chunk = keys[start:start + MAX_SQL_VARS]
+                placeholders = ','.join('?'*len(chunk))
+                c.execute(f'SELECT key, label, confidence, emotion_probs, nli_scores FROM sentiment_cache WHERE key IN ({placeholders})', chunk)
+                for key, *value in c.fetchall():
+                    found[key] = tuple(value)
+            if found:
+                now = time.time()
+                c.executemany('UPDATE sentiment_cache SET last_used=? WHERE key=?', [(now, k) for k in found])
+    except Exception as e:
+        logger.error(f"Failed to read sentiment cache: {e}")
+    return found
+
+def put_cached_sentiments(rows: Iterable[Tuple], max_rows: int = None) -> None:
+    """
+    Store (key, label, confidence[, emotion_probs, nli_scores]) results,
+    then trim the cache to max_rows (least recently used first).
+    """
+    now = time.time()
+    rows = [(*row, *(None,) * (5 - len(row)), now) for row in rows]
+    if not rows:
+        return
+    try:
+        with transaction() as c:
+            c.executemany('''
+                INSERT INTO sentiment_cache (key, label, confidence, emotion_probs, nli_scores, last_used)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    label=excluded.label,
+                    confidence=excluded.confidence,
+                    emotion_probs=excluded.emotion_probs,
+                    nli_scores=excluded.nli_scores,
+                    last_used=excluded.last_used
+            ''', rows)
+            if max_rows is not None:
+                c.execute('''
+                    DELETE FROM sentiment_cache WHERE key IN (
+                        SELECT key FROM sentiment_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                ''', (max_rows,))
+    except Exception as e:
+        logger.error(f"Failed to write sentiment cache: {e}")
+
+def save_article_scores(rows: Iterable[Tuple[str, bytes, bytes]]) -> None:
+    """Store (url, emotion_probs, nli_scores) float16 blobs for articles."""
+    rows = list(rows)
+    if not rows:
+        return
+    try:
+        with transaction() as c:
+            c.executemany('''
+                INSERT INTO article_scores (url, emotion_probs, nli_scores) VALUES (?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    emotion_probs=excluded.emotion_probs,
+                    nli_scores=excluded.nli_scores
+            ''', rows)
+    except Exception as e:
+        logger.error(f"Failed to save scores for {len(rows)} articles: {e}")
+
+def iter_article_scores(chunk_size: int = 50000) -> Iterator[List[Tuple[str, bytes, bytes, str]]]:
+    """
+    Stream (url, emotion_probs, nli_scores, sentiment_label) rows in url order.
+    Each chunk is a separate keyset query, so callers may update articles between chunks.
+    """
+    last_url = ""
+    while True:
+        c = get_conn().cursor()
+        c.execute('''
+            SELECT s.url, s.emotion_probs, s.nli_scores, a.sentiment_label
+            FROM article_scores s JOIN articles a ON a.url = s.url
+            WHERE s.emotion_probs IS NOT NULL AND s.url > ?
+            ORDER BY s.url LIMIT ?
+        ''', (last_url, chunk_size))
+        rows = c.fetchall()
+        if not rows:
+            return
+        yield rows
+        last_url = rows[-1][0]
+
+def update_article_sentiments(rows: Iterable[Tuple[str, float, str]]) -> int:
+    """Bulk update (sentiment_label, sentiment_confidence, url). Returns rows written."""
+    rows = list(rows)
+    try:
+        with transaction() as c:
+            c.executemany('UPDATE articles SET sentiment_label=?, sentiment_confidence=? WHERE url=?', rows)
+        return len(rows)
+    except Exception as e:
+        logger.error(f"Failed to update {len(rows)} article sentiments: {e}")
+        return 0
+
+def iter_backfill_articles(after_rowid: int = 0, chunk_size: int = 256) -> Iterator[List[Tuple[int, str, Optional[str]]]]:
+    """
+    Stream (rowid, url, english_headline) in rowid order, one keyset query per chunk.
+    Articles stored before headline_en existed fall back to the source text of
+    their cached Korean translation; the headline is None if neither is known.
+    """
+    while True:
+        c = get_conn().cursor()
+        c.execute('''
+            SELECT a.rowid, a.url, COALESCE(a.headline_en, (
+                SELECT t.source_text FROM translation_cache t
+                WHERE t.target = 'ko' AND t.translated = a.headline LIMIT 1
+            ))
+            FROM articles a WHERE a.rowid > ? ORDER BY a.rowid LIMIT ?
+        ''', (after_rowid, chunk_size))
+        rows = c.fetchall()
+        if not rows:
+            return
+        yield rows
+        after_rowid = rows[-1][0]
+
+def get_backfill_checkpoint(job: str) -> Optional[Tuple[str, int, int]]:
+    """(source, position, processed) saved for job, or None if it never ran."""
+    c = get_conn().cursor()
+    c.execute('SELECT source, position, processed FROM backfill_checkpoints WHERE job=?', (job,))
+    return c.fetchone()
+
+def reset_backfill_checkpoint(job: str) -> None:
+    with transaction() as c:
+        c.execute('DELETE FROM backfill_checkpoints WHERE job=?', (job,))
+
+def commit_backfill_chunk(
+    job: str,
+    source: str,
+    position: int,
+    processed: int,
+    articles: Iterable[Tuple] = (),
+    sentiments: Iterable[Tuple[str, float, str]] = (),
+    scores: Iterable[Tuple[str, bytes, bytes]] = (),
+) -> bool:
+    """
+    Write one backfill chunk and move the job's checkpoint in a single
+    transaction, so a killed job never records progress it did not save.
+    articles are save_articles_bulk rows, sentiments are
+    (label, confidence, url) updates and scores are article_scores rows.
+    """
+    try:
+        with transaction() as c:
+            c.executemany(ARTICLE_UPSERT, [_article_params(row) for row in articles])
+            c.executemany('UPDATE articles SET sentiment_label=?, sentiment_confidence=? WHERE url=?', list(sentiments))
+            c.executemany('''
+                INSERT INTO article_scores (url, emotion_probs, nli_scores) VALUES (?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    emotion_probs=excluded.emotion_probs,
+                    nli_scores=excluded.nli_scores
+            ''', list(scores))
+            c.execute('''
+                INSERT INTO backfill_checkpoints (job, source, position, processed, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(job) DO UPDATE SET
+                    source=excluded.source, position=excluded.position,
+                    processed=excluded.processed, updated_at=excluded.updated_at
+            ''', (job, source, position, processed, time.time()))
+        return True
+    except Exception as e:
+        logger.error(f"Failed to commit backfill chunk for job={job} at {position}: {e}")
+        return False
+
+def enqueue_pending(articles: Iterable[Dict]) -> int:
+    """Persist fetched article dicts (url, headline, source_country, date) until they are stored; returns rows added."""
+    rows = [
+        (a["url"], a["headline"], a["source_country"], a["date"], to_epoch(a["date"]), time.time())
+        for a in articles
+    ]
+    if not rows:
+        return 0
+    try:
+        with transaction() as c:
+            c.executemany('''
+                INSERT OR IGNORE INTO pending_articles (url, headline, source_country, date, ts_epoch, enqueued_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows)
+            return c.rowcount
+    except Exception as e:
+        logger.error(f"Failed to enqueue {len(rows)} pending articles: {e}")
+        return 0
+
+def get_pending_articles() -> List[Dict]:
+    """Pending article dicts, newest first. Rows whose article is already stored are dropped first."""
+    try:
+        with transaction() as c:
+            c.execute('DELETE FROM pending_articles WHERE url IN (SELECT url FROM articles)')
+            c.execute('''
+                SELECT url, headline, source_country, date FROM pending_articles
+                ORDER BY ts_epoch DESC, enqueued_at DESC
+            ''')
+            return [
+                {"url": url, "headline": headline, "source_country": country, "date": date}
+                for url, headline, country, date in c.fetchall()
+            ]
+    except Exception as e:
+        logger.error(f"Failed to read pending articles: {e}")
+        return []
+
+def remove_pending(urls: Iterable[str]) -> None:
+    urls = [(url,) for url in urls]
+    try:
+        with transaction() as c:
+            c.executemany('DELETE FROM pending_articles WHERE url=?', urls)
+    except Exception as e:
+        logger.error(f"Failed to remove {len(urls)} pending articles: {e}")
+
+def count_pending() -> int:
+    try:
+        return get_conn().execute('SELECT COUNT(*) FROM pending_articles').fetchone()[0]
+    except Exception as e:
+        logger.error(f"Failed to count pending articles: {e}")
+        return 0
+
+def get_fetch_watermark(source: str) -> Optional[Tuple[float, List[str], float]]:
+    """(published epoch, urls published at that instant, updated_at) last saved for source, or None."""
+    try:
+        c = get_conn().cursor()
+        c.execute('SELECT published, urls, updated_at FROM fetch_watermarks WHERE source=?', (source,))
+        row = c.fetchone()
+        return (row[0], json.loads(row[1]), row[2]) if row else None
+    except Exception as e:
+        logger.error(f"Failed to read fetch watermark for {source}: {e}")
+        return None
+
+def set_fetch_watermark(source: str, published: float, urls: Iterable[str]) -> None:
+    try:
+        with transaction() as c:
+            c.execute('''
+                INSERT INTO fetch_watermarks (source, published, urls, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(source) DO UPDATE SET
+                    published=excluded.published, urls=excluded.urls, updated_at=excluded.updated_at
+            ''', (source, published, json.dumps(sorted(set(urls))), time.time()))
+    except Exception as e:
+        logger.error(f"Failed to save fetch watermark for {source}: {e}")
+
+def get_mood_buckets(
+    bucket_size: int,
+    since: float,
+    until: Optional[float] = None,
+    country: Optional[str] = None,
+) -> List[Tuple[int, str, str, int, float]]:
+    """(bucket, source_country, label, count, confidence_sum) of buckets starting in [since, until)."""
+    start = int(since) // bucket_size * bucket_size
+    end = int(until) if until is not None else 2**62
+    try:
+        c = get_conn().cursor()
+        c.execute(f'''
+            SELECT bucket, source_country, label, count, confidence_sum FROM mood_buckets
+            WHERE bucket_size=? AND bucket >= ? AND bucket < ? {'AND source_country=?' if country else ''}
+            ORDER BY bucket
+        ''', (bucket_size, start, end, *([country] if country else [])))
+        return c.fetchall()
+    except Exception as e:
+        logger.error(f"Failed to read mood buckets: {e}")
+        return []
+
+def prune_mood_buckets(bucket_size: int, before: float) -> int:
+    """Drop buckets of bucket_size that start before `before` (epoch)."""
+    try:
+        with transaction() as c:
+            c.execute('DELETE FROM mood_buckets WHERE bucket_size=? AND bucket < ?', (bucket_size, int(before)))
+            return c.rowcount
+    except Exception as e:
+        logger.error(f"Failed to prune mood buckets: {e}")
+        return 0
+
+def get_cached_translations(texts: Iterable[str], target: str) -> Dict[str, str]:
+    """Look up cached translations of texts into the target language."""
+    texts = list(dict.fromkeys(texts))
+    found = {}
+    if not texts:
+        return found
+    try:
+        with transaction() as c:
+            for start in range(0, len(texts), MAX_SQL_VARS):
+                chunk = texts[start:start + MAX_SQL_VARS]
+                placeholders = ','.join('?'*len(chunk))
+                c.execute(f'SELECT source_text, translated FROM translation_cache WHERE target=? AND source_text IN ({placeholders})', (target, *chunk))
+                found.update(c.fetchall())
+    except Exception as e:
+        logger.error(f"Failed to read translation cache: {e}")
+    return found
+
+def put_cached_translations(pairs: Iterable[Tuple[str, str]], target: str) -> None:
+    """Store (source_text, translated) pairs for the target language."""
+    rows = [(source, target, translated) for source, translated in pairs]
+    if not rows:
+        return
+    try:
+        with transaction() as c:
+            c.executemany('''
+                INSERT INTO translation_cache (source_text, target, translated)
+                VALUES (?, ?, ?)
+                ON CONFLICT(source_text, target) DO UPDATE SET translated=excluded.translated
+            ''', rows)
+    except Exception as e:
+        logger.error(f"Failed to write translation cache: {e}")
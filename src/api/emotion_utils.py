@@ -1,9 +1,14 @@
 import torch
+import json
+import hashlib
 import logging
-from datetime import datetime
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-from sentiment_nli import nli_sentiment
-from typing import Tuple, Dict
+import threading
+from html import unescape
+from sentiment_nli import nli_sentiment_batch, NLI_MODEL_ID, CANDIDATES
+from inference_backend import load_classifier, INFERENCE_BACKEND
+from db import get_cached_sentiments, put_cached_sentiments, pack_f16
+from metrics import METRICS
+from typing import Tuple, Dict, List, Optional
 
 # --- Config ---
 MODEL_ID = "SamLowe/roberta-base-go_emotions"
@@ -16,33 +21,92 @@ NEG_SET = {
     "embarrassment","fear","grief","nervousness","remorse","sadness"
 }
 NEU_LABEL = "neutral"
-NEU_FACTOR = 0.3
+NEU_FACTOR = 1.0         # neutral 확률 가중치. 1.0 = 감쇠 없음 (기존 저장 라벨과 같은 기준), 낮추면 rescore.py로 기존 행도 재계산
 THRESH = 0.10
 USE_NLI = True
 ALPHA = 0.6
+BATCH_SIZE = 32          # GoEmotions 배치 크기
+# Cascade: GoEmotions confidence가 [LOW, HIGH) 구간일 때만 NLI 실행.
+# conf_ge >= (1-ALPHA)/ALPHA 이면 ALPHA 블렌딩으로 라벨이 뒤집힐 수 없음
+NLI_CASCADE = False
+NLI_BAND_LOW = 0.0
+NLI_BAND_HIGH = round((1 - ALPHA) / ALPHA, 3)
+USE_CACHE = True                  # 헤드라인+모델 설정 기준 결과 캐시 (sentiment_cache 테이블)
+SENTIMENT_CACHE_MAX_ROWS = 50000
 
 # --- Logging Setup ---
 logger = logging.getLogger(__name__)
 
+NLI_STATS = {"called": 0, "skipped": 0}
+CACHE_STATS = {"hits": 0, "misses": 0}
+
 # --- Model Loading ---
-try:
-    tok = AutoTokenizer.from_pretrained(MODEL_ID)
-    mdl = AutoModelForSequenceClassification.from_pretrained(MODEL_ID).eval()
-    LABELS = mdl.config.id2label
-    NEU_ID = [i for i, l in LABELS.items() if 1 == NEU_LABEL[0]]
-except Exception as e:
-    logger.error(f"Failed to load emotion model: {e}")
-    raise
+# 모델은 첫 사용 시점에 로드 (db.py만 쓰는 CLI는 즉시 시작)
+tok = None
+mdl = None
+LABELS = None
+NEU_ID = None
+POS_IDX = None     # LABELS 기준 긍정/부정 인덱스 텐서 (한 번만 계산)
+NEG_IDX = None
+_loaded_backend = None
+_load_lock = threading.Lock()
+
+def _set_labels(id2label: Dict[int, str]) -> None:
+    global LABELS, NEU_ID, POS_IDX, NEG_IDX
+    LABELS = id2label
+    NEU_ID = [i for i, l in LABELS.items() if l == NEU_LABEL]
+    POS_IDX = torch.tensor([i for i, l in LABELS.items() if l in POS_SET], dtype=torch.long)
+    NEG_IDX = torch.tensor([i for i, l in LABELS.items() if l in NEG_SET], dtype=torch.long)
+
+def load_labels() -> None:
+    """Load only the label mapping (model config), enough for scoring stored probabilities."""
+    if LABELS is not None:
+        return
+    with _load_lock:
+        if LABELS is None:
+            from transformers import AutoConfig
+            _set_labels(AutoConfig.from_pretrained(MODEL_ID).id2label)
+
+def load_model(backend: str = None) -> None:
+    """
+    Load the GoEmotions tokenizer and model once per process.
+    backend defaults to INFERENCE_BACKEND (torch | torch-int8 | onnx);
+    passing a different one explicitly replaces the loaded model.
+    """
+    global tok, mdl, _loaded_backend
+    if mdl is not None and backend in (None, _loaded_backend):
+        return
+    with _load_lock:
+        if mdl is not None and backend in (None, _loaded_backend):
+            return
+        backend = backend or INFERENCE_BACKEND
+        try:
+            tok, model = load_classifier(MODEL_ID, backend)
+            _set_labels(model.config.id2label)
+            mdl, _loaded_backend = model, backend
+        except Exception as e:
+            logger.error(f"Failed to load emotion model: {e}")
+            raise
+
+@torch.no_grad()
+def emotion_probs(texts: List[str], tokenizer=None, model=None) -> torch.Tensor:
+    """Sigmoid probabilities (N x 28) for texts; defaults to the loaded model."""
+    if model is None:
+        load_model()
+        tokenizer, model = tok, mdl
+    inputs = tokenizer(texts, return_tensors="pt", padding=True, truncation=True, max_length=128)
+    return model(**inputs).logits.sigmoid()
 
 def calculate_sentiment_score(probs: torch.Tensor) -> Tuple[str, float]:
     """
     Calculate sentiment label and confidence from model probabilities.
     """
+    load_labels()
     probs = probs.clone()
     probs[NEU_ID] *= NEU_FACTOR
     probs = probs / probs.sum()
-    pos = probs[[i for i, l in LABELS.items() if l in POS_SET]].sum()
-    neg = probs[[i for i, l in LABELS.items() if l in NEG_SET]].sum()
+    pos = probs[POS_IDX].sum()
+    neg = probs[NEG_IDX].sum()
     confidence = round(float(abs(pos - neg)), 3)
     if pos > neg + THRESH:
         return "positive", confidence
@@ -50,51 +114,225 @@ def calculate_sentiment_score(probs: torch.Tensor) -> Tuple[str, float]:
         return "negative", confidence
     return "neutral", confidence
 
+def _blend(sent_ge: str, conf_ge: float, sent_nli: str, conf_nli: float) -> Tuple[str, float]:
+    """
+    Combine GoEmotions and NLI results using the ALPHA weighting.
+    """
+    if sent_ge == sent_nli:
+        return sent_ge, round(ALPHA * conf_ge + (1 - ALPHA)*conf_nli, 3)
+    if ALPHA * conf_ge >= (1 - ALPHA) * conf_nli:
+        return sent_ge, round(ALPHA * conf_ge , 3)
+    return sent_nli, round((1-ALPHA)*conf_nli, 3)
+
+def _build_result(item: Dict, label, confidence) -> Dict:
+    return {
+        "headline": item.get("text", ""),
+        "timestamp": item.get("published", ""),
+        "sourcecountry": item.get("source_country", ""),
+        "sentiment": {
+            "label": label,
+            "confidence": confidence
+        },
+    }
+
+def needs_nli(conf_ge: float, cascade: Optional[bool] = None) -> bool:
+    """
+    Whether a GoEmotions result should be checked with NLI.
+    In cascade mode only confidences inside [NLI_BAND_LOW, NLI_BAND_HIGH)
+    are sent to bart-large-mnli; outside the band GoEmotions is trusted.
+    cascade defaults to NLI_CASCADE.
+    """
+    if not USE_NLI:
+        return False
+    if not (NLI_CASCADE if cascade is None else cascade):
+        return True
+    return NLI_BAND_LOW <= conf_ge < NLI_BAND_HIGH
+
 @torch.no_grad()
+def score_texts(texts: List[str]) -> List[Tuple[str, float, bytes, Optional[bytes]]]:
+    """
+    Score a batch of texts: one GoEmotions forward pass, then NLI only for
+    the rows that need it. Each row is (label, confidence, emotion_probs,
+    nli_scores), the raw scores packed as float16 blobs.
+    Unlike analyze_headlines_batch there is no cache and errors propagate,
+    so callers such as backfill can retry the whole chunk.
+    """
+    with METRICS.timer("goemotions"):
+        probs = emotion_probs(texts)
+    ge = [calculate_sentiment_score(p) for p in probs]
+    gated = [row for row, (_, conf_ge) in enumerate(ge) if needs_nli(conf_ge)]
+    if USE_NLI:
+        NLI_STATS["called"] += len(gated)
+        NLI_STATS["skipped"] += len(texts) - len(gated)
+    with METRICS.timer("nli"):
+        nli = dict(zip(gated, nli_sentiment_batch([texts[row] for row in gated]))) if gated else {}
+    scored = []
+    for row, (sent_ge, conf_ge) in enumerate(ge):
+        emotion_blob = pack_f16(probs[row].tolist())
+        if row in nli:
+            sent_nli, conf_nli, nli_scores = nli[row]
+            nli_blob = pack_f16(nli_scores[c] for c in CANDIDATES)
+            scored.append((*_blend(sent_ge, conf_ge, sent_nli, conf_nli), emotion_blob, nli_blob))
+        else:
+            scored.append((sent_ge, conf_ge, emotion_blob, None))
+    return scored
+
+def rescore_matrix(
+    probs: torch.Tensor,
+    nli: Optional[torch.Tensor] = None,
+    neu_factor: float = None,
+    thresh: float = None,
+    alpha: float = None,
+) -> Tuple[List[str], torch.Tensor]:
+    """
+    Vectorized calculate_sentiment_score + ALPHA blend over stored scores.
+    probs: N x len(LABELS) GoEmotions probabilities.
+    nli:   N x len(CANDIDATES) NLI scores, NaN rows where NLI was not run.
+    Constants default to the module's NEU_FACTOR / THRESH / ALPHA.
+    Returns (labels, confidences) for every row without touching a model.
+    """
+    load_labels()
+    neu_factor = NEU_FACTOR if neu_factor is None else neu_factor
+    thresh = THRESH if thresh is None else thresh
+    alpha = ALPHA if alpha is None else alpha
+    p = probs.float().clone()
+    p[:, NEU_ID] *= neu_factor
+    p = p / p.sum(dim=1, keepdim=True)
+    pos = p[:, POS_IDX].sum(dim=1)
+    neg = p[:, NEG_IDX].sum(dim=1)
+    conf_ge = (pos - neg).abs().round(decimals=3)
+    # CANDIDATES 인덱스: 0=positive, 1=negative, 2=neutral
+    pos_i, neg_i, neu_i = (CANDIDATES.index(c) for c in ("positive", "negative", "neutral"))
+    lab_ge = torch.full_like(conf_ge, neu_i, dtype=torch.long)
+    lab_ge[neg > pos + thresh] = neg_i
+    lab_ge[pos > neg + thresh] = pos_i
+
+    label, conf = lab_ge, conf_ge
+    if nli is not None:
+        nli = nli.float()
+        has_nli = ~nli.isnan().any(dim=1)
+        conf_nli, lab_nli = nli.nan_to_num(0.0).max(dim=1)
+        conf_nli = conf_nli.round(decimals=3)
+        same = lab_ge == lab_nli
+        ge_wins = alpha * conf_ge >= (1 - alpha) * conf_nli
+        blended = torch.where(
+            same, (alpha * conf_ge + (1 - alpha) * conf_nli).round(decimals=3),
+            torch.where(ge_wins, (alpha * conf_ge).round(decimals=3), ((1 - alpha) * conf_nli).round(decimals=3)),
+        )
+        label = torch.where(has_nli & ~same & ~ge_wins, lab_nli, lab_ge)
+        conf = torch.where(has_nli, blended, conf_ge)
+    return [CANDIDATES[i] for i in label.tolist()], conf
+
+def sentiment_cache_key(text: str) -> str:
+    """
+    Content address for a headline under the current model/scoring config.
+    Syndicated copies of the same headline map to the same key.
+    """
+    normalized = " ".join(unescape(text).lower().split())
+    config = [
+        normalized, MODEL_ID, NLI_MODEL_ID, INFERENCE_BACKEND, NEU_FACTOR, THRESH, ALPHA,
+        USE_NLI, NLI_CASCADE, NLI_BAND_LOW, NLI_BAND_HIGH,
+    ]
+    return hashlib.sha256(json.dumps(config).encode("utf-8")).hexdigest()
+
 def analyze_headline_emotion(item: Dict) -> Dict:
     """
     Run sentiment analysis on a news item dict.
     Returns a dict with headline, timestamp, sourcecountry, and sentiment result.
     """
+    # ts_dt = datetime.strptime(ts_iso, "%Y%m%d %H%M%SZ")
+    # ts_txt = ts_dt.strftime("%Y-%m-%d %H:%M UTC")
+    # top3   = torch.topk(probs, 3)
+    return analyze_headlines_batch([item])[0]
+
+def analyze_headlines_batch(items: List[Dict], batch_size: int = BATCH_SIZE, return_raw: bool = False) -> List[Dict]:
+    """
+    Run sentiment analysis on a list of news item dicts in padded batches.
+    Cached results are used first and each distinct headline is scored once.
+    The rest are sorted by token length so each batch carries as little
+    padding as possible. Results are returned in the input order and have
+    the same shape as analyze_headline_emotion; with return_raw each also
+    carries "raw_scores": (emotion_probs, nli_scores) float16 blobs.
+    """
+    results: List[Dict] = [None] * len(items)
+    if not items:
+        return results
+    texts = [item.get("text", "") for item in items]
+
+    # key -> 같은 헤드라인을 가진 item 인덱스들
+    groups: Dict[str, List[int]] = {}
+    for i, text in enumerate(texts):
+        key = sentiment_cache_key(text) if USE_CACHE else str(i)
+        groups.setdefault(key, []).append(i)
+    cached = get_cached_sentiments(groups) if USE_CACHE else {}
+    for key, (label, confidence, emotion_blob, nli_blob) in cached.items():
+        CACHE_STATS["hits"] += len(groups[key])
+        for i in groups.pop(key):
+            results[i] = _build_result(items[i], label, confidence)
+            if return_raw:
+                results[i]["raw_scores"] = (emotion_blob, nli_blob)
+    if USE_CACHE:
+        CACHE_STATS["misses"] += len(groups)
+    if not groups:
+        return results
+
+    keys = list(groups)
     try:
-        text = item["text"]
-        timestamp = item["published"]
-        sourcecountry = item["source_country"]
-        inputs = tok(text, return_tensors="pt", truncation=True, max_length=128)
-        probs  = mdl(**inputs).logits.sigmoid()[0]
-        sent_ge, conf_ge = calculate_sentiment_score(probs)
-        if USE_NLI:
-            sent_nli, conf_nli, _ = nli_sentiment(text)
-            if sent_ge == sent_nli:
-                sent_final = sent_ge
-                conf_final = round(ALPHA * conf_ge + (1 - ALPHA)*conf_nli, 3)
-            else:
-                if ALPHA * conf_ge >= (1 - ALPHA) * conf_nli:
-                    sent_final, conf_final = sent_ge, round(ALPHA * conf_ge , 3)
-                else:
-                    sent_final, conf_final = sent_nli, round((1-ALPHA)*conf_nli, 3)
-        else:
-            sent_final, conf_final = sent_ge, conf_ge
-        # ts_dt = datetime.strptime(ts_iso, "%Y%m%d %H%M%SZ")
-        # ts_txt = ts_dt.strftime("%Y-%m-%d %H:%M UTC")
-        # top3   = torch.topk(probs, 3)
-        return {
-            "headline": text,
-            "timestamp": timestamp,
-            "sourcecountry" : sourcecountry,
-            "sentiment": {
-                "label": sent_final,
-                "confidence": conf_final
-            },
-        }
+        load_model()
+        lengths = [len(ids) for ids in tok([texts[groups[k][0]] for k in keys], truncation=True, max_length=128)["input_ids"]]
     except Exception as e:
-        logger.error(f"Sentiment analysis failed: {e}")
-        return {
-            "headline": item.get("text", ""),
-            "timestamp": item.get("published", ""),
-            "sourcecountry": item.get("source_country", ""),
-            "sentiment": {
-                "label": None,
-                "confidence": None
-            },
-        } 
\ No newline at end of file
+        logger.error(f"Tokenization failed: {e}")
+        return [r or _build_result(item, None, None) for r, item in zip(results, items)]
+    order = [keys[j] for j in sorted(range(len(keys)), key=lambda j: lengths[j])]
+
+    fresh = []
+    for start in range(0, len(order), batch_size):
+        chunk = order[start:start + batch_size]
+        try:
+            scored = score_texts([texts[groups[k][0]] for k in chunk])
+        except Exception as e:
+            logger.error(f"Batch sentiment analysis failed: {e}")
+            scored = [(None, None, None, None)] * len(chunk)
+        for key, (sent_final, conf_final, emotion_blob, nli_blob) in zip(chunk, scored):
+            for i in groups[key]:
+                results[i] = _build_result(items[i], sent_final, conf_final)
+                if return_raw:
+                    results[i]["raw_scores"] = (emotion_blob, nli_blob)
+            if sent_final is not None:
+                fresh.append((key, sent_final, conf_final, emotion_blob, nli_blob))
+    if USE_CACHE:
+        put_cached_sentiments(fresh, max_rows=SENTIMENT_CACHE_MAX_ROWS)
+    return results
+
+@torch.no_grad()
+def cascade_drift(texts: List[str], batch_size: int = BATCH_SIZE) -> Dict[str, float]:
+    """
+    Compare cascade mode against the always-NLI path on a fixed set of texts.
+    Both models run once over every text; the two paths are then derived
+    from the same scores so the report only reflects the gating.
+    """
+    load_model()
+    agree, skipped, deltas = 0, 0, []
+    for start in range(0, len(texts), batch_size):
+        chunk = texts[start:start + batch_size]
+        probs = emotion_probs(chunk)
+        nli = nli_sentiment_batch(chunk)
+        for p, (sent_nli, conf_nli, _) in zip(probs, nli):
+            sent_ge, conf_ge = calculate_sentiment_score(p)
+            always = _blend(sent_ge, conf_ge, sent_nli, conf_nli)
+            if needs_nli(conf_ge, cascade=True):
+                cascade = always
+            else:
+                cascade = (sent_ge, conf_ge)
+                skipped += 1
+            agree += always[0] == cascade[0]
+            deltas.append(abs(always[1] - cascade[1]))
+    n = len(texts)
+    return {
+        "n": n,
+        "nli_skipped": skipped,
+        "skip_rate": round(skipped / n, 3) if n else 0.0,
+        "label_agreement": round(agree / n, 3) if n else 1.0,
+        "mean_conf_delta": round(sum(deltas) / n, 3) if n else 0.0,
+        "max_conf_delta": round(max(deltas), 3) if deltas else 0.0,
+    }
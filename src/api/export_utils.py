@@ -0,0 +1,190 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from db import KST, get_latest_articles_with_rowid, get_untranslated, save_article_translations
+
+'''
+Export of the latest articles for osc.py / TouchDesigner.
+  {name}.json                : 최신 기사 전체 (JSON 배열, pretty 또는 compact)
+  {name}.delta.ndjson        : 직전 export 이후 추가된 기사 (한 줄에 기사 하나)
+  {name}.manifest.json       : seq 번호, 파일 이름, delta 적용 가능 여부
+모든 파일은 임시 파일에 쓴 뒤 os.replace로 교체 → 읽는 쪽은 항상 완성된 파일만 봄.
+manifest를 마지막에 교체하므로 manifest가 가리키는 파일은 이미 최신 상태.
+
+Reader 규칙:
+  manifest["delta_base_seq"] == 내가 가진 seq  → 기존 목록 + delta를 timestamp 내림차순으로
+                                                 정렬해 앞에서 manifest["count"]개만 유지
+  그 외 (처음, seq를 놓친 경우, delta_base_seq가 null) → 전체 파일을 다시 읽음
+'''
+
+# --- Config ---
+EXPORT_FORMATS = ("pretty", "compact")
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+def delta_path(filename: str) -> str:
+    return os.path.splitext(filename)[0] + ".delta.ndjson"
+
+def manifest_path(filename: str) -> str:
+    return os.path.splitext(filename)[0] + ".manifest.json"
+
+def atomic_write_text(path: str, text: str) -> None:
+    """Write text to a temp file in the same directory, fsync it and rename it over path."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".export-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)   # mkstemp는 0600으로 생성
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+def read_manifest(filename: str) -> Dict[str, Any]:
+    """Manifest of the previous export of filename, or {} if there is none."""
+    try:
+        with open(manifest_path(filename), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _article(row) -> Dict[str, Any]:
+    _, url, headline, source_country, timestamp, sentiment_label, sentiment_confidence = row
+    return {
+        "url": url,
+        "headline": headline,
+        "source_country": source_country,
+        "timestamp": timestamp,
+        "sentiment": {
+            "label": sentiment_label,
+            "confidence": sentiment_confidence
+        }
+    }
+
+def fill_translations(rows: List[tuple], translate: Optional[Callable[[List[str]], List[Optional[str]]]]) -> List[tuple]:
+    """
+    Give rows without a stored translation their Korean headline (lazy translation).
+    A near-duplicate cluster's stored translation is reused, and only one
+    headline per cluster is sent; the rest are translated in one translate()
+    call and stored. Without translate, or where it fails (raises or returns
+    None), the English headline is exported but not stored, and retried next time.
+    """
+    missing = get_untranslated(row[1] for row in rows if row[2] is None)
+    if not missing:
+        return rows
+    headlines = {url: cluster_ko for url, (_, _, cluster_ko) in missing.items() if cluster_ko}
+    todo, followers = {}, {}   # 번역할 영문 → url / cluster 대표로 번역될 url → 같은 cluster의 url
+    by_cluster = {}
+    for url, (headline_en, cluster_id, _) in missing.items():
+        if url in headlines or not headline_en:
+            continue
+        if cluster_id is not None and cluster_id in by_cluster:
+            followers.setdefault(by_cluster[cluster_id], []).append(url)
+            continue
+        by_cluster[cluster_id] = url
+        todo[url] = headline_en
+    if todo and translate is not None:
+        try:
+            for url, headline_ko in zip(todo, translate(list(todo.values()))):
+                if not headline_ko:
+                    continue
+                headlines[url] = headline_ko
+                headlines.update((other, headline_ko) for other in followers.get(url, ()))
+        except Exception as e:
+            logger.error(f"Lazy translation of {len(todo)} headlines failed: {e}")
+    save_article_translations(headlines.items())
+    filled = []
+    for row in rows:
+        if row[2] is None and row[1] in missing:
+            row = (*row[:2], headlines.get(row[1]) or missing[row[1]][0], *row[3:])
+        filled.append(row)
+    return filled
+
+def apply_delta(articles: List[Dict], added: List[Dict], count: int) -> List[Dict]:
+    """What a reader holding `articles` gets after applying a delta (see module docstring)."""
+    by_url = {a["url"]: a for a in articles}
+    by_url.update((a["url"], a) for a in added)
+    return sorted(by_url.values(), key=lambda a: a["timestamp"] or "", reverse=True)[:count]
+
+def _by_url(articles: List[Dict]) -> Dict[str, Dict]:
+    return {a["url"]: a for a in articles}
+
+def _load_previous(filename: str) -> Optional[List[Dict]]:
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def export_latest(
+    filename: str,
+    export_count: int,
+    fmt: str = "pretty",
+    delta: bool = True,
+    one_per_cluster: bool = False,
+    translate: Optional[Callable[[List[str]], List[str]]] = None,
+) -> Dict[str, Any]:
+    """
+    Atomically export the export_count newest articles to filename.
+    With delta=True the articles added since the previous export are also
+    written as NDJSON, and the manifest says whether a reader of the previous
+    seq may apply them instead of re-reading the full file. If nothing changed
+    no file is rewritten. one_per_cluster keeps only the newest article of
+    each near-duplicate cluster. Articles stored without a translation are
+    translated here with translate (see fill_translations). Returns the
+    current manifest.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt} (choose from {EXPORT_FORMATS})")
+    rows = fill_translations(get_latest_articles_with_rowid(export_count, one_per_cluster=one_per_cluster), translate)
+    data = [_article(row) for row in rows]
+    if fmt == "compact":
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    digest = hashlib.sha256(json.dumps(data, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+    prev = read_manifest(filename)
+    if prev.get("sha256") == digest and prev.get("format") == fmt and os.path.exists(filename):
+        return prev   # 변경 없음: 다시 쓰지 않음 (osc.py도 다시 읽지 않음)
+
+    last_rowid = prev.get("last_rowid", 0)
+    manifest = {
+        "seq": prev.get("seq", 0) + 1,
+        "full": os.path.basename(filename),
+        "format": fmt,
+        "count": export_count,
+        "articles": len(data),
+        "sha256": digest,
+        "last_rowid": max([row[0] for row in rows] + [last_rowid]),
+        "exported_at": datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S"),
+        "delta": None,
+        "delta_base_seq": None,
+        "delta_articles": 0,
+    }
+    if delta:
+        added = [article for row, article in zip(rows, data) if row[0] > last_rowid]
+        previous = _load_previous(filename) if prev else None
+        # 기존 기사가 바뀐 경우(rescore 등)엔 delta만으로 재현되지 않으므로 전체를 다시 읽게 함
+        if previous is not None and _by_url(apply_delta(previous, added, export_count)) == _by_url(data):
+            manifest["delta_base_seq"] = prev["seq"]
+        atomic_write_text(delta_path(filename), "".join(
+            json.dumps(article, ensure_ascii=False) + "\n" for article in added
+        ))
+        manifest["delta"] = os.path.basename(delta_path(filename))
+        manifest["delta_articles"] = len(added)
+
+    atomic_write_text(filename, text)
+    atomic_write_text(manifest_path(filename), json.dumps(manifest, ensure_ascii=False, indent=2))
+    return manifest
@@ -1,84 +1,126 @@
 from __future__ import annotations
 
+import math
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 
 import pandas as pd
 from gdeltdoc import GdeltDoc, Filters
-from db import init_db, get_latest_articles
+from db import get_latest_articles, filter_new_urls
+from metrics import METRICS
 import json
 
-__all__ = ["fetch_gdelt"]
+__all__ = ["fetch_gdelt", "iter_gdelt"]
+
+''' GDELT DOC 2.0 API (gdeltdoc)
+무료 / API point 없음, 요청당 최대 250건
+https://blog.gdeltproject.org/gdelt-doc-2-0-api-debuts/
+'''
 
 # --- Config ---
 MIN_LEN = 15  # Minimum headline length
+MAX_RECORDS = 250            # article_search 요청당 최대 결과 수 (API 제한)
+KEEP_LANGS = {"english"}
+SEENDATE_FORMAT = "%Y%m%dT%H%M%SZ"   # 예: 20250625T083000Z (UTC)
 GDOC = GdeltDoc()
 
 # --- Logging Setup ---
 logger = logging.getLogger(__name__)
 
+def _to_articles(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Filter an article_search DataFrame with column operations only and return
+    dicts in the worldnews_api schema (url, source_country, headline, date in KST).
+    """
+    if df is None or df.empty:
+        return []
+    headline = df["title"].fillna("").astype(str).str.strip()
+    url = df["url"].fillna("").astype(str).str.strip()
+    seen = (
+        pd.to_datetime(df["seendate"], format=SEENDATE_FORMAT, utc=True, errors="coerce")
+        .dt.tz_convert("Asia/Seoul")
+    )
+    keep = (
+        df["language"].fillna("").str.lower().isin(KEEP_LANGS)
+        & (headline.str.len() >= MIN_LEN)
+        & (url != "")
+        & seen.notna()
+    )
+    out = pd.DataFrame({
+        "url": url[keep],
+        "source_country": df.loc[keep, "sourcecountry"].fillna("Unknown").astype(str).replace("", "Unknown"),
+        "headline": headline[keep],
+        "date": seen[keep].dt.strftime("%Y-%m-%d %H:%M:%S"),
+    }).drop_duplicates("url")
+    METRICS.incr("gdelt_rows_filtered", len(df) - len(out))
+    return out.to_dict("records")
+
 def fetch_gdelt(
     *,
     timespan: str = "1hours",
-    num_records: int = 250,
+    num_records: int = MAX_RECORDS,
     countries: list[str] | None = None,
+    new_only: bool = False,
 ) -> List[Dict[str, Any]]:
     """
-    Fetch articles from GDELT, filter by language and minimum headline length.
-    Returns a list of article dicts.
+    Fetch articles from GDELT, filter by language, minimum headline length,
+    URL presence and seendate, and return article dicts.
+    new_only drops URLs already in the DB (one bulk lookup).
     """
-    country_filter = " OR ".join(countries) if countries else ""
-    
-    filt = Filters(
-        timespan=timespan,
-        num_records=num_records,
-        country=country_filter
-    )
-    
+    filters = {"timespan": timespan, "num_records": min(num_records, MAX_RECORDS)}
+    if countries:
+        filters["country"] = countries
+
     try:
-        df: pd.DataFrame = GDOC.article_search(filt)
+        with METRICS.timer("gdelt_request"):
+            df: pd.DataFrame = GDOC.article_search(Filters(**filters))
+        METRICS.incr("gdelt_requests")
+        METRICS.incr("gdelt_results", len(df))
     except Exception as exc:
         logger.warning(f"gdeltdoc fetch failed: {exc}")
         return []
 
-    keep_langs = {"english"}
-    df = df[df["language"].str.lower().isin(keep_langs)]
+    articles = _to_articles(df)
+    if new_only and articles:
+        new_urls = set(filter_new_urls(a["url"] for a in articles))
+        articles = [a for a in articles if a["url"] in new_urls]
+    return articles
 
-    fresh: List[Dict[str, Any]] = []
-    for _, row in df.iterrows():
-        url = str(row.get("url", ""))
-        headline = str(row.get("title") or "").strip()
-        source_country = str(row.get("sourcecountry"))
-        date = str(row.get("seendate") or "")
-        
-        if not url or len(headline) < MIN_LEN:
-            continue
-        
-        fresh.append({
-            "url": url,
-            "source_country": source_country,
-            "headline": headline,
-            "date": date
-        })
-
-    return fresh
+def iter_gdelt(
+    timespan: float = 1.0,
+    max_articles: int = MAX_RECORDS,
+    countries: list[str] | None = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield GDELT results as one page, like iter_worldnews.
+    timespan is in hours (rounded up, as the API takes whole hours).
+    """
+    page = fetch_gdelt(
+        timespan=f"{max(1, math.ceil(timespan))}hours",
+        num_records=max_articles,
+        countries=countries,
+    )
+    print(f"[fetch_gdelt] Recieved {len(page)} articles.")
+    if page:
+        yield page
 
 def get_latest_articles_with_emotion(min_count: int, hours: int) -> List[Dict[str, Any]]:
+    """Latest stored articles with their stored sentiment, in the analyze_headline_emotion result shape."""
     articles = get_latest_articles(min_count=min_count, hours=hours)
     result = []
-    for url, headline, source_country, timestamp in articles:
-        item = {
-            "text": headline,
-            "source_country": source_country,
-            "published": timestamp
-        }
-        emotion_result = headline_emotion(item)
-        emotion_result["url"] = url
-        result.append(emotion_result)
+    for url, headline, source_country, timestamp, sentiment_label, sentiment_confidence in articles:
+        result.append({
+            "headline": headline,
+            "timestamp": timestamp,
+            "sourcecountry": source_country,
+            "sentiment": {
+                "label": sentiment_label,
+                "confidence": sentiment_confidence
+            },
+            "url": url,
+        })
     return result
 
 def save_articles_to_json(articles: List[Dict[str, Any]], filename: str):
     with open(filename, "w", encoding="utf-8") as f:
         json.dump(articles, f, ensure_ascii=False, indent=2)
-
-init_db()
\ No newline at end of file
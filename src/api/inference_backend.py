@@ -0,0 +1,138 @@
+import os
+import time
+import logging
+from typing import Dict, List, Tuple
+
+import torch
+from metrics import METRICS
+
+'''
+CPU inference backends for the GoEmotions / NLI classifiers.
+  torch       : PyTorch fp32 (기본값)
+  torch-int8  : PyTorch dynamic int8 quantization (nn.Linear)
+  onnx        : ONNX Runtime (optimum 필요: pip install optimum[onnxruntime])
+INFERENCE_BACKEND 환경변수로 선택. ONNX 변환 결과는 MODEL_CACHE_DIR에 저장 후 재사용.
+'''
+
+# --- Config ---
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")
+MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", "model_cache")
+BACKENDS = ("torch", "torch-int8", "onnx")
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+def onnx_model_dir(model_id: str) -> str:
+    return os.path.join(MODEL_CACHE_DIR, model_id.replace("/", "__") + "-onnx")
+
+def export_onnx(model_id: str) -> str:
+    """Export model_id to ONNX once and return the cached directory."""
+    path = onnx_model_dir(model_id)
+    if os.path.isdir(path):
+        return path
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+    except ImportError as e:
+        raise ImportError("onnx backend requires optimum[onnxruntime]") from e
+    from transformers import AutoTokenizer
+    logger.info(f"Exporting {model_id} to ONNX → {path}")
+    ORTModelForSequenceClassification.from_pretrained(model_id, export=True).save_pretrained(path)
+    AutoTokenizer.from_pretrained(model_id).save_pretrained(path)
+    return path
+
+def load_classifier(model_id: str, backend: str = None) -> Tuple[object, object]:
+    """
+    Load (tokenizer, model) for a sequence classifier on the given backend.
+    Every backend's model is called as model(**inputs).logits and exposes
+    model.config, so callers do not need to know which one they got.
+    """
+    backend = backend or INFERENCE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {backend} (choose from {BACKENDS})")
+    with METRICS.timer("model_load"):
+        return _load_classifier(model_id, backend)
+
+def _load_classifier(model_id: str, backend: str) -> Tuple[object, object]:
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    if backend == "onnx":
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+        path = export_onnx(model_id)
+        return AutoTokenizer.from_pretrained(path), ORTModelForSequenceClassification.from_pretrained(path)
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModelForSequenceClassification.from_pretrained(model_id).eval()
+    if backend == "torch-int8":
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return tokenizer, model
+
+def parity_report(texts: List[str], backend: str) -> Dict[str, Dict[str, float]]:
+    """
+    Compare `backend` against PyTorch fp32 on the same texts.
+    Reports label agreement, confidence deltas and throughput for the
+    GoEmotions sentiment and the NLI sentiment separately.
+    """
+    import emotion_utils
+    import sentiment_nli
+
+    def timed(fn, *args):
+        start = time.perf_counter()
+        out = fn(*args)
+        return out, time.perf_counter() - start
+
+    def compare(ref, cand, ref_s, cand_s):
+        n = len(ref)
+        deltas = [abs(r[1] - c[1]) for r, c in zip(ref, cand)]
+        return {
+            "n": n,
+            "label_agreement": round(sum(r[0] == c[0] for r, c in zip(ref, cand)) / n, 4) if n else 1.0,
+            "mean_conf_delta": round(sum(deltas) / n, 4) if n else 0.0,
+            "max_conf_delta": round(max(deltas), 4) if deltas else 0.0,
+            "fp32_per_s": round(n / ref_s, 1) if ref_s else None,
+            f"{backend}_per_s": round(n / cand_s, 1) if cand_s else None,
+        }
+
+    report = {}
+    emotion_utils.load_model(backend="torch")
+    ge_tok, ge_mdl = load_classifier(emotion_utils.MODEL_ID, backend)
+    ref_p, ref_s = timed(emotion_utils.emotion_probs, texts)
+    cand_p, cand_s = timed(emotion_utils.emotion_probs, texts, ge_tok, ge_mdl)
+    report["goemotions"] = compare(
+        [emotion_utils.calculate_sentiment_score(p) for p in ref_p],
+        [emotion_utils.calculate_sentiment_score(p) for p in cand_p],
+        ref_s, cand_s,
+    )
+    del ge_tok, ge_mdl
+
+    nli_tok, nli_mdl = load_classifier(sentiment_nli.NLI_MODEL_ID, "torch")
+    ref_p, ref_s = timed(sentiment_nli.entailment_probs, texts, nli_tok, nli_mdl)
+    nli_tok, nli_mdl = load_classifier(sentiment_nli.NLI_MODEL_ID, backend)
+    cand_p, cand_s = timed(sentiment_nli.entailment_probs, texts, nli_tok, nli_mdl)
+    def top(probs):
+        return [(sentiment_nli.CANDIDATES[int(i)], float(v)) for v, i in zip(*probs.max(dim=-1))]
+
+    report["nli"] = compare(top(ref_p), top(cand_p), ref_s, cand_s)
+    return report
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    FIXTURE = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "headlines.txt")
+
+    parser = argparse.ArgumentParser(description="Inference backend export / parity check")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("export", help="ONNX 변환 후 MODEL_CACHE_DIR에 저장")
+    p_parity = sub.add_parser("parity", help="fp32 대비 라벨 일치율 / confidence 차이")
+    p_parity.add_argument("--backend", default="torch-int8", choices=BACKENDS)
+    p_parity.add_argument("--fixture", default=FIXTURE)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    if args.cmd == "export":
+        from emotion_utils import MODEL_ID
+        from sentiment_nli import NLI_MODEL_ID
+        for model_id in (MODEL_ID, NLI_MODEL_ID):
+            print(export_onnx(model_id))
+    else:
+        with open(args.fixture, "r", encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+        print(json.dumps(parity_report(texts, args.backend), indent=2))
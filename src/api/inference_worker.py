@@ -0,0 +1,91 @@
+import logging
+from multiprocessing.connection import Listener, Client
+from typing import Any, Dict, List, Optional
+
+import news2emotion
+from emotion_utils import load_model, analyze_headlines_batch
+from sentiment_nli import load_nli_model
+
+from config import WORKER_HOST, WORKER_PORT, worker_authkey
+
+'''
+Long-lived inference worker.
+Loads GoEmotions / NLI once and serves requests over a local socket:
+  {"cmd": "cycle", "kwargs": {...}}   -> news2emotion.main(**kwargs)
+  {"cmd": "analyze", "items": [...]}  -> analyze_headlines_batch(items)
+  {"cmd": "ping"} / {"cmd": "shutdown"}
+'''
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+class InferenceWorker:
+    """In-process handle that keeps both models warm between cycles."""
+
+    def __init__(self, warm: bool = True):
+        if warm:
+            load_model()
+            load_nli_model()
+
+    def run_cycle(self, **kwargs) -> Dict[str, int]:
+        return news2emotion.main(**kwargs)
+
+    def analyze(self, items: List[Dict]) -> List[Dict]:
+        return analyze_headlines_batch(items)
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        cmd = request.get("cmd")
+        try:
+            if cmd == "cycle":
+                return {"ok": True, "result": self.run_cycle(**request.get("kwargs", {}))}
+            if cmd == "analyze":
+                return {"ok": True, "result": self.analyze(request.get("items", []))}
+            if cmd == "ping":
+                return {"ok": True, "result": "pong"}
+            return {"ok": False, "error": f"unknown command: {cmd}"}
+        except Exception as e:
+            logger.error(f"Worker request '{cmd}' failed: {e}")
+            return {"ok": False, "error": str(e)}
+
+def serve(host: str = WORKER_HOST, port: int = WORKER_PORT) -> None:
+    """Load the models, then answer requests one connection at a time."""
+    authkey = worker_authkey()   # 키가 없으면 모델 로딩 전에 실패
+    worker = InferenceWorker()
+    with Listener((host, port), authkey=authkey) as listener:
+        logger.info(f"Inference worker listening on {host}:{port}")
+        while True:
+            try:
+                with listener.accept() as conn:
+                    request = conn.recv()
+                    if request.get("cmd") == "shutdown":
+                        conn.send({"ok": True, "result": "bye"})
+                        break
+                    conn.send(worker.handle(request))
+            except (EOFError, ConnectionError) as e:
+                logger.warning(f"Worker connection dropped: {e}")
+
+def request_worker(
+    request: Dict[str, Any],
+    host: str = WORKER_HOST,
+    port: int = WORKER_PORT,
+    timeout: Optional[float] = None,
+) -> Any:
+    """Send one request to a running worker and return its result."""
+    with Client((host, port), authkey=worker_authkey()) as conn:
+        conn.send(request)
+        if timeout is not None and not conn.poll(timeout):
+            raise TimeoutError(f"Worker did not answer within {timeout}s")
+        response = conn.recv()
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error"))
+    return response["result"]
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Resonance inference worker")
+    parser.add_argument("--host", default=WORKER_HOST)
+    parser.add_argument("--port", type=int, default=WORKER_PORT)
+
+    args = parser.parse_args()
+    serve(host=args.host, port=args.port)
@@ -0,0 +1,172 @@
+import os
+import json
+import math
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+'''
+Per-run instrumentation for news2emotion.
+  METRICS.timer("name")   : wall / CPU(thread) 시간 누적
+  METRICS.incr("name", n) : 카운터 (cache hit, 중복, 실패, API 비용 등)
+run이 끝나면 JSON 리포트와 (선택) Prometheus textfile collector 형식으로 저장.
+'''
+
+# --- Config ---
+WORLDNEWS_POINTS_PER_REQUEST = 1.0    # WorldNews: 요청당 1 point
+WORLDNEWS_POINTS_PER_RESULT = 0.01    # + 결과 1건당 0.01 point
+PROMETHEUS_PREFIX = "resonance"
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+
+class RunMetrics:
+    """Thread-safe timers and counters for one run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.timers: Dict[str, Dict[str, float]] = {}
+            self.counters: Dict[str, float] = {}
+
+    def get(self, name: str) -> float:
+        with self._lock:
+            return self.counters.get(name, 0)
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_time(self, name: str, wall: float, cpu: float) -> None:
+        with self._lock:
+            t = self.timers.setdefault(name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0})
+            t["calls"] += 1
+            t["wall_s"] += wall
+            t["cpu_s"] += cpu
+
+    @contextmanager
+    def timer(self, name: str):
+        """Time a block: wall clock and CPU time of the calling thread."""
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - wall, time.thread_time() - cpu)
+
+    def worldnews_points(self) -> float:
+        return round(
+            self.counters.get("worldnews_requests", 0) * WORLDNEWS_POINTS_PER_REQUEST
+            + self.counters.get("worldnews_results", 0) * WORLDNEWS_POINTS_PER_RESULT, 2)
+
+    def report(self, stages: Optional[List[Dict[str, Any]]] = None, **extra) -> Dict[str, Any]:
+        with self._lock:
+            timers = {k: {**v, "wall_s": round(v["wall_s"], 4), "cpu_s": round(v["cpu_s"], 4)}
+                      for k, v in self.timers.items()}
+            counters = dict(self.counters)
+        return {
+            "started": self.started,
+            "duration_s": round(time.time() - self.started, 3),
+            "timers": timers,
+            "counters": counters,
+            "worldnews_points": self.worldnews_points(),
+            "stages": stages or [],
+            **extra,
+        }
+
+
+METRICS = RunMetrics()
+
+
+def worldnews_cost(results: float, page_size: int = 100) -> float:
+    """Points for a search that returns `results` results in pages of page_size (at least one request)."""
+    requests = max(1, math.ceil(results / page_size))
+    return round(requests * WORLDNEWS_POINTS_PER_REQUEST + results * WORLDNEWS_POINTS_PER_RESULT, 2)
+
+
+def _atomic_write(path: str, text: str) -> None:
+    from export_utils import atomic_write_text
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    atomic_write_text(path, text)
+
+def write_json_report(report: Dict[str, Any], path: str) -> None:
+    _atomic_write(path, json.dumps(report, ensure_ascii=False, indent=2))
+
+def _metric_name(name: str) -> str:
+    return "".join(ch if ch.isalnum() else "_" for ch in name).strip("_").lower()
+
+def write_prometheus(report: Dict[str, Any], path: str) -> None:
+    """Write the report in the node_exporter textfile collector format (*.prom)."""
+    p = PROMETHEUS_PREFIX
+    lines = [
+        f"# TYPE {p}_run_timestamp_seconds gauge",
+        f"{p}_run_timestamp_seconds {report['started']:.0f}",
+        f"# TYPE {p}_run_duration_seconds gauge",
+        f"{p}_run_duration_seconds {report['duration_s']}",
+        f"# TYPE {p}_worldnews_points gauge",
+        f"{p}_worldnews_points {report['worldnews_points']}",
+        f"# TYPE {p}_timer_wall_seconds gauge",
+        *(f'{p}_timer_wall_seconds{{name="{k}"}} {v["wall_s"]}' for k, v in report["timers"].items()),
+        f"# TYPE {p}_timer_cpu_seconds gauge",
+        *(f'{p}_timer_cpu_seconds{{name="{k}"}} {v["cpu_s"]}' for k, v in report["timers"].items()),
+    ]
+    for key in ("items_in", "items_out", "failures", "busy_s", "cpu_s", "blocked_s"):
+        lines.append(f"# TYPE {p}_stage_{key} gauge")
+        lines += [f'{p}_stage_{key}{{stage="{st["stage"]}"}} {st[key]}' for st in report["stages"] if key in st]
+    for name, value in sorted(report["counters"].items()):
+        lines += [f"# TYPE {p}_{_metric_name(name)} gauge", f"{p}_{_metric_name(name)} {value}"]
+    _atomic_write(path, "\n".join(lines) + "\n")
+
+
+def profiled(fn: Callable, name: str, profile_dir: str) -> Callable:
+    """
+    Wrap a stage function so each call runs under cProfile (accumulated into
+    {profile_dir}/{name}.pstats) and, if torch is installed, the torch profiler
+    (one Chrome trace per call: {name}_torch_{n}.json).
+    """
+    import cProfile
+    import pstats
+
+    os.makedirs(profile_dir, exist_ok=True)
+    try:
+        from torch.profiler import profile, ProfilerActivity
+    except ImportError:
+        profile = None
+    lock = threading.Lock()
+    state = {"stats": None, "calls": 0}
+
+    def wrapper(batch):
+        with lock:
+            state["calls"] += 1
+            n = state["calls"]
+        prof = cProfile.Profile()
+        try:
+            if profile is not None:
+                with profile(activities=[ProfilerActivity.CPU], record_shapes=True) as tprof:
+                    prof.enable()
+                    out = fn(batch)
+                    prof.disable()
+                tprof.export_chrome_trace(os.path.join(profile_dir, f"{name}_torch_{n}.json"))
+            else:
+                prof.enable()
+                out = fn(batch)
+                prof.disable()
+        finally:
+            prof.disable()
+            with lock:
+                if state["stats"] is None:
+                    state["stats"] = pstats.Stats(prof)
+                else:
+                    state["stats"].add(prof)
+                state["stats"].dump_stats(os.path.join(profile_dir, f"{name}.pstats"))
+        return out
+
+    return wrapper
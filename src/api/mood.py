@@ -0,0 +1,104 @@
+import json
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+load_dotenv()   # osc.py에서 바로 import될 때도 .env의 DB_FILE 사용
+
+from db import get_mood_buckets, prune_mood_buckets
+
+'''
+Global / per-country mood from the mood_buckets aggregates.
+mood_buckets는 articles 트리거가 증분 갱신하므로 (db._create_mood_triggers) 조회는
+몇 개의 bucket 행만 읽음 → osc.py가 /mood 주소로 자주 보내도 부담 없음.
+시간은 기사 발행 시각(ts_epoch) 기준.
+'''
+
+# --- Config ---
+WINDOW_MINUTES = 180          # rolling mood 기본 구간 (분)
+FINE_MAX_WINDOW_HOURS = 12    # 이 구간까지는 10분 bucket, 더 길면 1시간 bucket
+FINE_RETENTION_DAYS = 7       # 10분 bucket 보관 기간 (1시간 bucket은 계속 보관)
+TOP_COUNTRIES = 10            # rolling_mood에 포함할 국가 수 (기사 수 순)
+LABELS = ("positive", "neutral", "negative")
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+def bucket_size_for(window_s: float) -> int:
+    return 600 if window_s <= FINE_MAX_WINDOW_HOURS * 3600 else 3600
+
+def _summary(counts: Dict[str, List[float]]) -> Dict[str, Any]:
+    """{label: [count, confidence_sum]} → counts, shares, mean confidence and score (positive - negative share)."""
+    total = sum(n for n, _ in counts.values())
+    labels = {}
+    for label in sorted(set(LABELS) | set(counts)):
+        n, confidence_sum = counts.get(label, (0, 0.0))
+        labels[label] = {
+            "count": int(n),
+            "share": round(n / total, 3) if total else 0.0,
+            "confidence": round(confidence_sum / n, 3) if n else None,
+        }
+    score = (labels["positive"]["count"] - labels["negative"]["count"]) / total if total else 0.0
+    return {"total": int(total), "score": round(score, 3), "labels": labels}
+
+def rolling_mood(
+    window_minutes: float = WINDOW_MINUTES,
+    now: Optional[float] = None,
+    country: Optional[str] = None,
+    top_countries: int = TOP_COUNTRIES,
+) -> Dict[str, Any]:
+    """
+    Mood of the articles published in the last window_minutes: overall and
+    for the top_countries countries with the most articles.
+    """
+    now = time.time() if now is None else now
+    window_s = window_minutes * 60
+    size = bucket_size_for(window_s)
+    overall, by_country = {}, {}
+    for _, source_country, label, count, confidence_sum in get_mood_buckets(size, now - window_s, country=country):
+        for acc in (overall, by_country.setdefault(source_country, {})):
+            n, conf = acc.get(label, (0, 0.0))
+            acc[label] = [n + count, conf + confidence_sum]
+    top = sorted(by_country, key=lambda k: -sum(n for n, _ in by_country[k].values()))[:top_countries]
+    return {
+        "window_min": window_minutes,
+        "bucket_s": size,
+        "until": int(now),
+        **_summary(overall),
+        "countries": {k: _summary(by_country[k]) for k in top},
+    }
+
+def mood_series(
+    hours: float = 24,
+    bucket_size: int = 3600,
+    now: Optional[float] = None,
+    country: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Per-bucket mood for the last `hours` (oldest first), e.g. for a timeline."""
+    now = time.time() if now is None else now
+    buckets = {}
+    for bucket, _, label, count, confidence_sum in get_mood_buckets(bucket_size, now - hours * 3600, country=country):
+        n, conf = buckets.setdefault(bucket, {}).get(label, (0, 0.0))
+        buckets[bucket][label] = [n + count, conf + confidence_sum]
+    return [{"bucket": bucket, **_summary(counts)} for bucket, counts in sorted(buckets.items())]
+
+def prune(now: Optional[float] = None) -> int:
+    """Drop 10-minute buckets older than FINE_RETENTION_DAYS."""
+    now = time.time() if now is None else now
+    return prune_mood_buckets(600, before=now - FINE_RETENTION_DAYS * 86400)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print the current mood aggregates as JSON")
+    parser.add_argument("--window", type=float, default=WINDOW_MINUTES, help="rolling 구간 (분)")
+    parser.add_argument("--country", default=None, help="국가 이름 (예: South Korea)")
+    parser.add_argument("--series", type=float, default=None, metavar="HOURS", help="시간별 추이 (최근 HOURS시간)")
+
+    args = parser.parse_args()
+    if args.series:
+        result = mood_series(hours=args.series, country=args.country)
+    else:
+        result = rolling_mood(window_minutes=args.window, country=args.country)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -0,0 +1,115 @@
+import re
+import struct
+import hashlib
+import logging
+import random
+import time
+from html import unescape
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from db import find_cluster_candidates
+
+'''
+Near-duplicate headline detection (MinHash + LSH).
+"Reuters: X", "X - AP", 숫자 하나 바뀐 재송고 기사 등은 URL도 텍스트도 달라 기존 중복 제거/캐시를
+통과하지만 사실상 같은 기사. 정규화한 단어 집합의 MinHash 서명을 BANDS개 band로 나눠
+LSH 버킷(cluster_lsh 테이블)에 저장하고, 같은 버킷에 걸린 최근 cluster 중 추정 Jaccard가
+THRESHOLD 이상인 것을 같은 cluster로 본다.
+'''
+
+# --- Config ---
+NUM_PERM = 64             # MinHash 해시 함수 수
+BANDS = 16                # LSH band 수 (band당 NUM_PERM // BANDS 행)
+THRESHOLD = 0.75          # 같은 cluster로 볼 최소 추정 Jaccard
+WINDOW_HOURS = 48         # 이 시간 안에 갱신된 cluster와만 비교
+NOISE_TOKENS = {
+    # 통신사 / 매체 표기
+    "reuters", "ap", "afp", "upi", "ani", "pti", "xinhua", "yonhap", "bloomberg", "cnn", "bbc",
+    # 머리말
+    "breaking", "update", "updated", "exclusive", "live", "analysis", "report", "opinion", "watch", "video",
+}
+STOPWORDS = {"a", "an", "the", "of", "to", "in", "on", "for", "and", "or", "at", "by", "with", "as", "is", "are"}
+
+_ROWS = NUM_PERM // BANDS
+_PRIME = (1 << 61) - 1
+_rng = random.Random(1)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+Signature = Tuple[int, ...]
+
+def tokens(text: str) -> set:
+    """Lower-cased word set without wire-service tags, headline prefixes and stopwords."""
+    words = re.findall(r"[a-z0-9]+", unescape(text).lower())
+    return {w for w in words if w not in NOISE_TOKENS and w not in STOPWORDS}
+
+def _token_hash(token: str) -> int:
+    # hash()는 프로세스마다 달라지므로 고정 해시 사용
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little") % _PRIME
+
+def signature(text: str) -> Optional[Signature]:
+    """MinHash signature of the headline's token set, or None if nothing is left after normalizing."""
+    hashes = [_token_hash(t) for t in tokens(text)]
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS)
+
+def band_keys(sig: Signature) -> List[int]:
+    """One signed 64-bit bucket key per LSH band (fits an SQLite INTEGER)."""
+    keys = []
+    for band in range(BANDS):
+        packed = struct.pack(f"<B{_ROWS}Q", band, *sig[band * _ROWS:(band + 1) * _ROWS])
+        keys.append(int.from_bytes(hashlib.blake2b(packed, digest_size=8).digest(), "little", signed=True))
+    return keys
+
+def pack_signature(sig: Signature) -> bytes:
+    return struct.pack(f"<{NUM_PERM}Q", *sig)
+
+def unpack_signature(blob: bytes) -> Signature:
+    return struct.unpack(f"<{NUM_PERM}Q", blob)
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of the two token sets."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+def match_headlines(texts: Sequence[str], window_hours: float = WINDOW_HOURS) -> List[Dict]:
+    """
+    Match each headline against recent clusters in the DB and earlier
+    headlines of the same batch. Each result is one of
+      {"cluster": (cluster_id, headline_ko, label, confidence)}  → reuse a stored cluster
+      {"leader": j}                                             → same as texts[j] in this batch
+      {"signature": sig, "band_keys": [...]}                    → starts a new cluster
+      {}                                                        → no usable tokens
+    """
+    sigs = [signature(t) for t in texts]
+    keys = [band_keys(s) if s else [] for s in sigs]
+    candidates = find_cluster_candidates(
+        {k for ks in keys for k in ks}, since=time.time() - window_hours * 3600
+    )
+    stored = {}    # band_key → [(cluster_id, signature, headline_ko, label, confidence)]
+    for band_key, cluster_id, blob, headline_ko, label, confidence in candidates:
+        stored.setdefault(band_key, []).append((cluster_id, unpack_signature(blob), headline_ko, label, confidence))
+
+    results, batch_index = [], {}   # batch_index: band_key → 이 배치에서 새 cluster를 만든 headline 인덱스
+    for i, (sig, ks) in enumerate(zip(sigs, keys)):
+        if sig is None:
+            results.append({})
+            continue
+        best, best_sim = None, THRESHOLD
+        for k in ks:
+            for cluster_id, other, headline_ko, label, confidence in stored.get(k, ()):
+                sim = similarity(sig, other)
+                if sim >= best_sim:
+                    best, best_sim = {"cluster": (cluster_id, headline_ko, label, confidence)}, sim
+            for j in batch_index.get(k, ()):
+                sim = similarity(sig, sigs[j])
+                if sim >= best_sim:
+                    best, best_sim = {"leader": j}, sim
+        if best is None:
+            best = {"signature": sig, "band_keys": ks}
+            for k in ks:
+                batch_index.setdefault(k, []).append(i)
+        results.append(best)
+    return results
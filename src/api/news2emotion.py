@@ -1,16 +1,34 @@
 import os
 import json
+import time
 import logging
 from typing import List, Optional, Tuple, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from html import unescape
 from dotenv import load_dotenv
-from worldnews_api import fetch_worldnews
-from emotion_utils import analyze_headline_emotion
-from db import init_db, is_new_article, save_article, get_latest_articles
-from translation_api import translate_text
+from worldnews_api import iter_worldnews
+from fetch_gdelt import iter_gdelt
+from emotion_utils import analyze_headlines_batch, NLI_STATS, CACHE_STATS
+from db import (
+    init_db, filter_new_urls, save_articles_bulk, save_article_scores,
+    create_clusters, assign_article_clusters, prune_cluster_index,
+    get_fetch_watermark, set_fetch_watermark, to_epoch,
+    enqueue_pending, get_pending_articles, remove_pending, count_pending,
+)
+from near_dup import match_headlines, pack_signature, WINDOW_HOURS
+from export_utils import export_latest
+from mood import prune as prune_mood_buckets
+from translation_api import translate_batch
+from pipeline import Stage, run_pipeline
+from metrics import METRICS, write_json_report, write_prometheus, profiled, worldnews_cost
 
-from config import TIMESPAN_HOURS, NUM_RECORDS, LATEST_EXPORT_COUNT
+from config import (
+    TIMESPAN_HOURS, NUM_RECORDS, LATEST_EXPORT_COUNT, EXPORT_FORMAT, EXPORT_DELTA,
+    PIPELINE_QUEUE_SIZE, INFERENCE_WORKERS, TRANSLATION_WORKERS,
+    RUN_REPORT_PATH, PROMETHEUS_PATH, SOURCES, GDELT_NUM_RECORDS,
+    NEAR_DUP, EXPORT_ONE_PER_CLUSTER, INCREMENTAL_FETCH, WATERMARK_OVERLAP_MINUTES,
+    DEADLINE_SECONDS, PENDING_BATCH_SIZE, LAZY_TRANSLATION,
+)
 
 # --- Config ---
 load_dotenv()
@@ -21,6 +39,34 @@ LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s %(levelname)s %(message)s')
 logger = logging.getLogger(__name__)
 
+# 기사 소스: (timespan, num_records, since) → 페이지(기사 dict 목록) iterator
+# since: watermark 기준 조회 시작 시각 (UTC datetime, 없으면 timespan 전체)
+SOURCE_ITERATORS = {
+    "worldnews": lambda timespan, num_records, since: iter_worldnews(
+        timespan=timespan, max_articles=num_records, since=since),
+    "gdelt": lambda timespan, num_records, since: iter_gdelt(timespan=timespan, max_articles=GDELT_NUM_RECORDS),
+}
+
+def parse_sources(value: str) -> List[str]:
+    """'worldnews,gdelt' → ['worldnews', 'gdelt']"""
+    sources = [s.strip().lower() for s in value.split(",") if s.strip()]
+    unknown = [s for s in sources if s not in SOURCE_ITERATORS]
+    if unknown or not sources:
+        raise ValueError(f"Unknown source(s) {unknown} (choose from {list(SOURCE_ITERATORS)})")
+    return sources
+
+def fetch_window(source: str, timespan: float, now: float) -> Tuple[float, Optional[float], Optional[Tuple]]:
+    """
+    (window hours, since epoch, watermark) for the next fetch from source.
+    Without a watermark, or if it is older than timespan (first run / after
+    a gap), the full timespan window is fetched and since is None.
+    """
+    mark = get_fetch_watermark(source) if INCREMENTAL_FETCH else None
+    if mark is None or now - mark[0] >= timespan * 3600:
+        return timespan, None, mark
+    since = min(mark[0], now) - WATERMARK_OVERLAP_MINUTES * 60   # 미래 발행 시각(시간대 오류)은 현재로
+    return max(now - since, 60) / 3600, since, mark
+
 def clear_html_entities(text:str) -> str:
     """Decode HTML entities such as &quot;, &amp;, &lt; ..."""
     return unescape(text)
@@ -28,87 +74,268 @@ def clear_html_entities(text:str) -> str:
 def fetch_and_process_articles(
     timespan: float = TIMESPAN_HOURS,
     num_records: int = NUM_RECORDS,
+    profile_dir: Optional[str] = None,
+    stage_stats: Optional[List[Dict[str, Any]]] = None,
+    sources: str = SOURCES,
+    deadline: Optional[float] = DEADLINE_SECONDS,
+    fetch_windows: Optional[Dict[str, float]] = None,
 ) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Run fetch → dedupe → inference → translation → store as a streaming
+    pipeline. WorldNews pages are scored while later pages are still
+    downloading, and one batch is translated while the next is scored.
+    sources is a comma-separated list of SOURCE_ITERATORS, read in order.
+    Per-stage statistics are appended to stage_stats if given, and the
+    hours each source was fetched over (watermark → now or the full
+    timespan) are stored in fetch_windows; with profile_dir the inference
+    stage is profiled (see metrics.profiled).
 
+    New articles are written to pending_articles as soon as they are
+    fetched and removed once stored, so nothing fetched is lost on a crash;
+    leftovers of earlier runs are processed after this run's pages. With a
+    deadline (seconds) everything is fetched first, then pending articles
+    are processed newest-first and no new batch starts after the deadline.
+    """
+    deadline_at = time.monotonic() + deadline if deadline else None
+    source_list = parse_sources(sources)
     processed = []
     total_fetched = 0
-    
-    try:
-        news = fetch_worldnews(timespan=timespan, number=num_records)
-    except Exception as e:
-        logger.error(f"Failed to fetch articles: {e}")
-        return [], 0
-        
-    total_fetched += len(news)
-    for art in news:
-        url = art["url"]
-        headline_eng = clear_html_entities(art["headline"])
-        print(headline_eng)
-        if not is_new_article(url):
-            continue
-        try:
-            emotion = analyze_headline_emotion({
-                "text": headline_eng,
-                "source_country": art["source_country"],
-                "published": art["date"]
-            })
-            label = emotion["sentiment"]["label"]
-            confidence = emotion["sentiment"]["confidence"]
-        except Exception as e:
-            logger.error(f"Sentiment analysis failed for url={url}: {e}")
-            continue
-        try:  #번역
-            headline_ko = translate_text(headline_eng, "ko")
-            headline_ko = clear_html_entities(headline_ko)
-        except Exception as e:
-            logger.error(f"Translation failed for url={url}: {e}")
-            headline_ko = headline_eng #fallback
-        try:  #저장 
-            save_article(url, headline_ko, art["source_country"], art["date"], label, confidence)
-        except Exception as e:
-            logger.error(f"DB save failed for article={url}: {e}")
-            continue
-        processed.append({
-            "url": url,
-            "headline": headline_ko,
-            "source_country": art["source_country"],
-            "timestamp": art["date"],
-            "sentiment": {
-                "label": label,
-                "confidence": confidence
+    seen = set()
+    watermarks = {}   # source → (최신 발행 시각, 그 시각의 URL): 모든 배치 저장 후 기록
+    store_failed = False
+
+    def pages():
+        nonlocal total_fetched
+        for source in source_list:
+            now = time.time()
+            window, since, mark = fetch_window(source, timespan, now)
+            if fetch_windows is not None:
+                fetch_windows[source] = window
+            known = set(mark[1]) if mark else set()
+            newest, newest_urls = (mark[0], known) if mark else (None, set())
+            results_before = METRICS.get("worldnews_results")
+            logger.info(f"[{source}] fetching {'since watermark' if since else 'full window'}: {window:.2f}h")
+            try:
+                for page in SOURCE_ITERATORS[source](
+                    window, num_records, datetime.fromtimestamp(since, timezone.utc) if since else None
+                ):
+                    total_fetched += len(page)
+                    METRICS.incr(f"fetched_{source}", len(page))
+                    fresh = []
+                    for art in page:
+                        published = to_epoch(art["date"])
+                        if mark and published == mark[0] and art["url"] in known:
+                            continue   # 지난 run에서 watermark 시각에 본 기사
+                        fresh.append(art)
+                        if published is not None and (newest is None or published > newest):
+                            newest, newest_urls = published, {art["url"]}
+                        elif published is not None and published == newest:
+                            newest_urls.add(art["url"])
+                    METRICS.incr("watermark_skipped", len(page) - len(fresh))
+                    yield fresh
+            except Exception as e:
+                # 일부 페이지만 실패해도 (PageFetchError) watermark는 그대로 → 다음 run에서 같은 구간 재조회
+                logger.error(f"Source '{source}' failed: {e}")
+                METRICS.incr("source_failures")
+                continue
+            if newest is not None:
+                watermarks[source] = (newest, newest_urls)
+            if source == "worldnews" and since is not None:
+                # 같은 기사 밀도로 timespan 전체를 조회했을 때의 비용과 비교한 추정치
+                results = METRICS.get("worldnews_results") - results_before
+                full = min(num_records, results * timespan / window)
+                METRICS.incr("worldnews_points_saved", max(0.0, worldnews_cost(full) - worldnews_cost(results)))
+
+    def admit(page):
+        """새 기사만 남기고 pending_articles에 기록"""
+        by_url = {}
+        for art in page:
+            by_url.setdefault(art["url"], art)   # 중복 URL은 첫 기사 유지
+        with METRICS.timer("sqlite_dedupe"):
+            new_urls = [url for url in filter_new_urls(by_url) if url not in seen]
+            seen.update(new_urls)
+            METRICS.incr("pending_enqueued", enqueue_pending(by_url[url] for url in new_urls))
+        METRICS.incr("duplicates_skipped", len(page) - len(new_urls))
+        return [by_url[url] for url in new_urls]
+
+    def batches():
+        if deadline_at is None:
+            for page in pages():
+                yield admit(page)
+            streamed = set(seen)
+        else:
+            for page in pages():
+                admit(page)
+            streamed = set()
+        backlog = [art for art in get_pending_articles() if art["url"] not in streamed]
+        if backlog:
+            logger.info(f"Processing {len(backlog)} pending articles (newest first)")
+        for start in range(0, len(backlog), PENDING_BATCH_SIZE):
+            if deadline_at is not None and time.monotonic() >= deadline_at:
+                logger.warning(f"Deadline reached: {len(backlog) - start} articles carried over to the next run")
+                METRICS.incr("pending_carried_over", len(backlog) - start)
+                return
+            yield backlog[start:start + PENDING_BATCH_SIZE]
+
+    def dedupe(page):
+        for art in page:
+            print(clear_html_entities(art["headline"]))
+        works = [{"art": art, "headline_eng": clear_html_entities(art["headline"])} for art in page]
+        if NEAR_DUP and works:
+            with METRICS.timer("near_dup"):
+                matches = match_headlines([work["headline_eng"] for work in works])
+            for work, match in zip(works, matches):
+                if "cluster" in match and match["cluster"][2] is not None:
+                    # 최근 cluster와 유사 → 대표 기사의 감정 / 번역 재사용 (추론 / 번역 생략)
+                    cluster_id, headline_ko, label, confidence = match["cluster"]
+                    work.update(cluster_id=cluster_id, headline_ko=headline_ko, raw_scores=(None, None),
+                                sentiment={"label": label, "confidence": confidence})
+                    METRICS.incr("near_dup_reused")
+                elif "leader" in match:
+                    work["leader"] = works[match["leader"]]   # 같은 배치의 앞선 유사 기사
+                    METRICS.incr("near_dup_in_batch")
+                elif "signature" in match:
+                    work["cluster"] = match
+        return works
+
+    def infer(batch):
+        todo = [work for work in batch if "sentiment" not in work and "leader" not in work]
+        emotions = analyze_headlines_batch([
+            {
+                "text": work["headline_eng"],
+                "source_country": work["art"]["source_country"],
+                "published": work["art"]["date"]
             }
-        })
+            for work in todo
+        ], return_raw=True)
+        for work, emotion in zip(todo, emotions):
+            work["sentiment"] = emotion["sentiment"]
+            work["raw_scores"] = emotion.get("raw_scores", (None, None))
+        for work in batch:
+            if "leader" in work:
+                work["sentiment"], work["raw_scores"] = work["leader"]["sentiment"], (None, None)
+        return batch
+
+    def translate(batch):
+        todo = [work for work in batch if "headline_ko" not in work and "leader" not in work]
+        try:  #번역 (캐시 + 배치)
+            headlines_ko = translate_batch([work["headline_eng"] for work in todo], "ko")
+        except Exception as e:
+            logger.error(f"Translation failed: {e}")
+            headlines_ko = [None] * len(todo)   # headline NULL로 저장 → export 시 다시 번역 (fill_translations)
+        for work, headline_ko in zip(todo, headlines_ko):
+            work["headline_ko"] = clear_html_entities(headline_ko) if headline_ko else None
+        for work in batch:
+            if "leader" in work:
+                work["headline_ko"] = work["leader"]["headline_ko"]
+        return batch
+
+    def store(batch):
+        nonlocal store_failed
+        unscored = sum(work["sentiment"]["label"] is None for work in batch)
+        if unscored:
+            # 추론 실패 → 저장하지 않고 pending_articles에 남겨 다음 실행에서 다시 분석 (저장하면 URL 중복 제거로 영영 빠짐)
+            logger.error(f"Sentiment analysis failed for {unscored} articles; kept in pending for the next run")
+            METRICS.incr("inference_failures", unscored)
+            batch = [work for work in batch if work["sentiment"]["label"] is not None]
+            if not batch:
+                return None
+        rows = [
+            (work["art"]["url"], work.get("headline_ko"), work["art"]["source_country"], work["art"]["date"],
+             work["sentiment"]["label"], work["sentiment"]["confidence"], work["headline_eng"])
+            for work in batch
+        ]
+        with METRICS.timer("sqlite_store"):
+            saved = save_articles_bulk(rows)  #저장 (한 트랜잭션)
+            if saved:
+                save_article_scores(
+                    (work["art"]["url"], *work["raw_scores"]) for work in batch if work["raw_scores"][0] is not None
+                )
+                remove_pending(work["art"]["url"] for work in batch)
+        if not saved:
+            store_failed = True
+            logger.error(f"DB save failed for {len(rows)} articles")
+            METRICS.incr("db_save_failures", len(rows))
+            return None
+        if NEAR_DUP:
+            with METRICS.timer("sqlite_store"):
+                leaders = [work for work in batch if "cluster" in work and work["sentiment"]["label"] is not None]
+                cluster_ids = create_clusters(
+                    (pack_signature(work["cluster"]["signature"]), work["art"]["url"], work.get("headline_ko"),
+                     work["sentiment"]["label"], work["sentiment"]["confidence"], work["cluster"]["band_keys"])
+                    for work in leaders
+                )
+                for work, cluster_id in zip(leaders, cluster_ids):
+                    work["cluster_id"] = cluster_id
+                for work in batch:
+                    if "leader" in work and "cluster_id" in work["leader"]:
+                        work["cluster_id"] = work["leader"]["cluster_id"]
+                assign_article_clusters(
+                    (work["art"]["url"], work["cluster_id"]) for work in batch if "cluster_id" in work
+                )
+        processed.extend({
+            "url": work["art"]["url"],
+            "headline": work.get("headline_ko") or work["headline_eng"],
+            "source_country": work["art"]["source_country"],
+            "timestamp": work["art"]["date"],
+            "sentiment": work["sentiment"]
+        } for work in batch)
+        return batch
+
+    if profile_dir:
+        infer = profiled(infer, "inference", profile_dir)
+
+    stages = [
+        Stage("dedupe", dedupe),
+        Stage("inference", infer, workers=INFERENCE_WORKERS),
+        Stage("translation", translate, workers=TRANSLATION_WORKERS),
+        Stage("store", store),
+    ]
+    if LAZY_TRANSLATION:
+        stages.pop(2)   # 번역은 export 대상 기사만 (export_latest_articles_with_sentiment_json)
+    stats = run_pipeline(batches(), stages, queue_size=PIPELINE_QUEUE_SIZE)
+    for st in stats:
+        logger.info(f"[pipeline] {st['stage']}: {st['items_in']} items in {st['batches']} batches, "
+                    f"busy {st['busy_s']}s ({st['items_per_s']}/s), cpu {st['cpu_s']}s, blocked {st['blocked_s']}s")
+    if stage_stats is not None:
+        stage_stats.extend(stats)
+    if store_failed:
+        logger.error("Some articles were not saved; fetch watermarks are left unchanged")
+    else:
+        for source, (published, urls) in watermarks.items():
+            set_fetch_watermark(source, published, urls)
+
+    # 페이지는 도착 순서대로 처리되므로 API 정렬(publish-time DESC)로 복원
+    processed.sort(key=lambda row: row["timestamp"], reverse=True)
     return processed, total_fetched
 
 def export_latest_articles_with_sentiment_json(
     filename: str = "latest_articles_with_sentiment.json",
     export_count: int = LATEST_EXPORT_COUNT,
-    hours: float = TIMESPAN_HOURS
+    export_format: str = EXPORT_FORMAT,
+    delta: bool = EXPORT_DELTA,
+    one_per_cluster: bool = EXPORT_ONE_PER_CLUSTER
     ) -> None:
     """
-    Export the latest 100 articles (with sentiment) from the DB to a JSON file.
+    Export the latest articles (with sentiment) from the DB to a JSON file.
+    The file is replaced atomically, so readers never see a partial write;
+    see export_utils for the delta / manifest files.
     """
     try:
-        articles = get_latest_articles(min_count=export_count, hours=hours)
-        data = []
-        for url, headline, source_country, timestamp, sentiment_label, sentiment_confidence in articles:
-            data.append({
-                "url": url,
-                "headline": headline,
-                "source_country": source_country,
-                "timestamp": timestamp,
-                "sentiment": {
-                    "label": sentiment_label,
-                    "confidence": sentiment_confidence
-                }
-            })
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        logger.info(f"Exported {len(data)} articles to {filename}")
+        with METRICS.timer("export"):
+            manifest = export_latest(filename, export_count, fmt=export_format, delta=delta,
+                                     one_per_cluster=one_per_cluster, translate=translate_headlines)
+        logger.info(f"Exported {manifest['articles']} articles to {filename} "
+                    f"(seq {manifest['seq']}, {manifest['delta_articles']} new)")
     except Exception as e:
         logger.error(f"Failed to export articles to JSON: {e}")
 
 
+def translate_headlines(texts: List[str]) -> List[Optional[str]]:
+    """English → Korean for lazy translation at export time (cache + batch); None where it failed."""
+    METRICS.incr("lazy_translated", len(texts))
+    return [clear_html_entities(text) if text else None for text in translate_batch(texts, "ko")]
+
 def print_articles(processed_news: List[Dict[str, Any]]) -> None:
     """
     Print article details to the terminal.
@@ -120,15 +347,43 @@ def print_articles(processed_news: List[Dict[str, Any]]) -> None:
 def main(
     timespan: float = TIMESPAN_HOURS,
     num_records: int = NUM_RECORDS,
-    export_count: int = LATEST_EXPORT_COUNT
-    ) -> None:
+    export_count: int = LATEST_EXPORT_COUNT,
+    export_format: str = EXPORT_FORMAT,
+    sources: str = SOURCES,
+    report_path: Optional[str] = RUN_REPORT_PATH,
+    prometheus_path: Optional[str] = PROMETHEUS_PATH,
+    profile_dir: Optional[str] = None,
+    one_per_cluster: bool = EXPORT_ONE_PER_CLUSTER,
+    deadline: Optional[float] = DEADLINE_SECONDS
+    ) -> Dict[str, Any]:
+    METRICS.reset()
+    nli_before, cache_before = dict(NLI_STATS), dict(CACHE_STATS)
     init_db()
+    if NEAR_DUP:
+        prune_cluster_index(before=time.time() - WINDOW_HOURS * 3600)
+    prune_mood_buckets()
+    stage_stats, fetch_windows = [], {}
     processed_news, total_news = fetch_and_process_articles(
         timespan= timespan,
-        num_records=num_records
+        num_records=num_records,
+        profile_dir=profile_dir,
+        stage_stats=stage_stats,
+        sources=sources,
+        deadline=deadline,
+        fetch_windows=fetch_windows,
     )
+    window_h = round(max(fetch_windows.values(), default=timespan), 3)   # 도착률 계산용 (osc.py AdaptiveRefresh)
+    # 모듈 카운터는 프로세스 누적값 (상주 워커는 여러 사이클) → 이번 실행분만
+    nli = {key: NLI_STATS[key] - nli_before[key] for key in NLI_STATS}
+    cache = {key: CACHE_STATS[key] - cache_before[key] for key in CACHE_STATS}
+    for key, value in nli.items():
+        METRICS.incr(f"nli_{key}", value)
+    for key, value in cache.items():
+        METRICS.incr(f"sentiment_cache_{key}", value)
     logger.info(f"Total news articles found: {total_news}")
     logger.info(f"Number of new articles processed: {len(processed_news)}")
+    logger.info(f"NLI calls: {nli['called']} (skipped by cascade: {nli['skipped']})")
+    logger.info(f"Sentiment cache: {cache['hits']} hits / {cache['misses']} misses")
     print_articles(processed_news)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_file = f"news_sentiment_{timestamp}.json"
@@ -140,7 +395,32 @@ def main(
         logger.info(f"Number of filtered out articles: {total_news - len(processed_news)}")
     except Exception as e:
         logger.error(f"Failed to save results to {output_file}: {e}")
-    export_latest_articles_with_sentiment_json(export_count=export_count, hours=timespan)
+    export_latest_articles_with_sentiment_json(export_count=export_count, export_format=export_format,
+                                               one_per_cluster=one_per_cluster)
+
+    pending = count_pending()
+    if pending:
+        logger.info(f"Pending articles carried over to the next run: {pending}")
+    report = METRICS.report(stages=stage_stats, fetched=total_news, processed=len(processed_news), pending=pending,
+                            window_h=window_h)
+    logger.info(f"WorldNews points: {report['worldnews_points']} "
+                f"(saved by watermark: ~{report['counters'].get('worldnews_points_saved', 0):.2f}), "
+                f"translated chars: {report['counters'].get('translated_chars', 0)}")
+    try:
+        if report_path:
+            write_json_report(report, report_path)
+        if prometheus_path:
+            write_prometheus(report, prometheus_path)
+    except Exception as e:
+        logger.error(f"Failed to write run report: {e}")
+    return {
+        "fetched": total_news,
+        "processed": len(processed_news),
+        "points": report["worldnews_points"],
+        "points_saved": round(report["counters"].get("worldnews_points_saved", 0), 2),
+        "pending": pending,
+        "window_h": window_h,
+    }
 
 if __name__ == "__main__":
     import argparse
@@ -149,6 +429,19 @@ if __name__ == "__main__":
     parser.add_argument("--timespan", type=float, default=TIMESPAN_HOURS, help="시간 범위 (시간 단위)")
     parser.add_argument("--num-records", type=int, default=NUM_RECORDS, help="기사 개수")
     parser.add_argument("--export-count", type=int, default=LATEST_EXPORT_COUNT, help="내보내기 기사 수")
+    parser.add_argument("--export-format", default=EXPORT_FORMAT, choices=["pretty", "compact"], help="JSON 출력 형식")
+    parser.add_argument("--source", default=SOURCES, help="기사 소스 (쉼표 구분: worldnews,gdelt)")
+    parser.add_argument("--report", default=RUN_REPORT_PATH, help="실행 리포트 JSON 경로")
+    parser.add_argument("--prometheus", default=PROMETHEUS_PATH, help="Prometheus textfile (.prom) 경로")
+    parser.add_argument("--profile", nargs="?", const="profile", default=None, metavar="DIR",
+                        help="추론 단계 cProfile / torch profiler 결과 저장 (기본 디렉터리: profile)")
+    parser.add_argument("--deadline", type=float, default=DEADLINE_SECONDS, metavar="SECONDS",
+                        help="실행 시간 예산: 초과분은 pending으로 다음 실행에 이월")
+    parser.add_argument("--one-per-cluster", action="store_true", default=EXPORT_ONE_PER_CLUSTER,
+                        help="유사 헤드라인 cluster마다 최신 기사 하나만 내보내기")
 
     args = parser.parse_args()
-    main(timespan=args.timespan, num_records=args.num_records, export_count=args.export_count)
+    main(timespan=args.timespan, num_records=args.num_records, export_count=args.export_count,
+         export_format=args.export_format, sources=args.source, report_path=args.report, prometheus_path=args.prometheus,
+         profile_dir=args.profile, one_per_cluster=args.one_per_cluster,
+         deadline=args.deadline)
@@ -0,0 +1,129 @@
+import time
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class Stage:
+    """
+    One pipeline step run by `workers` threads.
+    `fn` takes a batch (list) and returns the batch to pass downstream;
+    an empty result is not forwarded.
+    """
+
+    def __init__(self, name: str, fn: Callable[[List[Any]], Optional[List[Any]]], workers: int = 1):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.items_in = 0
+        self.items_out = 0
+        self.batches = 0
+        self.failures = 0
+        self.busy = 0.0
+        self.cpu = 0.0
+        self.wait_put = 0.0    # 다음 큐가 가득 차서 기다린 시간 (backpressure)
+        self._lock = threading.Lock()
+
+    def _record(self, n_in: int, n_out: int, busy: float, wait_put: float = 0.0, cpu: float = 0.0) -> None:
+        with self._lock:
+            self.items_in += n_in
+            self.items_out += n_out
+            self.batches += 1
+            self.busy += busy
+            self.cpu += cpu
+            self.wait_put += wait_put
+
+    def stats(self, wall: float) -> Dict[str, Any]:
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "batches": self.batches,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "failures": self.failures,
+            "busy_s": round(self.busy, 3),
+            "cpu_s": round(self.cpu, 3),
+            "blocked_s": round(self.wait_put, 3),
+            "items_per_s": round(self.items_in / self.busy, 1) if self.busy else None,
+            "utilization": round(self.busy / (wall * self.workers), 3) if wall else None,
+        }
+
+
+def _run_stage(stage: Stage, inbox: queue.Queue, outbox: Optional[queue.Queue], remaining: List[int], lock: threading.Lock) -> None:
+    while True:
+        batch = inbox.get()
+        if batch is _DONE:
+            inbox.put(_DONE)   # 같은 단계의 다른 워커도 종료
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last and outbox is not None:
+                outbox.put(_DONE)
+            return
+        start, cpu = time.perf_counter(), time.thread_time()
+        try:
+            out = stage.fn(batch)
+        except Exception as e:
+            logger.error(f"[pipeline] stage '{stage.name}' failed: {e}")
+            with stage._lock:
+                stage.failures += 1
+            out = None
+        busy, cpu = time.perf_counter() - start, time.thread_time() - cpu
+        wait_put = 0.0
+        if out and outbox is not None:
+            t = time.perf_counter()
+            outbox.put(out)
+            wait_put = time.perf_counter() - t
+        stage._record(len(batch), len(out or ()), busy, wait_put, cpu)
+
+
+def run_pipeline(source: Iterable[List[Any]], stages: List[Stage], queue_size: int = 4) -> List[Dict[str, Any]]:
+    """
+    Feed batches from `source` through `stages`, each connected by a bounded
+    queue so a slow stage holds back the ones before it.
+    Blocks until everything has drained and returns per-stage statistics.
+    """
+    queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+    threads = []
+    for i, stage in enumerate(stages):
+        outbox = queues[i + 1] if i + 1 < len(stages) else None
+        remaining, lock = [stage.workers], threading.Lock()
+        for w in range(stage.workers):
+            t = threading.Thread(
+                target=_run_stage, args=(stage, queues[i], outbox, remaining, lock),
+                name=f"{stage.name}-{w}", daemon=True,
+            )
+            t.start()
+            threads.append(t)
+
+    source_stage = Stage("source", lambda batch: batch)
+    wall_start = time.perf_counter()
+    try:
+        it = iter(source)
+        while True:
+            start, cpu = time.perf_counter(), time.thread_time()
+            try:
+                batch = next(it)
+            except StopIteration:
+                break
+            except Exception as e:
+                logger.error(f"[pipeline] source failed: {e}")
+                source_stage.failures += 1
+                break
+            busy, cpu = time.perf_counter() - start, time.thread_time() - cpu
+            t = time.perf_counter()
+            if batch:
+                queues[0].put(batch)
+            source_stage._record(len(batch), len(batch), busy, time.perf_counter() - t, cpu)
+    finally:
+        queues[0].put(_DONE)
+        for t in threads:
+            t.join()
+    wall = time.perf_counter() - wall_start
+    return [source_stage.stats(wall)] + [stage.stats(wall) for stage in stages]
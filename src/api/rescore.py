@@ -0,0 +1,64 @@
+import logging
+import time
+from typing import Dict
+
+import torch
+
+from db import init_db, iter_article_scores, update_article_sentiments, pack_f16
+from emotion_utils import rescore_matrix, NEU_FACTOR, THRESH, ALPHA
+from sentiment_nli import CANDIDATES
+
+'''
+Re-label every stored article from its persisted raw scores (article_scores)
+with new NEU_FACTOR / THRESH / ALPHA, without running either model.
+NLI가 실행되지 않은 기사(cascade 등)는 GoEmotions 점수만으로 재채점합니다.
+'''
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+_NO_NLI = pack_f16([float("nan")] * len(CANDIDATES))
+
+def rescore_db(
+    neu_factor: float = NEU_FACTOR,
+    thresh: float = THRESH,
+    alpha: float = ALPHA,
+    chunk_size: int = 50000,
+    dry_run: bool = False,
+) -> Dict[str, float]:
+    """Re-label all scored articles in chunks; returns counts of rows seen and labels changed."""
+    seen = changed = 0
+    start = time.perf_counter()
+    for rows in iter_article_scores(chunk_size):
+        probs = torch.frombuffer(bytearray(b"".join(r[1] for r in rows)), dtype=torch.float16).view(len(rows), -1)
+        nli = torch.frombuffer(bytearray(b"".join(r[2] or _NO_NLI for r in rows)), dtype=torch.float16).view(len(rows), -1)
+        labels, conf = rescore_matrix(probs, nli, neu_factor=neu_factor, thresh=thresh, alpha=alpha)
+        seen += len(rows)
+        changed += sum(label != r[3] for label, r in zip(labels, rows))
+        if not dry_run:
+            update_article_sentiments(
+                (label, round(c, 3), r[0]) for label, c, r in zip(labels, conf.tolist(), rows)
+            )
+    return {
+        "articles": seen,
+        "labels_changed": changed,
+        "seconds": round(time.perf_counter() - start, 2),
+        "dry_run": dry_run,
+    }
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Re-score stored articles with new constants")
+    parser.add_argument("--neu-factor", type=float, default=NEU_FACTOR)
+    parser.add_argument("--thresh", type=float, default=THRESH)
+    parser.add_argument("--alpha", type=float, default=ALPHA)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--dry-run", action="store_true", help="DB를 수정하지 않고 변경 건수만 출력")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    init_db()
+    result = rescore_db(args.neu_factor, args.thresh, args.alpha, args.chunk_size, args.dry_run)
+    logger.info(f"Rescored {result['articles']} articles in {result['seconds']}s, "
+                f"{result['labels_changed']} labels changed{' (dry run)' if args.dry_run else ''}")
@@ -1,15 +1,87 @@
-from transformers import pipeline
+import torch
+import logging
+import threading
+from typing import Dict, List, Tuple
+from inference_backend import load_classifier, INFERENCE_BACKEND
 
-_nli = pipeline(
-    "zero-shot-classification",
-    model = "facebook/bart-large-mnli",
-    device = -1
-)
+# --- Config ---
+NLI_MODEL_ID = "facebook/bart-large-mnli"
 CANDIDATES = ["positive", "negative", "neutral"]
+HYPOTHESIS_TEMPLATE = "This example is {}."   # zero-shot-classification pipeline 기본 템플릿
+NLI_BATCH_SIZE = 48                             # premise/hypothesis 쌍 단위 배치 크기
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Model Loading ---
+_nli_tok = None
+_nli_mdl = None
+ENTAILMENT_ID = None
+_loaded_backend = None
+_load_lock = threading.Lock()
+
+def _entailment_id(model) -> int:
+    return next((i for l, i in model.config.label2id.items() if l.lower().startswith("entail")), -1)
+
+def load_nli_model(backend: str = None) -> None:
+    """
+    Load the NLI tokenizer and model once per process.
+    backend defaults to INFERENCE_BACKEND (torch | torch-int8 | onnx).
+    """
+    global _nli_tok, _nli_mdl, ENTAILMENT_ID, _loaded_backend
+    if _nli_mdl is not None and backend in (None, _loaded_backend):
+        return
+    with _load_lock:
+        if _nli_mdl is not None and backend in (None, _loaded_backend):
+            return
+        backend = backend or INFERENCE_BACKEND
+        try:
+            _nli_tok, model = load_classifier(NLI_MODEL_ID, backend)
+            ENTAILMENT_ID = _entailment_id(model)
+            _nli_mdl, _loaded_backend = model, backend
+        except Exception as e:
+            logger.error(f"Failed to load NLI model: {e}")
+            raise
+
+@torch.no_grad()
+def entailment_probs(texts: List[str], tokenizer=None, model=None, batch_size: int = NLI_BATCH_SIZE) -> torch.Tensor:
+    """
+    Per-headline probabilities over CANDIDATES (N x len(CANDIDATES)).
+    Every headline is paired with each hypothesis, the pairs are scored in
+    padded batches and the entailment logits are softmaxed per headline,
+    as the zero-shot-classification pipeline does.
+    """
+    if model is None:
+        load_nli_model()
+        tokenizer, model, entail_id = _nli_tok, _nli_mdl, ENTAILMENT_ID
+    else:
+        entail_id = _entailment_id(model)
+    pairs = [(text, HYPOTHESIS_TEMPLATE.format(c)) for text in texts for c in CANDIDATES]
+    entail = []
+    for start in range(0, len(pairs), batch_size):
+        chunk = pairs[start:start + batch_size]
+        inputs = tokenizer(
+            [p for p, _ in chunk], [h for _, h in chunk],
+            return_tensors="pt", padding=True, truncation="only_first"
+        )
+        entail.append(model(**inputs).logits[:, entail_id])
+    return torch.cat(entail).view(len(texts), len(CANDIDATES)).softmax(dim=-1)
+
+def nli_sentiment_batch(texts: List[str], batch_size: int = NLI_BATCH_SIZE) -> List[Tuple[str, float, Dict[str, float]]]:
+    """
+    Zero-shot sentiment for many headlines at once.
+    Each entry matches nli_sentiment(text): (label, confidence, scores).
+    """
+    if not texts:
+        return []
+    results = []
+    for row in entailment_probs(texts, batch_size=batch_size).tolist():
+        ranked = sorted(zip(CANDIDATES, row), key=lambda x: x[1], reverse=True)
+        scores = dict(ranked)
+        label = ranked[0][0]
+        conf = round(float(ranked[0][1]), 3)
+        results.append((label, conf, scores))
+    return results
 
 def nli_sentiment(text: str):
-    out = _nli(text, CANDIDATES)
-    scores = dict(zip(out["labels"], out["scores"]))
-    label  = out["labels"][0]
-    conf   = round(float(out["scores"][0]), 3)
-    return label, conf, scores
\ No newline at end of file
+    return nli_sentiment_batch([text])[0]
@@ -1,18 +1,117 @@
 import os
-from google.cloud import translate_v2 as translate
-from dotenv import load_dotenv; 
+import logging
+from typing import List, Optional
+from dotenv import load_dotenv;
+from db import get_cached_translations, put_cached_translations
+from metrics import METRICS
 
 load_dotenv()
 
-project_id = os.getenv("PROJECT_ID")
-credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
+# --- Config ---
+TRANSLATION_BACKEND = os.getenv("TRANSLATION_BACKEND", "google")   # google | fake
+MAX_SEGMENTS_PER_REQUEST = 128      # v2 API: 요청당 최대 텍스트 수
+MAX_CHARS_PER_REQUEST = 30000       # v2 API: 요청당 권장 최대 글자 수
 
-assert project_id, "PROJECT ID가 설정되지 않았습니다."
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
 
-# v2 클라이언트 사용 
-translate_client = translate.Client()
 
+class TranslationBackend:
+    """Translates a list of texts in one call. Subclasses implement translate_many."""
+
+    def translate_many(self, texts: List[str], target_language: str) -> List[str]:
+        raise NotImplementedError
+
+
+class GoogleTranslateBackend(TranslationBackend):
+    """Google Cloud Translation v2 client, created on first use."""
+
+    def __init__(self):
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            from google.cloud import translate_v2 as translate
+            project_id = os.getenv("PROJECT_ID")
+            credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+            assert project_id, "PROJECT ID가 설정되지 않았습니다."
+            if credentials_path:
+                os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
+            # v2 클라이언트 사용
+            self._client = translate.Client()
+        return self._client
+
+    def translate_many(self, texts: List[str], target_language: str) -> List[str]:
+        results = self._get_client().translate(texts, target_language=target_language)
+        return [r["translatedText"] for r in results]
+
+
+class FakeTranslator(TranslationBackend):
+    """Offline stand-in: tags the text with the target language. Useful for tests and benchmarks."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate_many(self, texts: List[str], target_language: str) -> List[str]:
+        self.calls += 1
+        return [f"[{target_language}] {text}" for text in texts]
+
+
+BACKENDS = {
+    "google": GoogleTranslateBackend,
+    "fake": FakeTranslator,
+}
+_backend: TranslationBackend = None
+
+def get_backend() -> TranslationBackend:
+    global _backend
+    if _backend is None:
+        _backend = BACKENDS[TRANSLATION_BACKEND]()
+    return _backend
+
+def set_backend(backend: TranslationBackend) -> None:
+    """Swap the translation backend (e.g. FakeTranslator for offline runs)."""
+    global _backend
+    _backend = backend
+
+def _chunks(texts: List[str]):
+    chunk, chars = [], 0
+    for text in texts:
+        if chunk and (len(chunk) >= MAX_SEGMENTS_PER_REQUEST or chars + len(text) > MAX_CHARS_PER_REQUEST):
+            yield chunk
+            chunk, chars = [], 0
+        chunk.append(text)
+        chars += len(text)
+    if chunk:
+        yield chunk
+
+def translate_batch(texts: List[str], target_language: str = "ko") -> List[Optional[str]]:
+    """
+    Translate many texts, reusing cached translations.
+    Only texts never translated into target_language before are sent to the
+    backend, split into requests that stay within the v2 API limits.
+    Texts of a failed request come back as None (nothing is cached), so
+    callers can keep them untranslated and retry later.
+    """
+    unique = [t for t in dict.fromkeys(texts) if t]
+    translated = get_cached_translations(unique, target_language)
+    missing = [t for t in unique if t not in translated]
+    METRICS.incr("translation_cache_hits", len(unique) - len(missing))
+    backend = get_backend()
+    for chunk in _chunks(missing):
+        try:
+            with METRICS.timer("translation_request"):
+                results = backend.translate_many(chunk, target_language)
+        except Exception as e:
+            logger.error(f"Translation error: {e}")
+            METRICS.incr("translation_failures", len(chunk))
+            continue
+        METRICS.incr("translation_requests")
+        METRICS.incr("translated_chars", sum(len(t) for t in chunk))
+        pairs = list(zip(chunk, results))
+        translated.update(pairs)
+        put_cached_translations(pairs, target_language)
+    return [translated.get(t) if t else "" for t in texts]
 
 def translate_text(text, target_language="ko"):
     """
@@ -21,17 +120,12 @@ def translate_text(text, target_language="ko"):
         text (str): The text to translate.
         target_language (str): The language code to translate to (default: 'ko' for Korean).
     Returns:
-        str: Translated text.
+        str: Translated text (the input text if translation failed).
     """
     if not text:
         return ""
-    try:
-        result = translate_client.translate(text, target_language=target_language)
-        return result["translatedText"]
-    except Exception as e:
-        print(f"Translation error: {e}")
-        return text 
-    
-# test 
+    return translate_batch([text], target_language)[0] or text
+
+# test
 # if __name__ == "__main__":
-#     print(translate_text("Hello world!", "ko"))
\ No newline at end of file
+#     print(translate_text("Hello world!", "ko"))
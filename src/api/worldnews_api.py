@@ -1,11 +1,15 @@
 import os
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 import pytz
 import pycountry
 from dotenv import load_dotenv; 
 import worldnewsapi
 from worldnewsapi.rest import ApiException
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 from pprint import pprint
 
 ''' WORLD NEWS API
@@ -17,13 +21,31 @@ https://github.com/ddsky/world-news-api-clients/blob/main/python/docs/NewsApi.md
 
 load_dotenv()
 newsapi_key = os.getenv("WORLD_NEWS_API_KEY")
+newsapi_host = os.getenv("WORLD_NEWS_API_HOST")   # 로컬 stub 서버 테스트용 (예: http://127.0.0.1:8080)
 
 newsapi_configuration = worldnewsapi.Configuration(api_key={'apiKey': newsapi_key})
+if newsapi_host:
+    newsapi_configuration.host = newsapi_host
 newsapi_instance = worldnewsapi.NewsApi(worldnewsapi.ApiClient(newsapi_configuration))
 
 from config import TIMESPAN_HOURS, NUM_RECORDS
+from metrics import METRICS
 
 MIN_HEADLINE_LENGTH = 25  # 최소 헤드라인 길이 
+PAGE_SIZE = 100           # search_news 요청당 최대 결과 수 (API 제한)
+FETCH_WORKERS = 4         # 동시 페이지 요청 수
+REQUESTS_PER_SECOND = 2.0 # 요청 속도 제한
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0        # 재시도 대기 (초, 지수 증가)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DEFAULT_CATEGORIES = 'politics,sports,business,technology,entertainment,health,science,lifestyle,travel,culture,education,environment,other'
+
+class PageFetchError(ApiException):
+    """Some pages still failed after their retries; the pages yielded before it are incomplete."""
+
+    def __init__(self, offsets: List[int]):
+        super().__init__(status=None, reason=f"pages at offsets {offsets} failed")
+        self.offsets = offsets
 
 def convert_utc_to_kst(utc_dt) -> str:
     if isinstance(utc_dt, str):
@@ -45,52 +67,156 @@ def get_country_name(code: str) -> str:
     except:
         return code
 
+class RateLimiter:
+    """Spaces requests at least 1/rate seconds apart across all threads."""
+
+    def __init__(self, rate: float = REQUESTS_PER_SECOND):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def _search_with_retry(api, params: Dict, limiter: RateLimiter):
+    """search_news with rate limiting and exponential backoff on 429/5xx."""
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.wait()
+        try:
+            with METRICS.timer("worldnews_request"):
+                response = api.search_news(**params)
+            METRICS.incr("worldnews_requests")
+            METRICS.incr("worldnews_results", len(response.news))
+            return response
+        except ApiException as e:
+            METRICS.incr("worldnews_failed_requests")
+            if e.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                raise
+            delay = BACKOFF_BASE * 2 ** attempt + random.uniform(0, BACKOFF_BASE)
+            print(f"[fetch_worldnews] HTTP {e.status}, retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s")
+            time.sleep(delay)
+
+def _to_articles(news) -> List[Dict]:
+    articles = []
+    for article in news:
+        if len(article.title) < MIN_HEADLINE_LENGTH:
+            METRICS.incr("short_headlines_skipped")
+        else:
+            kst_date = convert_utc_to_kst(article.publish_date)
+            country_name = get_country_name(article.source_country)
+            articles.append({
+                'url': article.url,
+                'source_country': country_name,
+                'headline': article.title,
+                'date': kst_date
+            })
+    return articles
+
+def iter_worldnews(
+    timespan: float = TIMESPAN_HOURS,
+    max_articles: int = NUM_RECORDS,
+    language: str = 'en',
+    categories: str = DEFAULT_CATEGORIES,
+    sort: str = 'publish-time',
+    sort_direction: str = 'DESC',
+    offset: int = 0,
+    page_size: int = PAGE_SIZE,
+    workers: int = FETCH_WORKERS,
+    limiter: Optional[RateLimiter] = None,
+    api = None,
+    since: Optional[datetime] = None,
+) -> Iterator[List[Dict]]:
+    """
+    Fetch up to max_articles results page by page and yield each page's
+    articles as soon as it arrives.
+    The first page tells how many results are available; the remaining
+    offsets are then requested concurrently through a thread pool.
+    If any of them fails, PageFetchError is raised after the other pages
+    have been yielded, so callers don't treat the window as fully fetched.
+    `api` can be any object with a search_news(**params) method (e.g. a local stub).
+    since (an aware UTC datetime) replaces the start of the timespan window,
+    for incremental fetches from a watermark.
+    """
+    api = api or newsapi_instance
+    limiter = limiter or RateLimiter()
+    page_size = max(1, min(page_size, PAGE_SIZE, max_articles))
+
+    # now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    earliest = since or (now - timedelta(hours=timespan)).replace(minute=0, second=0, microsecond=0)
+
+    print(f"[fetch_worldnews] earliest_publish_date: {earliest.strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"[fetch_worldnews] latest_publish_date: {now.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    base = {
+        'language':language,
+        'categories':categories,
+        'sort':sort,
+        'sort_direction':sort_direction,
+        'earliest_publish_date':earliest.strftime('%Y-%m-%d %H:%M:%S'),
+        'latest_publish_date':now.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+    end = offset + max_articles
+
+    def fetch_page(page_offset: int):
+        number = min(page_size, end - page_offset)
+        return _search_with_retry(api, {**base, 'offset': page_offset, 'number': number}, limiter)
+
+    response = fetch_page(offset)
+    print(f"[fetch_worldnews_Response] Recieved {len(response.news)} articles. Total available: {response.available}.")
+    yield _to_articles(response.news)
+
+    total = min(end, response.available or 0)
+    offsets = range(offset + page_size, total, page_size)
+    if not offsets:
+        return
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch_page, o): o for o in offsets}
+        for future in as_completed(futures):
+            try:
+                page = future.result()
+            except ApiException as e:
+                print(f"Exception when calling NewsAPI -> search_news (offset={futures[future]}): {e}")
+                failed.append(futures[future])
+                continue
+            print(f"[fetch_worldnews_Response] offset={futures[future]}: {len(page.news)} articles.")
+            yield _to_articles(page.news)
+    if failed:
+        METRICS.incr("worldnews_page_failures", len(failed))
+        raise PageFetchError(sorted(failed))
+
 def fetch_worldnews(
     timespan: float = TIMESPAN_HOURS,
     number: int = NUM_RECORDS,
     language: str = 'en',
-    categories: str = 'politics,sports,business,technology,entertainment,health,science,lifestyle,travel,culture,education,environment,other',
+    categories: str = DEFAULT_CATEGORIES,
     sort: str = 'publish-time',
     sort_direction: str = 'DESC',
     offset: int = 0
 ) -> List[Dict]:
-  
+    """
+    Fetch up to `number` articles as one list.
+    More than PAGE_SIZE (the API maximum per request) are fetched as
+    concurrent pages through iter_worldnews.
+    """
+    articles = []
     try:
-
-        # now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
-        now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
-        earliest = (now - timedelta(hours=timespan)).replace(minute=0, second=0, microsecond=0)
-
-        print(f"[fetch_worldnews] earliest_publish_date: {earliest.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"[fetch_worldnews] latest_publish_date: {now.strftime('%Y-%m-%d %H:%M:%S')}")
-
-        params = {
-            'language':language,
-            'categories':categories,
-            'sort':sort,
-            'sort_direction':sort_direction,
-            'offset':offset,
-            'number':number,
-            'earliest_publish_date':earliest.strftime('%Y-%m-%d %H:%M:%S'),
-            'latest_publish_date':now.strftime('%Y-%m-%d %H:%M:%S')
-        }
-
-        response = newsapi_instance.search_news(**params)
-        print(f"[fetch_worldnews_Response] Recieved {len(response.news)} articles. Total available: {response.available}.")
-        
-        articles = []
-        for article in response.news:
-            if len(article.title) >= MIN_HEADLINE_LENGTH:
-                kst_date = convert_utc_to_kst(article.publish_date)
-                country_name = get_country_name(article.source_country)
-                articles.append({
-                    'url': article.url,
-                    'source_country': country_name,
-                    'headline': article.title,
-                    'date': kst_date
-                })
-                
+        for page in iter_worldnews(
+            timespan=timespan, max_articles=number, language=language,
+            categories=categories, sort=sort, sort_direction=sort_direction, offset=offset,
+        ):
+            articles.extend(page)
+        return articles
+    except PageFetchError as e:
+        print(f"Exception when calling NewsAPI -> search_news: {e}")
         return articles
     except ApiException as e:
         print(f"Exception when calling NewsAPI -> search_news: {e}")
-        return []
\ No newline at end of file
+        return []
@@ -1,10 +1,19 @@
+import os
 import json
 import sys
 import random
+import secrets
 import time
 import subprocess
+import threading
+from collections import deque
+from multiprocessing.connection import Client, AuthenticationError
 from pythonosc import udp_client
-import schedule
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "api"))
+from mood import rolling_mood
+from config import WORKER_HOST, WORKER_PORT, WORKER_AUTHKEY_ENV, RUN_REPORT_PATH
 
 # ─────────────────────────────────────────────
 # 1. 설정값 (필요시 수정)
@@ -15,16 +24,47 @@ TOUCHDESIGNER_PORT = 8000   #포트번호
 
 # JSON 파일 경로
 JSON_PATH = "latest_articles_with_sentiment.json"
+OSC_ADDRESS = "/msg"
 
 # news2emotion 실행 옵션
+NEWS2EMOTION_ARGS = {"timespan": 8.0, "num_records": 100, "export_count": 150, "deadline": 900}
 NEWS2EMOTION_CMD = [
     sys.executable,
     "src/api/news2emotion.py",
-    "--timespan", "8.0",
-    "--num-records", "100",
-    "--export-count", "150",
+    "--timespan", str(NEWS2EMOTION_ARGS["timespan"]),
+    "--num-records", str(NEWS2EMOTION_ARGS["num_records"]),
+    "--export-count", str(NEWS2EMOTION_ARGS["export_count"]),
+    "--deadline", str(NEWS2EMOTION_ARGS["deadline"]),   # 초과분은 다음 갱신으로 이월
 ]
 
+# 상주 추론 워커 (모델을 한 번만 로드, 실패 시 subprocess로 대체)
+USE_WORKER = True
+WORKER_ADDRESS = (WORKER_HOST, WORKER_PORT)
+# 인증 키: .env의 WORKER_AUTHKEY, 없으면 실행마다 새로 생성해 워커 환경 변수로 전달
+WORKER_AUTHKEY = (os.getenv(WORKER_AUTHKEY_ENV) or secrets.token_hex(32)).encode()
+WORKER_CMD = [sys.executable, "src/api/inference_worker.py"]
+WORKER_STARTUP_TIMEOUT = 180   # 워커 모델 로딩 대기 (초)
+
+# 스케줄 (monotonic clock 기준)
+SEND_INTERVAL = 10          # OSC 전송 주기 (초)
+REFRESH_INTERVAL = 3600     # JSON 갱신 주기 (초)
+REFRESH_TIMEOUT = 1800      # 갱신 1회 최대 실행 시간 (초)
+METRICS_INTERVAL = 300      # 스케줄러 지표 출력 주기 (초)
+
+# 적응형 갱신 주기 (새 기사 도착률 기준)
+ADAPTIVE_REFRESH = True
+REFRESH_MIN_INTERVAL = 900         # 속보가 몰릴 때 최소 갱신 주기 (초)
+REFRESH_MAX_INTERVAL = 4 * 3600    # 조용할 때 최대 갱신 주기 (초)
+TARGET_NEW_PER_REFRESH = 30        # 갱신 1회에 기대하는 새 기사 수 → 주기 = 목표 / 도착률
+RATE_SMOOTHING = 0.3               # 도착률 / 갱신당 point EWMA 가중치
+DAILY_POINT_BUDGET = 50.0          # 최근 24시간 WorldNews point 상한
+
+# 전체 / 국가별 분위기 (mood_buckets 집계, mood.py 참고)
+SEND_MOOD = True
+MOOD_ADDRESS = "/mood"
+MOOD_INTERVAL = 60          # /mood 전송 주기 (초)
+MOOD_WINDOW_MINUTES = 180   # 최근 몇 분간 발행된 기사 기준
+
 # ───────────────────────────────────────────────
 # 긴 문자열을 <split> 토큰으로 분할
 # ───────────────────────────────────────────────
@@ -57,49 +97,426 @@ client = udp_client.SimpleUDPClient(TOUCHDESIGNER_IP, TOUCHDESIGNER_PORT)  # IP,
 # ─────────────────────────────────────────────
 # 3. JSON 갱신 함수 (1시간 주기)
 # ─────────────────────────────────────────────
-def update_json() -> None:
+worker_proc = None
+
+def start_worker() -> None:
+    """상주 워커 프로세스 실행 (모델은 워커에서 한 번만 로드). 이미 실행 중이면 그대로 둠"""
+    global worker_proc
+    if worker_proc is None or worker_proc.poll() is not None:
+        worker_proc = subprocess.Popen(WORKER_CMD, env={**os.environ, WORKER_AUTHKEY_ENV: WORKER_AUTHKEY.decode()})
+        print("[osc.py] - 워커 시작 : inference_worker.py 실행")
+
+def stop_worker() -> None:
+    """응답 없는 워커 종료 (이전 사이클이 끝나지 않으면 다음 연결이 인증 단계에서 멈춤)"""
+    if worker_proc is not None and worker_proc.poll() is None:
+        worker_proc.terminate()
+        try:
+            worker_proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            worker_proc.kill()
+            worker_proc.wait()
+        print("[osc.py] - 워커 종료 : 응답 없음")
+
+def request_worker_cycle() -> dict:
+    """워커에 fetch/analyze 사이클 요청. 워커가 모델 로딩 중이면 연결될 때까지 대기"""
+    deadline = time.monotonic() + WORKER_STARTUP_TIMEOUT
+    while True:
+        try:
+            conn = Client(WORKER_ADDRESS, authkey=WORKER_AUTHKEY)
+            break
+        except ConnectionRefusedError:
+            if worker_proc is None or worker_proc.poll() is not None or time.monotonic() > deadline:
+                raise
+            time.sleep(1)
+    with conn:
+        conn.send({"cmd": "cycle", "kwargs": NEWS2EMOTION_ARGS})
+        if not conn.poll(REFRESH_TIMEOUT):
+            raise TimeoutError(f"워커 응답 없음 ({REFRESH_TIMEOUT}초 초과)")
+        response = conn.recv()
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error"))
+    return response["result"]
+
+def read_run_report(path: str = RUN_REPORT_PATH) -> dict:
+    """news2emotion 실행 리포트에서 {"fetched", "processed", "points", "window_h"} 읽기 (없으면 빈 dict)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+        return {"fetched": report["fetched"], "processed": report["processed"], "points": report["worldnews_points"],
+                "window_h": report.get("window_h")}
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[osc.py] - 경고 : 실행 리포트 읽기 실패 → {e}")
+        return {}
+
+def update_json():
+    """갱신 1회 실행. 성공하면 {"fetched", "processed", "points"}, 실패하면 None"""
+    if USE_WORKER:
+        print("[osc.py] - 업데이트 시작 : 워커에 갱신 요청 중...")
+        try:
+            start_worker()   # 워커가 종료됐으면 다시 실행 (실행 중이면 그대로)
+        except OSError as e:
+            print(f"[osc.py] - 워커 시작 실패 : {e}")
+        try:
+            result = request_worker_cycle()
+            print(f"[osc.py] - 업데이트 완료 : 뉴스 갱신 완료! {result}")
+            pool.reload(force=True)
+            return result
+        except TimeoutError as e:
+            # 워커는 아직 사이클 실행 중 → subprocess를 띄우면 같은 DB/워터마크/export에 두 번 실행됨.
+            # 워커를 재시작하고 이번 갱신은 건너뜀 (subprocess 경로의 TimeoutExpired와 같은 처리)
+            print(f"[osc.py] - 업데이트 오류 : {e} → 워커 재시작, 이번 갱신 건너뜀")
+            stop_worker()
+            start_worker()
+            return None
+        except ConnectionError as e:
+            print(f"[osc.py] - 워커 연결 실패 : {e} → subprocess로 대체")
+        except AuthenticationError as e:
+            # 다른 키로 떠 있는 워커(이전 실행 등)가 포트를 점유 → 요청은 보내지 않았음
+            print(f"[osc.py] - 워커 인증 실패 : {e} → subprocess로 대체")
+        except Exception as e:
+            print(f"[osc.py] - 업데이트 오류 : 워커 갱신 실패 → {e}")
+            return None
+
     print("[osc.py] - 업데이트 시작 : news2emotion.py 실행 중...")
-    result = subprocess.run(NEWS2EMOTION_CMD)
+    try:
+        result = subprocess.run(NEWS2EMOTION_CMD, timeout=REFRESH_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        print(f"[osc.py] - 업데이트 오류 : news2emotion.py 시간 초과 ({REFRESH_TIMEOUT}초)")
+        return None
     if result.returncode == 0:
         print("[osc.py] - 업데이트 완료 : 뉴스 갱신 완료!")
-    else:
-        print(f"[osc.py] - 업데이트 오류 : news2emotion.py 실행 실패 (exit code = {result.returncode})")
+        pool.reload(force=True)
+        return read_run_report()
+    print(f"[osc.py] - 업데이트 오류 : news2emotion.py 실행 실패 (exit code = {result.returncode})")
+    return None
+
+class BackgroundRefresh:
+    """update_json을 백그라운드 스레드에서 실행. 이전 갱신이 아직 진행 중이면 건너뜀"""
+
+    def __init__(self, job):
+        self.job = job
+        self.lock = threading.Lock()
+        self.runs = 0
+        self.skipped = 0
+
+    def trigger(self) -> bool:
+        if not self.lock.acquire(blocking=False):
+            self.skipped += 1
+            print("[osc.py] - 갱신 건너뜀 : 이전 갱신이 아직 실행 중")
+            return False
+        threading.Thread(target=self._run, name="refresh", daemon=True).start()
+        return True
+
+    def _run(self) -> None:
+        try:
+            self.runs += 1
+            self.job()
+        except Exception as e:
+            print(f"[osc.py] - 업데이트 오류 : {e}")
+        finally:
+            self.lock.release()
+
+class MonotonicTicker:
+    """
+    고정 주기 타이머. 다음 실행 시각을 (실제 실행 시각이 아닌) 예정 시각 + interval로 잡아
+    시간이 밀리지 않음. 한 주기 이상 늦으면 놓친 tick은 건너뛰고 missed로 집계
+    """
+
+    def __init__(self, interval: float, start: float = None):
+        self.interval = interval
+        self.next_due = time.monotonic() if start is None else start
+        self.ticks = 0
+        self.missed = 0
+        self.jitter_sum = 0.0
+        self.jitter_max = 0.0
+
+    def due(self, now: float) -> bool:
+        if now < self.next_due:
+            return False
+        late = now - self.next_due
+        skipped = int(late // self.interval)
+        self.missed += skipped
+        self.ticks += 1
+        jitter = late - skipped * self.interval
+        self.jitter_sum += jitter
+        self.jitter_max = max(self.jitter_max, jitter)
+        self.next_due += (skipped + 1) * self.interval
+        return True
+
+    def reschedule(self, interval: float, start: float) -> None:
+        """주기를 바꾸고 다음 실행을 start + interval로"""
+        self.interval = interval
+        self.next_due = start + interval
+
+    def stats(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "missed": self.missed,
+            "jitter_avg_ms": round(1000 * self.jitter_sum / self.ticks, 1) if self.ticks else 0.0,
+            "jitter_max_ms": round(1000 * self.jitter_max, 1),
+        }
 
+class AdaptiveRefresh:
+    """
+    최근 갱신 결과로 다음 갱신 주기를 정함
+    - 새 기사 도착률(건/시간, EWMA)이 높으면 주기를 줄이고, 조용하면 늘림 (TARGET_NEW_PER_REFRESH / 도착률)
+      도착률 = 새 기사 수 / 실제 조회 구간(window_h: watermark → 현재, 첫 실행·공백 후에는 timespan 전체)
+      조회 결과가 num_records 상한에 닿았으면 실제 도착률은 더 높으므로 평활하지 않고 바로 반영
+    - REFRESH_MIN_INTERVAL ~ REFRESH_MAX_INTERVAL 범위
+    - 갱신당 point(EWMA)로 하루 DAILY_POINT_BUDGET을 고르게 쓰는 주기보다 짧아지지 않음.
+      최근 24시간 사용량이 예산에 닿으면 가장 오래된 갱신이 24시간 창을 벗어날 때까지 대기 (최대 주기보다 우선)
+    """
+
+    def __init__(self, ticker: MonotonicTicker,
+                 min_interval: float = REFRESH_MIN_INTERVAL,
+                 max_interval: float = REFRESH_MAX_INTERVAL,
+                 target_new: float = TARGET_NEW_PER_REFRESH,
+                 daily_budget: float = DAILY_POINT_BUDGET):
+        self.ticker = ticker
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new = target_new
+        self.daily_budget = daily_budget
+        self.rate = None          # 새 기사 / 시간 (EWMA)
+        self.cost = None          # point / 갱신 (EWMA)
+        self.history = deque()    # 최근 24시간 (time.time(), points, new articles)
+        self.last_start = None
+        self.decisions = []
+
+    def _smooth(self, old, value):
+        return value if old is None else RATE_SMOOTHING * value + (1 - RATE_SMOOTHING) * old
+
+    def record(self, result, started: float, now: float = None) -> float:
+        """started(monotonic)에 시작한 갱신의 결과를 반영하고 다음 주기(초)를 정해 ticker에 적용"""
+        now = time.time() if now is None else now
+        elapsed = started - self.last_start if self.last_start is not None else self.ticker.interval
+        self.last_start = started
+        if result:
+            new, fetched, points = result.get("processed", 0), result.get("fetched", 0), result.get("points", 0.0)
+            if result.get("window_h"):
+                elapsed = result["window_h"] * 3600   # 이번 실행이 실제로 조회한 구간
+            rate = new * 3600 / max(elapsed, 1.0)
+            saturated = fetched >= NEWS2EMOTION_ARGS["num_records"]
+            self.rate = max(rate, self._smooth(self.rate, rate)) if saturated else self._smooth(self.rate, rate)
+            self.cost = self._smooth(self.cost, points)
+            self.history.append((now, points, new))
+        while self.history and self.history[0][0] <= now - 86400:
+            self.history.popleft()
+        spent = sum(points for _, points, _ in self.history)
+        arrived = sum(new for _, _, new in self.history)
+
+        interval = self.target_new * 3600 / self.rate if self.rate else self.max_interval
+        if interval <= self.min_interval:
+            interval, reason = self.min_interval, "burst (min)"
+        elif interval >= self.max_interval:
+            interval, reason = self.max_interval, "quiet (max)"
+        else:
+            reason = "rate"
+        if self.cost and self.daily_budget > 0:
+            pace = 86400 * self.cost / self.daily_budget      # 예산을 하루에 고르게 쓰는 주기
+            if pace > interval:
+                interval, reason = pace, "budget pace"
+            if spent + self.cost > self.daily_budget and self.history:
+                wait = self.history[0][0] + 86400 - now
+                if wait > interval:
+                    interval, reason = wait, "budget exhausted"
+
+        decision = {
+            "interval_s": round(interval),
+            "reason": reason,
+            "new": result.get("processed") if result else None,
+            "new_ratio": round(result["processed"] / result["fetched"], 2) if result and result.get("fetched") else None,
+            "rate_per_h": round(self.rate, 1) if self.rate is not None else None,
+            "points_24h": round(spent, 2),
+            "new_per_point_24h": round(arrived / spent, 1) if spent else None,
+        }
+        self.decisions.append(decision)
+        del self.decisions[:-100]
+        print(f"[osc.py] - 갱신 주기 결정 : {decision}")
+        self.ticker.reschedule(interval, started)
+        return interval
 
 # ─────────────────────────────────────────────
 # 4. OSC 전송 함수 (10초 주기)
 # ─────────────────────────────────────────────
+class HeadlinePool:
+    """
+    JSON 파일의 기사들을 <split> 처리 + OSC 메시지로 미리 인코딩해 메모리에 보관
+    - 파일(manifest가 있으면 manifest)의 mtime/size가 바뀌었을 때만 다시 읽음 (또는 reload(force=True))
+    - manifest가 직전 seq 기준 delta를 가리키면 새 기사만 읽어 인코딩 (export_utils 참고)
+    - 새 파일이 쓰는 중이거나 깨진 JSON이면 기존 pool을 그대로 사용
+    - reload는 갱신 스레드(force)와 전송 루프 양쪽에서 불리므로 reload_lock으로 한 번에 하나만 실행
+      (같은 delta를 두 번 적용하거나 새 delta 뒤에 오래된 전체 파일을 적용하지 않도록)
+    - 셔플 백(shuffle bag) 방식으로 한 바퀴 동안 같은 기사를 반복하지 않음
+    """
+
+    def __init__(self, path: str, address: str = OSC_ADDRESS):
+        self.path = path
+        self.manifest_path = os.path.splitext(path)[0] + ".manifest.json"
+        self.address = address
+        self.lock = threading.Lock()          # entries / payloads / bag 교체와 next()
+        self.reload_lock = threading.Lock()   # signature / seq 확인부터 교체까지
+        self.entries = {}       # url → (timestamp, (headline_for_td, OscMessage))
+        self.payloads = []      # [(headline_for_td, OscMessage)]
+        self.bag = []
+        self.last = None
+        self.signature = None   # (path, mtime_ns, size)
+        self.seq = None
+        self.reloads = 0
+        self.deltas = 0
+        self.rejected = 0
+
+    def _encode(self, entry: dict):
+        headline_for_td = insert_splits(entry["headline"])  # split
+        payload = {**entry, "headline": headline_for_td}    #split headline 새 dict에
+        builder = OscMessageBuilder(address=self.address)
+        builder.add_arg(json.dumps(payload, ensure_ascii=False))
+        return headline_for_td, builder.build()
+
+    def _encode_all(self, data) -> dict:
+        if not isinstance(data, list):
+            raise ValueError("기사 목록이 JSON 배열이 아님")
+        return {
+            entry.get("url", i): (entry.get("timestamp") or "", self._encode(entry))
+            for i, entry in enumerate(data)
+        }
+
+    def _read_manifest(self):
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        folder = os.path.dirname(self.path)
+        if manifest["seq"] == self.seq:
+            return None, None
+        if self.seq is not None and manifest.get("delta") and manifest.get("delta_base_seq") == self.seq:
+            with open(os.path.join(folder, manifest["delta"]), "r", encoding="utf-8") as f:
+                added = self._encode_all([json.loads(line) for line in f if line.strip()])
+            entries = {**self.entries, **added}
+            keep = sorted(entries, key=lambda url: entries[url][0], reverse=True)[:manifest["count"]]
+            return manifest, {url: entries[url] for url in keep}
+        with open(os.path.join(folder, manifest["full"]), "r", encoding="utf-8") as f:
+            return manifest, self._encode_all(json.load(f))
+
+    def reload(self, force: bool = False) -> bool:
+        """파일이 바뀌었으면 새 pool로 교체. 교체했으면 True"""
+        with self.reload_lock:
+            return self._reload(force)
+
+    def _reload(self, force: bool) -> bool:
+        watched = self.manifest_path if os.path.exists(self.manifest_path) else self.path
+        try:
+            st = os.stat(watched)
+        except OSError as e:
+            if not self.payloads:
+                print(f"[osc.py] - 경고 : JSON 파일 없음 → {e}")
+            return False
+        signature = (watched, st.st_mtime_ns, st.st_size)
+        if not force and signature == self.signature:
+            return False
+        try:
+            if watched == self.manifest_path:
+                manifest, entries = self._read_manifest()
+                if manifest is None:
+                    self.signature = signature   # 같은 seq: 바뀐 것 없음
+                    return False
+            else:
+                manifest = None
+                with open(self.path, "r", encoding="utf-8") as f:
+                    entries = self._encode_all(json.load(f))
+            if not entries:
+                raise ValueError("기사 목록이 비어 있음")
+        except Exception as e:
+            self.signature = signature  # 같은 파일을 매번 다시 파싱하지 않도록
+            self.rejected += 1
+            print(f"[osc.py] - 경고 : JSON 파싱 오류 → {e} (기존 {len(self.payloads)}건 유지)")
+            return False
+        is_delta = manifest is not None and self.seq is not None and manifest.get("delta_base_seq") == self.seq
+        with self.lock:
+            self.entries, self.bag, self.signature = entries, [], signature
+            self.payloads = [item for _, item in entries.values()]
+            self.seq = manifest["seq"] if manifest else None
+            self.reloads += 1
+            self.deltas += is_delta
+        print(f"[osc.py] - 기사 목록 갱신 : {len(self.payloads)}건" + (" (delta)" if is_delta else ""))
+        return True
+
+    def next(self):
+        """다음 (headline_for_td, OscMessage). pool이 비어 있으면 None"""
+        with self.lock:
+            if not self.bag:
+                if not self.payloads:
+                    return None
+                self.bag = self.payloads[:]
+                random.shuffle(self.bag)
+                # 바퀴가 바뀔 때 직전 기사가 바로 다시 나오지 않도록
+                if len(self.bag) > 1 and self.bag[-1] is self.last:
+                    self.bag[0], self.bag[-1] = self.bag[-1], self.bag[0]
+            self.last = self.bag.pop()
+            return self.last
+
+pool = HeadlinePool(JSON_PATH)
+
 def send_random_message() -> None:
     try:
-        with open(JSON_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if not data:
+        pool.reload()
+        item = pool.next()
+        if item is None:
             print(f"[osc.py] - 경고 : JSON 데이터 없음 → {JSON_PATH}")
             return
 
-        entry = random.choice(data)
-        headline_for_td = insert_splits(entry["headline"])  # split
-        payload = {**entry, "headline": headline_for_td}    #split headline 새 dict에 
-        client.send_message("/msg", json.dumps(payload, ensure_ascii=False))
+        headline_for_td, message = item
+        client.send(message)
         print(f"[osc.py] - 전송 완료 → {headline_for_td}")
 
     except Exception as e:
-        print(f"[osc.py] - 에러 : JSON 파싱 오류 → {e}")
+        print(f"[osc.py] - 에러 : OSC 전송 오류 → {e}")
         return
 
+def send_mood() -> None:
+    """최근 MOOD_WINDOW_MINUTES분 분위기(rolling_mood 결과)를 JSON 하나로 MOOD_ADDRESS에 전송"""
+    try:
+        mood = rolling_mood(window_minutes=MOOD_WINDOW_MINUTES)
+        builder = OscMessageBuilder(address=MOOD_ADDRESS)
+        builder.add_arg(json.dumps(mood, ensure_ascii=False))
+        client.send(builder.build())
+        print(f"[osc.py] - 분위기 전송 → total={mood['total']}, score={mood['score']}")
+    except Exception as e:
+        print(f"[osc.py] - 에러 : 분위기 전송 오류 → {e}")
+
 # ─────────────────────────────────────────────
 # 5. 스케줄 등록 및 루프
 # ─────────────────────────────────────────────
 if __name__ == "__main__":
-    update_json() # 첫 실행에서 JSON 갱신
-    print("[osc.py] - 최초 실행 : JSON 갱신 시도")
+    if USE_WORKER:
+        start_worker()
+    now = time.monotonic()
+    send_ticker = MonotonicTicker(SEND_INTERVAL, start=now)           # 10초마다 OSC 전송
+    refresh_ticker = MonotonicTicker(REFRESH_INTERVAL, start=now)     # 1시간마다 JSON 갱신 (첫 실행 포함)
+    metrics_ticker = MonotonicTicker(METRICS_INTERVAL, start=now + METRICS_INTERVAL)
+    mood_ticker = MonotonicTicker(MOOD_INTERVAL, start=now)
+    controller = AdaptiveRefresh(refresh_ticker)
+
+    def refresh_job() -> None:
+        started = time.monotonic()
+        result = update_json()
+        if ADAPTIVE_REFRESH:
+            controller.record(result, started)
 
-    # 10초마다 OSC 전송
-    schedule.every(10).seconds.do(send_random_message)
-    # 1시간마다 JSON 갱신
-    schedule.every(1).hours.do(update_json)
+    refresher = BackgroundRefresh(refresh_job)
 
-    print("[osc.py] - 스크립트 실행 중 : 10초마다 OSC 전송, 1시간마다 JSON 갱신")
+    print("[osc.py] - 스크립트 실행 중 : 10초마다 OSC 전송, JSON 갱신은 백그라운드 "
+          + ("(새 기사 도착률에 따라 주기 조절)" if ADAPTIVE_REFRESH else "(1시간마다)"))
     while True:
-        schedule.run_pending()
-        time.sleep(1)
\ No newline at end of file
+        now = time.monotonic()
+        if refresh_ticker.due(now):
+            refresher.trigger()
+        if send_ticker.due(now):
+            send_random_message()
+        if SEND_MOOD and mood_ticker.due(now):
+            send_mood()
+        if metrics_ticker.due(now):
+            print(f"[osc.py] - 스케줄러 지표 : send={send_ticker.stats()} "
+                  f"refresh(runs={refresher.runs}, skipped={refresher.skipped}, interval={refresh_ticker.interval:.0f}s)")
+        next_due = min(send_ticker.next_due, refresh_ticker.next_due, metrics_ticker.next_due)
+        if SEND_MOOD:
+            next_due = min(next_due, mood_ticker.next_due)
+        time.sleep(max(0.0, next_due - time.monotonic()))
\ No newline at end of file
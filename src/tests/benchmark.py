@@ -0,0 +1,294 @@
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import db
+
+'''
+Offline benchmark for each pipeline stage.
+No network: WorldNews, Google Translate and the TouchDesigner OSC receiver are
+replaced by local stand-ins, and the corpus is built deterministically from
+fixtures/headlines.txt. Results (headlines/s, p50/p99 latency) go to JSON so
+two versions can be compared:
+
+  python src/tests/benchmark.py --out bench.json
+  python src/tests/benchmark.py --skip-models --db-sizes 10000   # DB / OSC만
+'''
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "headlines.txt")
+PREFIXES = ["", "Breaking: ", "Update: ", "Analysis: ", "Exclusive: ", "Live: ", "Report: ", "Opinion: "]
+SUFFIXES = ["", ", officials say", " as markets react", " amid growing concern",
+            " despite criticism", ", reports say", " after talks", " in latest development"]
+COUNTRIES = ["kr", "us", "gb", "jp", "de", "fr", "in", "br"]
+
+
+def load_corpus(size: int, fixture: str = FIXTURE, seed: int = 0):
+    """`size` distinct headlines made from the fixture with fixed prefixes/suffixes, in a fixed order."""
+    with open(fixture, "r", encoding="utf-8") as f:
+        base = [line.strip() for line in f if line.strip()]
+    corpus = [p + h + s for p in PREFIXES for s in SUFFIXES for h in base]
+    random.Random(seed).shuffle(corpus)
+    if size > len(corpus):
+        raise ValueError(f"corpus has only {len(corpus)} headlines")
+    return corpus[:size]
+
+
+def summarize(latencies, items: int = None):
+    """headlines/s over the summed call time and p50/p99 per-call latency (ms)."""
+    lat = sorted(latencies)
+    total = sum(lat)
+    items = len(lat) if items is None else items
+
+    def pct(q):
+        return round(1000 * lat[min(len(lat) - 1, int(q * len(lat)))], 4) if lat else None
+
+    return {
+        "calls": len(lat),
+        "items": items,
+        "total_s": round(total, 4),
+        "per_s": round(items / total, 1) if total else None,
+        "p50_ms": pct(0.50),
+        "p99_ms": pct(0.99),
+    }
+
+
+def measure(fn, args_list):
+    latencies = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def measure_batches(fn, items, batch_size):
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    return summarize(measure(fn, [(b,) for b in batches]), items=len(items))
+
+
+class StubNewsApi:
+    """Local stand-in for the WorldNews search_news endpoint, serving the corpus."""
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    def search_news(self, **params):
+        start = params["offset"]
+        stop = min(start + params["number"], len(self.corpus))
+        news = [
+            SimpleNamespace(
+                url=f"https://bench.local/{i}",
+                title=self.corpus[i],
+                publish_date="2025-06-25 00:00:00",
+                source_country=COUNTRIES[i % len(COUNTRIES)],
+            )
+            for i in range(start, stop)
+        ]
+        return SimpleNamespace(news=news, available=len(self.corpus))
+
+
+class OscReceiver:
+    """UDP sink on localhost standing in for TouchDesigner; counts datagrams."""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.5)
+        self.port = self.sock.getsockname()[1]
+        self.received = 0
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop:
+            try:
+                self.sock.recv(65535)
+                self.received += 1
+            except socket.timeout:
+                continue
+
+    def close(self):
+        self._stop = True
+        self._thread.join()
+        self.sock.close()
+
+
+def _article_rows(n, start=0):
+    base = 1735689600   # 2025-01-01 00:00:00 UTC
+    for i in range(start, start + n):
+        ts = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(base + i * 7))
+        yield (f"https://bench.local/{i}", f"headline {i}", COUNTRIES[i % len(COUNTRIES)], ts, "neutral", 0.5)
+
+
+def bench_db(results, corpus, sizes, workdir):
+    db.DB_FILE = os.path.join(workdir, "bench_small.db")
+    db.init_db()
+    rows = list(_article_rows(len(corpus)))
+    results["save_article"] = summarize(measure(db.save_article, rows))
+    results["is_new_article"] = summarize(measure(db.is_new_article, [(r[0],) for r in rows]))
+    results["save_articles_bulk"] = measure_batches(db.save_articles_bulk, rows, 100)
+    results["filter_new_urls"] = measure_batches(db.filter_new_urls, [r[0] for r in rows], 100)
+
+    for size in sizes:
+        db.DB_FILE = os.path.join(workdir, f"bench_{size}.db")
+        db.init_db()
+        chunk = 50000
+        for start in range(0, size, chunk):
+            db.save_articles_bulk(_article_rows(min(chunk, size - start), start))
+        results[f"get_latest_articles@{size}"] = summarize(
+            measure(db.get_latest_articles, [(150, 1)] * 200), items=200)
+    db.close_conn()
+
+
+def bench_osc(results, corpus):
+    import osc
+
+    results["insert_splits"] = summarize(measure(osc.insert_splits, [(h,) for h in corpus]))
+
+    receiver = OscReceiver()
+    try:
+        path = os.path.join(tempfile.mkdtemp(prefix="bench-osc-"), "latest.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([{"url": str(i), "headline": h, "source_country": "kr", "timestamp": "",
+                        "sentiment": {"label": "neutral", "confidence": 0.5}}
+                       for i, h in enumerate(corpus[:150])], f, ensure_ascii=False)
+        osc.pool = osc.HeadlinePool(path)
+        osc.client = osc.udp_client.SimpleUDPClient("127.0.0.1", receiver.port)
+        start = time.perf_counter()
+        osc.pool.reload()
+        results["osc_pool_reload"] = summarize([time.perf_counter() - start], items=150)
+        devnull = open(os.devnull, "w")
+        stdout, sys.stdout = sys.stdout, devnull   # send_random_message는 매번 print
+        try:
+            results["send_random_message"] = summarize(measure(osc.send_random_message, [()] * 1000))
+        finally:
+            sys.stdout = stdout
+            devnull.close()
+        time.sleep(0.2)
+        results["send_random_message"]["received"] = receiver.received
+    finally:
+        receiver.close()
+
+
+def bench_fetch(results, corpus):
+    import worldnews_api
+
+    api = StubNewsApi(corpus)
+    limiter = worldnews_api.RateLimiter(rate=0)
+    start = time.perf_counter()
+    n = sum(len(page) for page in worldnews_api.iter_worldnews(
+        max_articles=len(corpus), api=api, limiter=limiter))
+    results["iter_worldnews(stub)"] = summarize([time.perf_counter() - start], items=n)
+
+
+def bench_translation(results, corpus, workdir):
+    import translation_api
+
+    db.DB_FILE = os.path.join(workdir, "bench_translation.db")
+    db.init_db()
+    translation_api.set_backend(translation_api.FakeTranslator())
+    results["translate_batch(fake, cold)"] = measure_batches(translation_api.translate_batch, corpus, 100)
+    results["translate_batch(fake, cached)"] = measure_batches(translation_api.translate_batch, corpus, 100)
+    db.close_conn()
+
+
+def bench_models(results, corpus, model_items, workdir):
+    import emotion_utils
+    import sentiment_nli
+
+    db.DB_FILE = os.path.join(workdir, "bench_models.db")
+    db.init_db()
+    emotion_utils.USE_CACHE = False   # 캐시가 아닌 추론 자체를 측정
+    emotion_utils.load_model()
+    sentiment_nli.load_nli_model()
+    texts = corpus[:model_items]
+    items = [{"text": t, "source_country": "kr", "published": ""} for t in texts]
+
+    probs = emotion_utils.emotion_probs(texts)
+    results["calculate_sentiment_score"] = summarize(
+        measure(emotion_utils.calculate_sentiment_score, [(p,) for p in probs]))
+    results["analyze_headline_emotion"] = summarize(measure(emotion_utils.analyze_headline_emotion, [(i,) for i in items]))
+    results["analyze_headlines_batch"] = measure_batches(emotion_utils.analyze_headlines_batch, items, emotion_utils.BATCH_SIZE)
+    results["nli_sentiment"] = summarize(measure(sentiment_nli.nli_sentiment, [(t,) for t in texts]))
+    results["nli_sentiment_batch"] = measure_batches(sentiment_nli.nli_sentiment_batch, texts, 16)
+    db.close_conn()
+
+
+def run(args):
+    corpus = load_corpus(args.corpus_size, args.fixture)
+    results, skipped = {}, {}
+    workdir = tempfile.mkdtemp(prefix="bench-")
+
+    def attempt(name, fn, *fn_args):
+        try:
+            fn(results, *fn_args)
+        except ImportError as e:
+            skipped[name] = f"missing dependency: {e}"
+
+    bench_db(results, corpus, args.db_sizes, workdir)
+    attempt("osc", bench_osc, corpus)
+    attempt("fetch", bench_fetch, corpus)
+    attempt("translation", bench_translation, corpus, workdir)
+    if args.skip_models:
+        skipped["models"] = "--skip-models"
+    else:
+        attempt("models", bench_models, corpus, args.model_items, workdir)
+
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                  capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        revision = None
+    return {
+        "meta": {
+            "revision": revision,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "inference_backend": os.getenv("INFERENCE_BACKEND", "torch"),
+            "corpus_size": len(corpus),
+            "corpus_sha256": hashlib.sha256("\n".join(corpus).encode("utf-8")).hexdigest(),
+            "model_items": 0 if args.skip_models else args.model_items,
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Offline per-stage benchmark")
+    p.add_argument("--fixture", default=FIXTURE)
+    p.add_argument("--corpus-size", type=int, default=3000, help="벤치마크 헤드라인 수")
+    p.add_argument("--model-items", type=int, default=500, help="모델 단계에 쓸 헤드라인 수 (CPU 추론은 느림)")
+    p.add_argument("--db-sizes", type=int, nargs="*", default=[10_000, 100_000, 1_000_000])
+    p.add_argument("--skip-models", action="store_true", help="GoEmotions / NLI 측정 생략")
+    p.add_argument("--out", default=None, help="결과 JSON 파일 (기본: stdout)")
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with contextlib.redirect_stdout(sys.stderr):   # 모듈들의 print는 stderr로, stdout은 JSON만
+        report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
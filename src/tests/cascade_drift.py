@@ -0,0 +1,30 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+import emotion_utils
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "headlines.txt")
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Cascade NLI drift vs always-NLI")
+    p.add_argument("--fixture", default=FIXTURE)
+    p.add_argument("--band-low", type=float, default=emotion_utils.NLI_BAND_LOW)
+    p.add_argument("--band-high", type=float, default=emotion_utils.NLI_BAND_HIGH)
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    emotion_utils.NLI_BAND_LOW = args.band_low
+    emotion_utils.NLI_BAND_HIGH = args.band_high
+    with open(args.fixture, "r", encoding="utf-8") as f:
+        texts = [line.strip() for line in f if line.strip()]
+    report = emotion_utils.cascade_drift(texts)
+    report["band"] = [args.band_low, args.band_high]
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
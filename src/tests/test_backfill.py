@@ -0,0 +1,52 @@
+import json
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("torch")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+import db
+import backfill
+import emotion_utils
+
+def _fake_scores(texts):
+    return [("positive" if "good" in t else "negative", 0.9, b"e", None) for t in texts]
+
+@pytest.fixture
+def tmp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_FILE", str(tmp_path / "test.db"))
+    monkeypatch.setattr(emotion_utils, "score_texts", _fake_scores)
+    monkeypatch.setattr(backfill, "_load_models", lambda threads: None)
+    db.init_db()
+    return tmp_path
+
+def test_backfill_resumes_from_checkpoint(tmp_db):
+    db.save_articles_bulk([
+        (f"u{i}", f"ko {i}", "kr", "2025-01-01 00:00:00", None, None, f"good news {i}") for i in range(10)
+    ])
+    db.save_articles_bulk([("legacy", "번역", "kr", "2025-01-01 00:00:00", None, None)])
+    db.put_cached_translations([("bad legacy news", "번역")], "ko")
+
+    first = backfill.backfill(workers=0, chunk_size=4)
+    assert (first["processed"], first["scored"]) == (11, 11)
+    c = db.get_conn().cursor()
+    assert c.execute("SELECT sentiment_label FROM articles WHERE url='legacy'").fetchone() == ("negative",)
+
+    db.commit_backfill_chunk("backfill", "db", 4, 4)   # 중간에 멈춘 job처럼 되돌림
+    resumed = backfill.backfill(workers=0, chunk_size=4)
+    assert (resumed["processed"], resumed["scored"]) == (11, 7)
+
+def test_backfill_from_ndjson_inserts_articles(tmp_db):
+    path = tmp_db / "dump.ndjson"
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(5):
+            f.write(json.dumps({"url": f"n{i}", "headline": "good day", "source_country": "us",
+                                "timestamp": "2025-01-02 00:00:00"}) + "\n")
+    result = backfill.backfill(input_path=str(path), job="dump", workers=0, chunk_size=2)
+    assert result["scored"] == 5
+    c = db.get_conn().cursor()
+    assert c.execute("SELECT headline_en, sentiment_label FROM articles WHERE url='n4'").fetchone() == ("good day", "positive")
+    assert db.get_backfill_checkpoint("dump")[1:] == (5, 5)
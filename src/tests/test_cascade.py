@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+import emotion_utils
+
+def _fake_nli(texts):
+    # 항상 negative → NLI를 거친 행만 라벨이 바뀜
+    return [("negative", 0.9, {"positive": 0.05, "negative": 0.9, "neutral": 0.05}) for _ in texts]
+
+def test_cascade_skips_nli_outside_the_band(monkeypatch):
+    emotion_utils._set_labels({0: "joy", 1: "fear", 2: "neutral"})
+    probs = torch.tensor([
+        [0.9, 0.0, 0.1],     # 확신 높은 positive → NLI 생략
+        [0.3, 0.25, 0.45],   # 애매함 → NLI
+        [0.0, 0.9, 0.1],     # 확신 높은 negative → NLI 생략
+    ])
+    monkeypatch.setattr(emotion_utils, "emotion_probs", lambda texts: probs[:len(texts)])
+    monkeypatch.setattr(emotion_utils, "nli_sentiment_batch", _fake_nli)
+    monkeypatch.setattr(emotion_utils, "USE_NLI", True)
+    monkeypatch.setattr(emotion_utils, "NLI_CASCADE", True)
+    monkeypatch.setattr(emotion_utils, "NLI_STATS", {"called": 0, "skipped": 0})
+
+    rows = emotion_utils.score_texts(["a", "b", "c"])
+
+    assert emotion_utils.NLI_STATS == {"called": 1, "skipped": 2}
+    for row, p in ((0, probs[0]), (2, probs[2])):
+        assert rows[row][:2] == emotion_utils.calculate_sentiment_score(p) and rows[row][3] is None
+    assert rows[0][0] == "positive" and rows[2][0] == "negative"
+    assert rows[1][0] == "negative" and rows[1][3] is not None
+
+def test_needs_nli_band(monkeypatch):
+    monkeypatch.setattr(emotion_utils, "USE_NLI", True)
+    monkeypatch.setattr(emotion_utils, "NLI_BAND_LOW", 0.1)
+    monkeypatch.setattr(emotion_utils, "NLI_BAND_HIGH", 0.5)
+    assert [emotion_utils.needs_nli(c, cascade=True) for c in (0.05, 0.1, 0.49, 0.5)] == [False, True, True, False]
+    assert emotion_utils.needs_nli(0.9, cascade=False)
+    monkeypatch.setattr(emotion_utils, "USE_NLI", False)
+    assert not emotion_utils.needs_nli(0.3, cascade=False)
@@ -0,0 +1,87 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+import db
+
+def _use_tmp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_FILE", str(tmp_path / "test.db"))
+    db.init_db()
+
+def test_sentiment_cache_roundtrip(tmp_path, monkeypatch):
+    _use_tmp_db(tmp_path, monkeypatch)
+    probs = db.pack_f16([0.25, 0.5])
+    db.put_cached_sentiments([("a", "positive", 0.8, probs, None), ("b", "negative", 0.4)])
+    found = db.get_cached_sentiments(["a", "b", "missing"])
+    assert found == {"a": ("positive", 0.8, probs, None), "b": ("negative", 0.4, None, None)}
+    assert db.unpack_f16(found["a"][2]) == (0.25, 0.5)
+
+def test_sentiment_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    _use_tmp_db(tmp_path, monkeypatch)
+    db.put_cached_sentiments([("old", "neutral", 0.1)])
+    db.put_cached_sentiments([("new", "positive", 0.9)])
+    db.get_cached_sentiments(["old"])
+    db.put_cached_sentiments([("newest", "negative", 0.5)], max_rows=2)
+    assert set(db.get_cached_sentiments(["old", "new", "newest"])) == {"old", "newest"}
+
+def test_translation_cache_is_per_target(tmp_path, monkeypatch):
+    _use_tmp_db(tmp_path, monkeypatch)
+    db.put_cached_translations([("Hello", "안녕하세요")], "ko")
+    assert db.get_cached_translations(["Hello", "Bye"], "ko") == {"Hello": "안녕하세요"}
+    assert db.get_cached_translations(["Hello"], "ja") == {}
+
+def test_bulk_save_and_filter_new_urls(tmp_path, monkeypatch):
+    _use_tmp_db(tmp_path, monkeypatch)
+    rows = [
+        ("u1", "h1", "Korea", "2025-06-25 08:30:00", "positive", 0.7),
+        ("u2", "h2", "Japan", "2025-06-25 08:31:00", "negative", 0.3),
+    ]
+    assert db.save_articles_bulk(rows) == 2
+    assert db.filter_new_urls(["u3", "u1", "u3", "u2"]) == ["u3"]
+    assert not db.is_new_article("u2")
+
+def test_to_epoch_handles_kst_and_gdelt_formats():
+    assert db.to_epoch("2025-06-25 09:00:00") == db.to_epoch("20250625T000000Z")
+    assert db.to_epoch("not a date") is None
+
+def test_init_db_migrates_legacy_table(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_FILE", str(tmp_path / "legacy.db"))
+    conn = db.get_conn()
+    conn.execute("CREATE TABLE articles (url TEXT PRIMARY KEY, headline TEXT, source_country TEXT, "
+                 "timestamp TEXT, sentiment_label TEXT, sentiment_confidence REAL)")
+    conn.execute("INSERT INTO articles VALUES ('old', 'h', 'Korea', '2025-06-25 09:00:00', 'neutral', 0.1)")
+    conn.commit()
+    db.init_db()
+    epoch, = conn.execute("SELECT ts_epoch FROM articles WHERE url='old'").fetchone()
+    assert epoch == db.to_epoch("20250625T000000Z")
+
+def test_get_latest_articles_returns_newest_first(tmp_path, monkeypatch):
+    _use_tmp_db(tmp_path, monkeypatch)
+    db.save_articles_bulk([
+        (f"u{i}", f"h{i}", "Korea", f"2025-06-25 0{i}:00:00", "neutral", 0.1) for i in range(5)
+    ])
+    assert [row[0] for row in db.get_latest_articles(min_count=3)] == ["u4", "u3", "u2"]
+    plan = " ".join(str(r) for r in db.get_conn().execute(
+        "EXPLAIN QUERY PLAN SELECT url FROM articles ORDER BY ts_epoch DESC LIMIT 3"))
+    assert "idx_articles_ts_epoch" in plan
+
+def test_fetch_watermark_roundtrip(tmp_path, monkeypatch):
+    _use_tmp_db(tmp_path, monkeypatch)
+    assert db.get_fetch_watermark("worldnews") is None
+    db.set_fetch_watermark("worldnews", 1750000000.0, ["b", "a", "a"])
+    db.set_fetch_watermark("worldnews", 1750000600.0, ["c"])
+    published, urls, _ = db.get_fetch_watermark("worldnews")
+    assert (published, urls) == (1750000600.0, ["c"])
+
+def test_pending_articles_newest_first_until_stored(tmp_path, monkeypatch):
+    _use_tmp_db(tmp_path, monkeypatch)
+    arts = [{"url": f"u{i}", "headline": f"h{i}", "source_country": "Korea", "date": f"2025-06-25 0{i}:00:00"}
+            for i in range(3)]
+    assert db.enqueue_pending(arts) == 3
+    assert db.enqueue_pending(arts[:1]) == 0
+    assert [a["url"] for a in db.get_pending_articles()] == ["u2", "u1", "u0"]
+    db.save_articles_bulk([("u2", "h2", "Korea", "2025-06-25 02:00:00", "neutral", 0.1)])
+    db.remove_pending(["u1"])
+    assert [a["url"] for a in db.get_pending_articles()] == ["u0"]
+    assert db.count_pending() == 1
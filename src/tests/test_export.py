@@ -0,0 +1,102 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+import db
+import export_utils
+
+def _use_tmp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_FILE", str(tmp_path / "test.db"))
+    db.init_db()
+
+def _save(urls, hour):
+    db.save_articles_bulk([
+        (url, f"headline {url}", "kr", f"2025-01-01 {hour:02d}:{i:02d}:00", "neutral", 0.5)
+        for i, url in enumerate(urls)
+    ])
+
+def _read_ndjson(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_export_writes_full_file_delta_and_manifest(tmp_path, monkeypatch):
+    _use_tmp_db(tmp_path, monkeypatch)
+    out = str(tmp_path / "latest.json")
+    _save(["a", "b", "c"], 1)
+    first = export_utils.export_latest(out, export_count=3)
+    assert first["seq"] == 1 and first["delta_base_seq"] is None
+    with open(out, encoding="utf-8") as f:
+        previous = json.load(f)
+    assert [a["url"] for a in previous] == ["c", "b", "a"]
+
+    _save(["d"], 2)
+    second = export_utils.export_latest(out, export_count=3)
+    assert second["seq"] == 2 and second["delta_base_seq"] == 1
+    added = _read_ndjson(export_utils.delta_path(out))
+    assert [a["url"] for a in added] == ["d"]
+    with open(out, encoding="utf-8") as f:
+        assert export_utils.apply_delta(previous, added, second["count"]) == json.load(f)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+def test_export_skips_unchanged_and_flags_in_place_updates(tmp_path, monkeypatch):
+    _use_tmp_db(tmp_path, monkeypatch)
+    out = str(tmp_path / "latest.json")
+    _save(["a", "b"], 1)
+    export_utils.export_latest(out, export_count=5, fmt="compact")
+    mtime = os.stat(out).st_mtime_ns
+    assert export_utils.export_latest(out, export_count=5, fmt="compact")["seq"] == 1
+    assert os.stat(out).st_mtime_ns == mtime
+
+    db.update_article_sentiments([("positive", 0.9, "a")])
+    manifest = export_utils.export_latest(out, export_count=5, fmt="compact")
+    assert manifest["seq"] == 2 and manifest["delta_base_seq"] is None
+    with open(out, encoding="utf-8") as f:
+        assert "\n" not in f.read()
+
+def test_export_translates_only_exported_untranslated_headlines(tmp_path, monkeypatch):
+    _use_tmp_db(tmp_path, monkeypatch)
+    out = str(tmp_path / "latest.json")
+    db.save_articles_bulk([
+        (url, None, "kr", f"2025-01-01 01:0{i}:00", "neutral", 0.5, f"english {url}")
+        for i, url in enumerate(["old", "a", "b"])
+    ])
+    db.save_articles_bulk([("c", "번역된 c", "kr", "2025-01-01 01:09:00", "neutral", 0.5, "english c")])
+    calls = []
+
+    def translate(texts):
+        calls.append(texts)
+        return [f"ko {t}" for t in texts]
+
+    export_utils.export_latest(out, export_count=3, translate=translate)
+    with open(out, encoding="utf-8") as f:
+        assert [a["headline"] for a in json.load(f)] == ["번역된 c", "ko english b", "ko english a"]
+    assert calls == [["english a", "english b"]]
+
+    export_utils.export_latest(out, export_count=3, translate=translate)
+    assert len(calls) == 1   # 저장된 번역 재사용
+    assert db.get_latest_articles(min_count=4)[-1][1] == "english old"
+
+def test_failed_lazy_translation_is_not_stored_and_retried(tmp_path, monkeypatch):
+    translation_api = pytest.importorskip("translation_api")   # dotenv 필요
+    _use_tmp_db(tmp_path, monkeypatch)
+    out = str(tmp_path / "latest.json")
+    db.save_articles_bulk([("a", None, "kr", "2025-01-01 01:00:00", "neutral", 0.5, "english a")])
+
+    class Down(translation_api.TranslationBackend):
+        def translate_many(self, texts, target_language):
+            raise RuntimeError("backend down")
+
+    monkeypatch.setattr(translation_api, "_backend", Down())
+    export_utils.export_latest(out, export_count=1, translate=translation_api.translate_batch)
+    with open(out, encoding="utf-8") as f:
+        assert [a["headline"] for a in json.load(f)] == ["english a"]   # 이번 export만 영문
+    assert "a" in db.get_untranslated(["a"])
+
+    monkeypatch.setattr(translation_api, "_backend", translation_api.FakeTranslator())
+    export_utils.export_latest(out, export_count=1, translate=translation_api.translate_batch)
+    assert db.get_untranslated(["a"]) == {}
+    assert db.get_latest_articles(min_count=1)[0][1] == "[ko] english a"
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("gdeltdoc")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+import db
+import fetch_gdelt
+
+def _frame():
+    return pd.DataFrame({
+        "url": ["https://a", "https://b", None, "https://c", "https://a", "https://d"],
+        "title": ["  Parliament passes the new budget bill  ", "Short", "No url for this headline",
+                  "Bad seendate on this headline", "Parliament passes the new budget bill", "Non-English headline here"],
+        "language": ["English", "English", "English", "English", "English", "Korean"],
+        "sourcecountry": ["United States", "Japan", "Japan", None, "United States", "South Korea"],
+        "seendate": ["20250625T083000Z"] * 3 + ["garbage"] + ["20250625T083000Z"] * 2,
+    })
+
+def test_gdelt_frame_is_filtered_into_worldnews_schema():
+    assert fetch_gdelt._to_articles(_frame()) == [{
+        "url": "https://a",
+        "source_country": "United States",
+        "headline": "Parliament passes the new budget bill",
+        "date": "2025-06-25 17:30:00",
+    }]
+    assert fetch_gdelt._to_articles(pd.DataFrame()) == []
+
+def test_fetch_gdelt_drops_known_urls(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_FILE", str(tmp_path / "test.db"))
+    db.init_db()
+    frame = _frame()
+    frame.loc[3, "seendate"] = "20250625T090000Z"
+    monkeypatch.setattr(fetch_gdelt.GDOC, "article_search", lambda filters: frame)
+    db.save_article("https://a", "기존", "United States", "2025-06-25 17:30:00")
+    assert [a["url"] for a in fetch_gdelt.fetch_gdelt(new_only=True)] == ["https://c"]
+    assert fetch_gdelt.fetch_gdelt(new_only=True)[0]["source_country"] == "Unknown"
@@ -0,0 +1,30 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+import metrics
+
+def test_report_counts_worldnews_points_and_timers():
+    m = metrics.RunMetrics()
+    m.incr("worldnews_requests", 3)
+    m.incr("worldnews_results", 250)
+    with m.timer("sqlite_store"):
+        sum(range(1000))
+    report = m.report(stages=[{"stage": "inference", "items_in": 5, "busy_s": 0.1}], processed=5)
+    assert report["worldnews_points"] == 5.5
+    assert report["timers"]["sqlite_store"]["calls"] == 1
+    assert report["processed"] == 5
+
+def test_report_files(tmp_path):
+    m = metrics.RunMetrics()
+    m.incr("translated_chars", 42)
+    report = m.report(stages=[{"stage": "inference", "items_in": 5, "busy_s": 0.1}])
+    metrics.write_json_report(report, str(tmp_path / "run_report.json"))
+    metrics.write_prometheus(report, str(tmp_path / "prom" / "resonance.prom"))
+    with open(tmp_path / "run_report.json", encoding="utf-8") as f:
+        assert json.load(f)["counters"] == {"translated_chars": 42}
+    prom = (tmp_path / "prom" / "resonance.prom").read_text()
+    assert 'resonance_stage_items_in{stage="inference"} 5' in prom
+    assert "resonance_translated_chars 42" in prom
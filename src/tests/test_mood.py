@@ -0,0 +1,52 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+import db
+import mood
+
+NOW = db.to_epoch("2025-06-25 12:00:00")
+
+def _use_tmp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_FILE", str(tmp_path / "test.db"))
+    db.init_db()
+
+def _buckets():
+    return sorted(db.get_conn().execute("SELECT * FROM mood_buckets").fetchall())
+
+def test_triggers_match_full_rebuild(tmp_path, monkeypatch):
+    _use_tmp_db(tmp_path, monkeypatch)
+    db.save_articles_bulk([
+        ("a", "h", "Korea", "2025-06-25 11:05:00", "positive", 0.8),
+        ("b", "h", "Korea", "2025-06-25 11:07:00", "negative", 0.6),
+        ("c", "h", "France", "2025-06-25 11:55:00", "positive", 0.4),
+        ("d", "h", None, "2025-06-25 09:00:00", None, None),   # 라벨 없음 → 집계 제외
+    ])
+    db.update_article_sentiments([("neutral", 0.5, "b"), ("positive", 0.9, "d")])
+    db.get_conn().execute("DELETE FROM articles WHERE url='c'")
+    db.get_conn().commit()
+    incremental = _buckets()
+    db.rebuild_mood_buckets()
+    assert incremental == _buckets()
+    assert ("Unknown", "positive") in {(row[2], row[3]) for row in incremental}
+
+def test_rolling_mood(tmp_path, monkeypatch):
+    _use_tmp_db(tmp_path, monkeypatch)
+    db.save_articles_bulk([
+        ("a", "h", "Korea", "2025-06-25 11:05:00", "positive", 0.8),
+        ("b", "h", "Korea", "2025-06-25 11:07:00", "positive", 0.6),
+        ("c", "h", "France", "2025-06-25 11:55:00", "negative", 0.4),
+        ("old", "h", "France", "2025-06-24 11:55:00", "negative", 0.4),
+    ])
+    result = mood.rolling_mood(window_minutes=120, now=NOW)
+    assert result["total"] == 3 and result["bucket_s"] == 600
+    assert result["labels"]["positive"] == {"count": 2, "share": 0.667, "confidence": 0.7}
+    assert result["score"] == 0.333
+    assert list(result["countries"]) == ["Korea", "France"]
+    assert mood.mood_series(hours=2, now=NOW)[0]["total"] == 3
+    assert mood.prune(now=NOW + 6 * 86400) == 1   # 7일 지난 10분 bucket만 삭제
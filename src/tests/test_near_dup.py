@@ -0,0 +1,62 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+import db
+import export_utils
+import near_dup
+
+def _use_tmp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_FILE", str(tmp_path / "test.db"))
+    db.init_db()
+
+def test_wire_tags_and_prefixes_are_ignored():
+    a = near_dup.signature("Reuters: Central bank raises interest rates to curb inflation")
+    b = near_dup.signature("Central bank raises interest rates to curb inflation - AP")
+    c = near_dup.signature("Heavy rain floods streets across the capital overnight")
+    assert near_dup.similarity(a, b) == 1.0
+    assert near_dup.similarity(a, c) < near_dup.THRESHOLD
+    assert near_dup.signature("Reuters - AP") is None
+
+def test_signature_roundtrip_and_stable_keys():
+    sig = near_dup.signature("Central bank raises interest rates")
+    assert near_dup.unpack_signature(near_dup.pack_signature(sig)) == sig
+    keys = near_dup.band_keys(sig)
+    assert len(keys) == near_dup.BANDS and all(-2**63 <= k < 2**63 for k in keys)
+
+def test_match_within_batch_and_across_runs(tmp_path, monkeypatch):
+    _use_tmp_db(tmp_path, monkeypatch)
+    texts = [
+        "Central bank raises interest rates to curb inflation",
+        "Breaking: Central bank raises interest rates to curb inflation",
+        "Heavy rain floods streets across the capital overnight",
+    ]
+    first = near_dup.match_headlines(texts)
+    assert "signature" in first[0] and first[1] == {"leader": 0} and "signature" in first[2]
+
+    db.save_articles_bulk([("u0", "금리 인상", "kr", "2025-01-01 01:00:00", "negative", 0.8)])
+    [cluster_id] = db.create_clusters([(
+        near_dup.pack_signature(first[0]["signature"]), "u0", "금리 인상", "negative", 0.8, first[0]["band_keys"]
+    )])
+    again = near_dup.match_headlines(["Central bank raises interest rates to curb inflation - Reuters"])
+    assert again == [{"cluster": (cluster_id, "금리 인상", "negative", 0.8)}]
+
+    # 오래된 cluster는 비교 대상에서 제외
+    assert db.prune_cluster_index(before=9e12) == near_dup.BANDS
+    assert "signature" in near_dup.match_headlines(texts[:1])[0]
+
+def test_export_one_per_cluster(tmp_path, monkeypatch):
+    _use_tmp_db(tmp_path, monkeypatch)
+    db.save_articles_bulk([
+        (url, f"headline {url}", "kr", f"2025-01-01 01:0{i}:00", "neutral", 0.5)
+        for i, url in enumerate(["a", "b", "c", "d"])
+    ])
+    [cluster_id] = db.create_clusters([(b"", "a", "headline a", "neutral", 0.5, [1])])
+    db.assign_article_clusters([("a", cluster_id), ("b", cluster_id), ("c", cluster_id)])
+
+    out = str(tmp_path / "latest.json")
+    export_utils.export_latest(out, export_count=3, one_per_cluster=True)
+    with open(out, encoding="utf-8") as f:
+        assert [a["url"] for a in json.load(f)] == ["d", "c"]
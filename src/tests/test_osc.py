@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+
+import pytest
+
+for dep in ("pythonosc", "dotenv"):
+    pytest.importorskip(dep)
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import osc
+
+def _article(url, minute):
+    return {"url": url, "headline": f"headline {url}", "timestamp": f"2025-01-01 01:{minute:02d}:00"}
+
+def _publish(folder, seq, count, full=None, delta=None, base=None):
+    """export_utils 형식의 manifest (+ 전체 JSON / NDJSON delta) 쓰기"""
+    manifest = {"seq": seq, "full": "latest.json", "count": count}
+    if full is not None:
+        (folder / "latest.json").write_text(json.dumps(full), encoding="utf-8")
+    if delta is not None:
+        (folder / "latest.delta.ndjson").write_text("".join(json.dumps(a) + "\n" for a in delta), encoding="utf-8")
+        manifest.update(delta="latest.delta.ndjson", delta_base_seq=base)
+    (folder / "latest.manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+def _urls(pool):
+    return sorted(pool.entries)
+
+def _controller(**kwargs):
+    ticker = osc.MonotonicTicker(3600, start=0)
+    return ticker, osc.AdaptiveRefresh(ticker, min_interval=900, max_interval=4 * 3600, target_new=30, **kwargs)
+
+def _report(processed, fetched=None, points=1.0, window_h=1.0):
+    return {"processed": processed, "fetched": processed + 5 if fetched is None else fetched,
+            "points": points, "window_h": window_h}
+
+def test_first_rate_uses_the_fetched_window():
+    ticker, controller = _controller(daily_budget=0)
+    # 첫 실행: timespan 8시간 전체를 조회해 80건 → 10건/시간 (갱신 주기 1시간으로 나누면 80건/시간)
+    interval = controller.record(_report(80, window_h=8.0), started=0, now=0)
+    assert controller.rate == 10
+    assert (interval, controller.decisions[-1]["reason"]) == (3 * 3600, "rate")
+    assert ticker.next_due == 3 * 3600
+
+def test_rate_is_clamped_to_min_and_max():
+    _, controller = _controller(daily_budget=0)
+    assert controller.record(_report(200, window_h=0.25), started=0, now=0) == 900
+    assert controller.decisions[-1]["reason"] == "burst (min)"
+    _, controller = _controller(daily_budget=0)
+    assert controller.record(_report(0), started=0, now=0) == 4 * 3600
+    assert controller.decisions[-1]["reason"] == "quiet (max)"
+
+def test_saturated_fetch_raises_the_rate_without_smoothing():
+    _, controller = _controller(daily_budget=0)
+    controller.record(_report(10), started=0, now=0)
+    controller.record(_report(100, fetched=osc.NEWS2EMOTION_ARGS["num_records"]), started=3600, now=3600)
+    assert controller.rate == 100   # EWMA(10 → 100)는 37
+    _, controller = _controller(daily_budget=0)
+    controller.record(_report(10), started=0, now=0)
+    controller.record(_report(100, fetched=osc.NEWS2EMOTION_ARGS["num_records"] - 1), started=3600, now=3600)
+    assert controller.rate == pytest.approx(37)
+
+def test_budget_paces_and_waits_when_exhausted():
+    _, controller = _controller(daily_budget=50)
+    # 200건/시간이면 최소 주기지만 갱신당 3 point → 하루 50 point를 고르게 쓰는 주기 5184초
+    assert controller.record(_report(200, points=3.0), started=0, now=0) == pytest.approx(5184)
+    assert controller.decisions[-1]["reason"] == "budget pace"
+
+    _, controller = _controller(daily_budget=5)
+    controller.record(_report(200, points=2.0), started=0, now=0)
+    # 24시간 사용량 4 + 다음 갱신 2 > 5 → 첫 갱신이 24시간 창을 벗어날 때까지 대기
+    assert controller.record(_report(200, points=2.0), started=1000, now=1000) == 86400 - 1000
+    assert controller.decisions[-1]["reason"] == "budget exhausted"
+
+def test_pool_applies_delta_on_top_of_current_seq(tmp_path):
+    pool = osc.HeadlinePool(str(tmp_path / "latest.json"))
+    _publish(tmp_path, 1, 2, full=[_article("a", 1), _article("b", 2)])
+    assert pool.reload(force=True) and _urls(pool) == ["a", "b"]
+
+    # 전체 파일은 바꾸지 않음 → delta만 읽었는지 확인
+    _publish(tmp_path, 2, 2, delta=[_article("c", 3)], base=1)
+    assert pool.reload(force=True)
+    assert _urls(pool) == ["b", "c"] and pool.deltas == 1 and pool.seq == 2
+    assert not pool.reload(force=True)   # 같은 seq
+
+def test_pool_reads_full_file_after_seq_gap(tmp_path):
+    pool = osc.HeadlinePool(str(tmp_path / "latest.json"))
+    _publish(tmp_path, 1, 2, full=[_article("a", 1)])
+    pool.reload(force=True)
+    _publish(tmp_path, 5, 2, full=[_article("x", 5), _article("y", 6)], delta=[_article("y", 6)], base=4)
+    assert pool.reload(force=True)
+    assert _urls(pool) == ["x", "y"] and pool.deltas == 0 and pool.seq == 5
+
+def test_pool_keeps_old_articles_when_new_file_is_bad(tmp_path):
+    pool = osc.HeadlinePool(str(tmp_path / "latest.json"))
+    _publish(tmp_path, 1, 2, full=[_article("a", 1), _article("b", 2)])
+    pool.reload(force=True)
+    _publish(tmp_path, 2, 2)
+    (tmp_path / "latest.json").write_text('[{"url": "c", "headl', encoding="utf-8")
+    assert not pool.reload(force=True)
+    assert _urls(pool) == ["a", "b"] and len(pool.payloads) == 2 and pool.rejected == 1 and pool.seq == 1
+
+def test_shuffle_bag_sends_each_article_once_per_round(tmp_path):
+    pool = osc.HeadlinePool(str(tmp_path / "latest.json"))
+    assert pool.next() is None
+    _publish(tmp_path, 1, 3, full=[_article(url, i) for i, url in enumerate("abc")])
+    pool.reload(force=True)
+    for _ in range(20):
+        first_round = [pool.next()[0] for _ in range(3)]
+        assert sorted(first_round) == ["headline a", "headline b", "headline c"]
+        assert pool.next()[0] != first_round[-1]   # 바퀴가 바뀔 때 같은 기사 연속 금지
+        pool.bag = []
+
+def test_concurrent_reloads_apply_a_delta_once(tmp_path):
+    import threading
+
+    pool = osc.HeadlinePool(str(tmp_path / "latest.json"))
+    _publish(tmp_path, 1, 3, full=[_article("a", 1)])
+    pool.reload(force=True)
+    _publish(tmp_path, 2, 3, delta=[_article("b", 2)], base=1)
+    threads = [threading.Thread(target=pool.reload, kwargs={"force": True}) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert (pool.reloads, pool.deltas, _urls(pool)) == (2, 1, ["a", "b"])
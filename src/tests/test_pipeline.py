@@ -0,0 +1,32 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+from pipeline import Stage, run_pipeline
+
+def test_all_batches_reach_the_last_stage():
+    out = []
+    stats = run_pipeline(
+        ([i, i + 1] for i in range(0, 20, 2)),
+        [
+            Stage("double", lambda b: [x * 2 for x in b], workers=3),
+            Stage("drop_some", lambda b: None if 4 in b else b),
+            Stage("collect", lambda b: out.extend(b) or b),
+        ],
+        queue_size=1,
+    )
+    assert sorted(out) == [x * 2 for x in range(20) if x not in (2, 3)]
+    by_name = {s["stage"]: s for s in stats}
+    assert by_name["source"]["items_in"] == 20
+    assert by_name["double"]["items_out"] == 20
+
+def test_failing_stage_does_not_stall_the_pipeline():
+    def flaky(batch):
+        if batch[0] == 2:
+            raise RuntimeError("boom")
+        return batch
+    out = []
+    stats = run_pipeline([[1], [2], [3]], [Stage("flaky", flaky), Stage("collect", lambda b: out.extend(b) or b)])
+    assert sorted(out) == [1, 3]
+    assert stats[1]["failures"] == 1
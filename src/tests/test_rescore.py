@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+import emotion_utils
+
+GO_EMOTIONS = [
+    "admiration", "amusement", "anger", "annoyance", "approval", "caring", "confusion",
+    "curiosity", "desire", "disappointment", "disapproval", "disgust", "embarrassment",
+    "excitement", "fear", "gratitude", "grief", "joy", "love", "nervousness", "optimism",
+    "pride", "realization", "relief", "remorse", "sadness", "surprise", "neutral",
+]
+
+def test_rescore_matrix_matches_per_headline_scoring():
+    emotion_utils._set_labels(dict(enumerate(GO_EMOTIONS)))
+    torch.manual_seed(0)
+    probs = torch.rand(500, len(GO_EMOTIONS)) ** 3
+    nli = torch.rand(500, 3).softmax(dim=1)
+    skipped = torch.rand(500) < 0.3
+    nli[skipped] = float("nan")
+
+    labels, conf = emotion_utils.rescore_matrix(probs, nli)
+
+    for i in range(len(probs)):
+        expected = emotion_utils.calculate_sentiment_score(probs[i])
+        if not skipped[i]:
+            best = int(nli[i].argmax())
+            expected = emotion_utils._blend(*expected, emotion_utils.CANDIDATES[best], round(float(nli[i, best]), 3))
+        assert (labels[i], round(float(conf[i]), 3)) == expected
+
+def test_neu_factor_changes_neutral_dominated_scores():
+    emotion_utils._set_labels(dict(enumerate(GO_EMOTIONS)))
+    assert emotion_utils.NEU_ID == [GO_EMOTIONS.index("neutral")]
+    probs = torch.full((2, len(GO_EMOTIONS)), 0.01)
+    probs[:, GO_EMOTIONS.index("neutral")] = 0.9
+    probs[0, GO_EMOTIONS.index("joy")] = 0.1
+    probs[1, GO_EMOTIONS.index("fear")] = 0.1
+
+    kept, kept_conf = emotion_utils.rescore_matrix(probs, neu_factor=1.0)
+    damped, damped_conf = emotion_utils.rescore_matrix(probs, neu_factor=0.0)
+    assert kept == ["neutral", "neutral"]
+    assert damped == ["positive", "negative"]
+    assert (damped_conf > kept_conf).all()
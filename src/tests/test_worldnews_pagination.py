@@ -0,0 +1,83 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+for dep in ("worldnewsapi", "pytz", "pycountry", "dotenv"):
+    pytest.importorskip(dep)
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+import worldnews_api
+from worldnewsapi.rest import ApiException
+
+
+class StubNewsApi:
+    """Local stand-in for the WorldNews search_news endpoint."""
+
+    def __init__(self, available: int, fail_first: int = 0, fail_offsets=()):
+        self.available = available
+        self.fail_first = fail_first
+        self.fail_offsets = set(fail_offsets)
+        self.calls = []
+
+    def search_news(self, **params):
+        self.calls.append(params)
+        if self.fail_first:
+            self.fail_first -= 1
+            raise ApiException(status=429, reason="Too Many Requests")
+        if params["offset"] in self.fail_offsets:
+            raise ApiException(status=400, reason="Bad Request")
+        start = params["offset"]
+        stop = min(start + params["number"], self.available)
+        news = [
+            SimpleNamespace(
+                url=f"https://example.com/{i}",
+                title=f"Stub headline number {i} for pagination tests",
+                publish_date="2025-06-25 00:00:00",
+                source_country="kr",
+            )
+            for i in range(start, stop)
+        ]
+        return SimpleNamespace(news=news, available=self.available)
+
+
+def test_pages_are_fetched_concurrently_up_to_max_articles():
+    api = StubNewsApi(available=1000)
+    pages = list(worldnews_api.iter_worldnews(
+        max_articles=350, api=api, limiter=worldnews_api.RateLimiter(rate=0)))
+    urls = {a["url"] for page in pages for a in page}
+    assert len(urls) == 350
+    assert sorted(c["offset"] for c in api.calls) == [0, 100, 200, 300]
+    assert [c["number"] for c in api.calls if c["offset"] == 300] == [50]
+
+
+def test_rate_limited_request_is_retried(monkeypatch):
+    monkeypatch.setattr(worldnews_api, "BACKOFF_BASE", 0.0)
+    api = StubNewsApi(available=10, fail_first=2)
+    pages = list(worldnews_api.iter_worldnews(
+        max_articles=10, api=api, limiter=worldnews_api.RateLimiter(rate=0)))
+    assert sum(len(p) for p in pages) == 10
+    assert len(api.calls) == 3
+
+
+def test_failed_page_is_reported_after_other_pages():
+    api = StubNewsApi(available=300, fail_offsets={100})
+    urls = set()
+    with pytest.raises(worldnews_api.PageFetchError) as exc:
+        for page in worldnews_api.iter_worldnews(
+                max_articles=300, api=api, limiter=worldnews_api.RateLimiter(rate=0)):
+            urls.update(a["url"] for a in page)
+    assert exc.value.offsets == [100]
+    assert len(urls) == 200   # 나머지 페이지는 그대로 전달
+
+
+def test_since_replaces_timespan_window():
+    from datetime import datetime, timezone
+
+    api = StubNewsApi(available=5)
+    since = datetime(2025, 6, 25, 0, 17, 42, tzinfo=timezone.utc)
+    list(worldnews_api.iter_worldnews(
+        timespan=8.0, max_articles=5, api=api, limiter=worldnews_api.RateLimiter(rate=0), since=since))
+    assert api.calls[0]["earliest_publish_date"] == "2025-06-25 00:17:42"